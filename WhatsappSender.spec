@@ -9,7 +9,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('src/assets', 'assets')],
-    hiddenimports=['pywhatkit', 'pyautogui', 'pandas', 'pyexcel', 'pyexcel.plugins.xls', 'pyexcel.plugins.xlsx', 'PIL.Image', 'PIL.ImageTk', 'openpyxl', 'xlrd', 'tkinter', 'threading', 'webbrowser'],
+    hiddenimports=['pyautogui', 'pyperclip', 'pandas', 'pyexcel', 'pyexcel.plugins.xls', 'pyexcel.plugins.xlsx', 'PIL.Image', 'PIL.ImageTk', 'openpyxl', 'xlrd', 'tkinter', 'threading', 'webbrowser'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
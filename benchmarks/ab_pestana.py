@@ -0,0 +1,59 @@
+"""
+Comparación A/B del envío por escritorio: una pestaña por contacto vs una sola pestaña reutilizada.
+Envía mensajes reales: usar un Excel con números de prueba y WhatsApp Web con sesión iniciada.
+
+Uso: python benchmarks/ab_pestana.py contactos_prueba.xlsx ["mensaje"]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import logic.message as message
+from logic.logic import AlmacenContactos
+from logic.transporte_escritorio import TransporteEscritorio
+
+class TransporteCronometrado(TransporteEscritorio):
+    """Mide el tiempo de cada contacto, desde abrir_chat hasta cerrar_chat"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tiempos = []
+        self._inicio = None
+
+    def abrir_chat(self, numero):
+        self._inicio = time.monotonic()
+        super().abrir_chat(numero)
+
+    def cerrar_chat(self):
+        super().cerrar_chat()
+        self.tiempos.append(time.monotonic() - self._inicio)
+
+def correr(excel_file, mensaje, reutilizar_pestana):
+    transporte = TransporteCronometrado(reutilizar_pestana=reutilizar_pestana)
+    inicio = time.monotonic()
+    enviados = message.send_messages(excel_file, mensaje, contact_store=AlmacenContactos(), transporte=transporte)
+    return enviados, time.monotonic() - inicio, transporte.tiempos
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    excel_file = sys.argv[1]
+    mensaje = sys.argv[2] if len(sys.argv) > 2 else "Prueba de velocidad {nombre}"
+
+    # Sin intervalo entre contactos para medir solo el costo de cada envío
+    message.INTERVALO_ENTRE_ENVIOS = 0
+
+    for etiqueta, reutilizar in (("A: pestaña por contacto", False), ("B: pestaña reutilizada", True)):
+        enviados, total, tiempos = correr(excel_file, mensaje, reutilizar)
+        print(f"\n{etiqueta}")
+        print(f"  Enviados: {enviados}  Tiempo total: {total:.1f} s")
+        if tiempos:
+            print(f"  Por contacto: media {statistics.mean(tiempos):.2f} s, "
+                  f"mediana {statistics.median(tiempos):.2f} s, máx {max(tiempos):.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Mide el arranque en frío de la aplicación: tiempo hasta que la ventana queda dibujada.
+Cada corrida es un proceso nuevo (como al abrir el programa); se reporta la mediana.
+
+Uso: python benchmarks/bench_arranque.py [corridas] [--presupuesto SEGUNDOS]
+Con --presupuesto termina con código 1 si la mediana lo supera (para vigilar regresiones).
+Sin pantalla (servidor sin X) solo se mide la importación de la interfaz.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(AQUI, "..", "src")
+
+# Proceso hijo: importa la UI, construye la ventana y en lugar de entrar al mainloop
+# la dibuja una vez, reporta los tiempos y cierra
+HIJO = r"""
+import json, sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import tkinter as tk
+import ui.ui as ui
+importada = time.perf_counter()
+resultado = {"importar_ui": importada - inicio, "modulos_pesados": sorted(
+    m for m in ("pandas", "openpyxl", "pyexcel", "pyautogui", "pygetwindow", "PIL.ImageTk") if m in sys.modules)}
+
+def mainloop(self, n=0):
+    self.update()  # Ventana construida y dibujada
+    resultado["ventana"] = time.perf_counter() - inicio
+    self.destroy()
+
+tk.Tk.mainloop = mainloop
+tk.Misc.after = lambda self, ms, func=None, *args: None  # Sin la precarga en segundo plano
+try:
+    ui.launch_app()
+except tk.TclError as e:
+    resultado["sin_pantalla"] = str(e)
+print(json.dumps(resultado))
+"""
+
+def correr():
+    inicio = time.perf_counter()
+    salida = subprocess.run([sys.executable, "-c", HIJO, SRC], capture_output=True, text=True, check=True)
+    total = time.perf_counter() - inicio
+    resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+    resultado["proceso"] = total
+    return resultado
+
+def main():
+    argumentos = sys.argv[1:]
+    presupuesto = None
+    if "--presupuesto" in argumentos:
+        posicion = argumentos.index("--presupuesto")
+        presupuesto = float(argumentos[posicion + 1])
+        del argumentos[posicion:posicion + 2]
+    corridas = int(argumentos[0]) if argumentos else 5
+
+    resultados = [correr() for _ in range(corridas)]
+    importar = statistics.median(r["importar_ui"] for r in resultados)
+    print(f"Corridas: {corridas}")
+    print(f"Importar la UI:        {importar * 1000:7.0f} ms (mediana)")
+    print(f"Módulos pesados cargados al arrancar: {', '.join(resultados[0]['modulos_pesados']) or 'ninguno'}")
+
+    if "sin_pantalla" in resultados[0]:
+        print(f"Sin pantalla, no se midió la ventana: {resultados[0]['sin_pantalla']}")
+        medida = importar
+    else:
+        ventana = statistics.median(r["ventana"] for r in resultados)
+        proceso = statistics.median(r["proceso"] for r in resultados)
+        print(f"Hasta la ventana:      {ventana * 1000:7.0f} ms (desde el inicio del script)")
+        print(f"Proceso completo:      {proceso * 1000:7.0f} ms (intérprete + ventana + cierre)")
+        medida = ventana
+
+    if presupuesto is not None:
+        if medida > presupuesto:
+            print(f"Fuera de presupuesto: {medida:.3f} s > {presupuesto:.3f} s")
+            sys.exit(1)
+        print(f"Dentro del presupuesto de {presupuesto:.3f} s")
+
+if __name__ == "__main__":
+    main()
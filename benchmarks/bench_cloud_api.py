@@ -0,0 +1,65 @@
+"""
+Mide TransporteCloudAPI contra el mock local de la Cloud API (benchmarks/mock_cloud_api.py):
+throughput con distintas concurrencias, una sola subida por adjunto y manejo de 429.
+
+Uso: python benchmarks/bench_cloud_api.py [contactos] [latencia_ms] [probabilidad_429]
+"""
+import os
+import sys
+import tempfile
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, "..", "src"))
+sys.path.insert(0, AQUI)
+
+import openpyxl
+from PIL import Image
+
+from logic.logic import AlmacenContactos
+from logic.message import send_messages
+from logic.transporte_api import TransporteCloudAPI
+from mock_cloud_api import MockCloudAPI
+
+def crear_excel(path, cantidad):
+    wb = openpyxl.Workbook()
+    hoja = wb.active
+    hoja.append(["Reporte de clientes"])
+    hoja.append(["NOMBRES", "CELULAR", "FECHA FIN"])
+    for i in range(cantidad):
+        hoja.append([f"Cliente {i}", 900000000 + i, "27/06/2025"])
+    wb.save(path)
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latencia = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    probabilidad_429 = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        excel_file = os.path.join(carpeta, "contactos.xlsx")
+        imagen = os.path.join(carpeta, "promo.png")
+        pdf = os.path.join(carpeta, "horarios.pdf")
+        crear_excel(excel_file, cantidad)
+        # Archivos reales: la revisión previa de adjuntos valida la firma y abre la imagen
+        Image.effect_noise((800, 600), 60).convert("RGB").save(imagen)
+        with open(pdf, "wb") as f:
+            f.write(b"%PDF-1.4\n" + os.urandom(200_000) + b"\n%%EOF\n")
+
+        almacen = AlmacenContactos()
+        print(f"Contactos: {cantidad}  Latencia: {latencia * 1000:.0f} ms  429: {probabilidad_429:.0%}")
+        for concurrencia in (1, 4, 16):
+            with MockCloudAPI(latencia=latencia, probabilidad_429=probabilidad_429, retry_after=0.1, semilla=1) as mock:
+                transporte = TransporteCloudAPI("123", "token", url_base=mock.url,
+                                                concurrencia=concurrencia, espera_base=0.1)
+                inicio = time.monotonic()
+                enviados = send_messages(excel_file, "Hola {nombre}", [imagen], [pdf],
+                                         contact_store=almacen, transporte=transporte)
+                total = time.monotonic() - inicio
+
+            print(f"  Concurrencia {concurrencia:2d}: {enviados} enviados en {total:6.2f} s "
+                  f"({enviados / total * 60:8.0f} contactos/min)  "
+                  f"subidas: {len(mock.subidas)}  mensajes: {len(mock.mensajes)}  "
+                  f"429: {mock.rechazos_429}  conexiones: {mock.conexiones}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Carga de la cola de eventos de la interfaz: varios hilos publican progreso y estados lo más rápido
+que pueden (como el transporte simulado o la Cloud API con concurrencia) mientras el "mainloop"
+vacía la cola a ritmo fijo. Reporta cuántas publicaciones aguanta la cola, cuántos eventos
+llega a dibujar cada cuadro y cuánto tarda el peor cuadro.
+
+Uso: python benchmarks/bench_eventos_ui.py [hilos] [segundos]
+Sin pantalla el mainloop se simula con un planificador de after() en el hilo principal.
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from ui.eventos import ColaEventosUI, FPS_POR_DEFECTO
+
+class MainloopSimulado:
+    """Lo mínimo de Tk que usa ColaEventosUI: after(ms, funcion), en un solo hilo"""
+
+    def __init__(self):
+        self._tareas = []
+
+    def after(self, ms, funcion):
+        self._tareas.append((time.perf_counter() + ms / 1000, funcion))
+
+    def correr(self, hasta):
+        while time.perf_counter() < hasta and self._tareas:
+            self._tareas.sort(key=lambda t: t[0])
+            momento, funcion = self._tareas.pop(0)
+            restante = momento - time.perf_counter()
+            if restante > 0:
+                time.sleep(restante)
+            funcion()
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    cola = ColaEventosUI()
+    mainloop = MainloopSimulado()
+    publicados = [0] * hilos
+    dibujados = {"estado": 0, "progreso": 0, "fin": 0}
+    cuadros = []  # (eventos en el cuadro, momento en que se dibujó)
+
+    def dibujar(tipo):
+        def manejador(*datos):
+            dibujados[tipo] += 1
+        return manejador
+
+    manejadores = {tipo: dibujar(tipo) for tipo in dibujados}
+    cola.conectar(mainloop, manejadores)
+
+    # Cada cuadro se mide envolviendo drenar()
+    drenar = cola.drenar
+    def drenar_medido():
+        inicio = time.perf_counter()
+        eventos = drenar()
+        cuadros.append((len(eventos), inicio))
+        return eventos
+    cola.drenar = drenar_medido
+
+    parar = threading.Event()
+    def publicar(indice):
+        n = 0
+        while not parar.is_set():
+            n += 1
+            cola.progreso(n, 10 ** 9, f"Contacto {indice}-{n}")
+            if n % 100 == 0:
+                cola.estado(f"Hilo {indice}: {n} enviados")
+        publicados[indice] = n
+
+    productores = [threading.Thread(target=publicar, args=(i,)) for i in range(hilos)]
+    inicio = time.perf_counter()
+    for p in productores:
+        p.start()
+    mainloop.correr(inicio + segundos)
+    parar.set()
+    for p in productores:
+        p.join()
+    cola.fin()
+    mainloop.correr(time.perf_counter() + 0.2)  # Último cuadro: debe dibujar el fin y el estado final
+    transcurrido = time.perf_counter() - inicio
+
+    total = sum(publicados)
+    separaciones = [b[1] - a[1] for a, b in zip(cuadros, cuadros[1:])]
+    print(f"Hilos publicando: {hilos} durante {segundos:.1f} s")
+    print(f"Publicaciones: {total:,} ({total / transcurrido:,.0f}/s)")
+    print(f"Cuadros: {len(cuadros)} (objetivo {FPS_POR_DEFECTO}/s -> {len(cuadros) / transcurrido:.1f}/s)")
+    print(f"Eventos dibujados: progreso {dibujados['progreso']}, estado {dibujados['estado']}, fin {dibujados['fin']}")
+    print(f"Máximo de eventos en un cuadro: {max(c[0] for c in cuadros)}")
+    if separaciones:
+        print(f"Separación entre cuadros: peor {max(separaciones) * 1000:.1f} ms")
+    print(f"Pendientes al final: {cola.pendientes()}")
+
+if __name__ == "__main__":
+    main()
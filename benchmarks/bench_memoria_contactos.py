@@ -0,0 +1,50 @@
+"""
+Compara la memoria de la lista de contactos del envío:
+lista de dicts (estructura anterior) vs lista de Contacto con __slots__.
+
+Uso: python benchmarks/bench_memoria_contactos.py [cantidad]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from logic.logic import Contacto
+
+def _filas(cantidad):
+    for i in range(cantidad):
+        yield i, f"51{900000000 + i}", f"Cliente {i}", "2025-06-27 00:00:00"
+
+def medir(constructor, cantidad):
+    """Retorna los bytes retenidos por la estructura creada con constructor"""
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    datos = constructor(cantidad)
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in despues.compare_to(antes, 'filename'))
+    del datos
+    return total
+
+def como_dicts(cantidad):
+    return [
+        {'index': i, 'celular': celular, 'nombre': nombre, 'fecha_fin': fecha_fin}
+        for i, celular, nombre, fecha_fin in _filas(cantidad)
+    ]
+
+def como_contactos(cantidad):
+    return [Contacto(*fila) for fila in _filas(cantidad)]
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    bytes_dicts = medir(como_dicts, cantidad)
+    bytes_slots = medir(como_contactos, cantidad)
+
+    print(f"Contactos: {cantidad}")
+    print(f"Lista de dicts:    {bytes_dicts / 1024 / 1024:8.2f} MB ({bytes_dicts / cantidad:.0f} B/contacto)")
+    print(f"Lista de Contacto: {bytes_slots / 1024 / 1024:8.2f} MB ({bytes_slots / cantidad:.0f} B/contacto)")
+    print(f"Ahorro: {(1 - bytes_slots / bytes_dicts) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
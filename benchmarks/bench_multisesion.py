@@ -0,0 +1,65 @@
+"""
+Mide cómo escala el envío con varias sesiones aisladas (TransporteMultisesion) contra el simulador
+local de WhatsApp Web (benchmarks/whatsapp_local): cada sesión tiene su pantalla Xvfb y su perfil.
+
+Requiere Linux, Xvfb, selenium y Chrome/Chromium.
+Uso: python benchmarks/bench_multisesion.py [contactos] [sesiones máx.] [--sin-xvfb]
+"""
+import os
+import sys
+import tempfile
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, "..", "src"))
+sys.path.insert(0, os.path.join(AQUI, "whatsapp_local"))
+
+import openpyxl
+
+from logic.logic import AlmacenContactos
+from logic.message import send_messages
+from logic.transporte_xvfb import TransporteMultisesion
+from servidor import ServidorWhatsAppLocal
+
+PLANTILLA = "Hola {nombre}, tu membresía vence el {fecha_fin}."
+
+def crear_excel(path, cantidad):
+    wb = openpyxl.Workbook()
+    hoja = wb.active
+    hoja.append(["Reporte de clientes"])
+    hoja.append(["NOMBRES", "CELULAR", "FECHA FIN"])
+    for i in range(cantidad):
+        hoja.append([f"Cliente {i}", 900000000 + i, f"{(i % 28) + 1:02d}/07/2025"])
+    wb.save(path)
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    cantidad = int(argumentos[0]) if argumentos else 40
+    maximo = int(argumentos[1]) if len(argumentos) > 1 else 4
+    xvfb = "--sin-xvfb" not in sys.argv
+
+    with tempfile.TemporaryDirectory() as carpeta, ServidorWhatsAppLocal() as servidor:
+        excel_file = os.path.join(carpeta, "contactos.xlsx")
+        crear_excel(excel_file, cantidad)
+        almacen = AlmacenContactos()
+
+        sesiones = 1
+        base = None
+        while sesiones <= maximo:
+            servidor.enviados.clear()
+            transporte = TransporteMultisesion(
+                sesiones, url_base=servidor.url, carpeta_perfiles=os.path.join(carpeta, "perfiles"),
+                intervalo_sesion=0, xvfb=xvfb
+            )
+            inicio = time.monotonic()
+            enviados = send_messages(excel_file, PLANTILLA, contact_store=almacen, transporte=transporte)
+            total = time.monotonic() - inicio
+
+            recibidos = len({e['phone'] for e in servidor.enviados if e['tipo'] == 'texto'})
+            base = base or total
+            print(f"Sesiones {sesiones}: {enviados} enviados ({recibidos} recibidos) en {total:.2f} s, "
+                  f"{enviados / total * 60:.0f} contactos/min, aceleración x{base / total:.2f}")
+            sesiones *= 2
+
+if __name__ == "__main__":
+    main()
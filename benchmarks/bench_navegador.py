@@ -0,0 +1,116 @@
+"""
+Mide TransporteNavegador contra el simulador local de WhatsApp Web (benchmarks/whatsapp_local),
+sin red ni cuenta real: verifica que cada contacto reciba el mensaje esperado y reporta la latencia.
+
+Con --invalidos, uno de cada CADA_INVALIDO contactos no tiene WhatsApp (el simulador muestra el aviso):
+se verifica que no se cuenten como enviados y se reporta cuánto tarda en detectarse cada uno.
+
+Requiere selenium y Chrome/Chromium. Uso: python benchmarks/bench_navegador.py [contactos] [--ventana] [--invalidos]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, "..", "src"))
+sys.path.insert(0, os.path.join(AQUI, "whatsapp_local"))
+
+import openpyxl
+from PIL import Image
+
+import logic.message as message
+from logic.bitacora import ESTADO_INVALIDO
+from logic.logic import AlmacenContactos
+from logic.plantilla import PlantillaMensaje
+from logic.transporte import NumeroInvalido
+from logic.transporte_navegador import TransporteNavegador
+from servidor import ServidorWhatsAppLocal
+
+PLANTILLA = "Hola {nombre},\ntu membresía vence el {fecha_fin}."
+
+# Con --invalidos, uno de cada tantos contactos no tiene WhatsApp
+CADA_INVALIDO = 5
+
+class TransporteCronometrado(TransporteNavegador):
+    """Mide el tiempo de cada contacto, desde abrir_chat hasta cerrar_chat (o hasta detectar un número inválido)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tiempos = []
+        self.tiempos_invalidos = []
+        self._inicio = None
+
+    def abrir_chat(self, numero):
+        self._inicio = time.monotonic()
+        try:
+            super().abrir_chat(numero)
+        except NumeroInvalido:
+            self.tiempos_invalidos.append(time.monotonic() - self._inicio)
+            raise
+
+    def cerrar_chat(self):
+        super().cerrar_chat()
+        self.tiempos.append(time.monotonic() - self._inicio)
+
+def crear_excel(path, cantidad):
+    """Excel con el formato de AppFit: título en la primera fila y encabezado en la segunda"""
+    wb = openpyxl.Workbook()
+    hoja = wb.active
+    hoja.append(["Reporte de clientes"])
+    hoja.append(["NOMBRES", "CELULAR", "FECHA FIN"])
+    for i in range(cantidad):
+        hoja.append([f"Cliente {i}", 900000000 + i, f"{(i % 28) + 1:02d}/07/2025"])
+    wb.save(path)
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 20
+    headless = "--ventana" not in sys.argv
+    con_invalidos = "--invalidos" in sys.argv
+    message.INTERVALO_ENTRE_ENVIOS = 0
+
+    with tempfile.TemporaryDirectory() as carpeta, ServidorWhatsAppLocal() as servidor:
+        excel_file = os.path.join(carpeta, "contactos.xlsx")
+        imagen = os.path.join(carpeta, "promo.png")
+        crear_excel(excel_file, cantidad)
+        Image.new("RGB", (64, 64), (37, 99, 235)).save(imagen)
+
+        almacen = AlmacenContactos()
+        contactos = almacen.obtener_contactos(excel_file).contactos
+        invalidos = {c.celular for c in contactos[CADA_INVALIDO - 1::CADA_INVALIDO]} if con_invalidos else set()
+        servidor.config['invalidos'] = sorted(invalidos)  # La página lee la configuración en cada carga
+
+        transporte = TransporteCronometrado(url_base=servidor.url, headless=headless)
+        resultados = Counter()
+        inicio = time.monotonic()
+        enviados = message.send_messages(excel_file, PLANTILLA, [imagen], None,
+                                         contact_store=almacen, transporte=transporte, resultados=resultados)
+        total = time.monotonic() - inicio
+
+        # Verificar contra lo que registró el simulador
+        plantilla = PlantillaMensaje(PLANTILLA)
+        esperados = {(c.celular, plantilla.renderizar(c)) for c in contactos if c.celular not in invalidos}
+        textos = {(e['phone'], e['texto']) for e in servidor.enviados if e['tipo'] == 'texto'}
+        imagenes = sum(1 for e in servidor.enviados if e['tipo'] == 'imagen')
+
+    print(f"Contactos: {cantidad}  Enviados: {enviados}  Inválidos: {resultados[ESTADO_INVALIDO]}  "
+          f"Tiempo total: {total:.2f} s")
+    print(f"Textos correctos: {len(esperados & textos)}/{len(esperados)}  Imágenes recibidas: {imagenes}")
+    if transporte.tiempos:
+        print(f"Por contacto: media {statistics.mean(transporte.tiempos) * 1000:.0f} ms, "
+              f"mediana {statistics.median(transporte.tiempos) * 1000:.0f} ms, "
+              f"máx {max(transporte.tiempos) * 1000:.0f} ms")
+    if transporte.tiempos_invalidos:
+        print(f"Detección de inválidos: mediana {statistics.median(transporte.tiempos_invalidos) * 1000:.0f} ms, "
+              f"máx {max(transporte.tiempos_invalidos) * 1000:.0f} ms")
+    if esperados - textos:
+        print(f"Faltan: {sorted(esperados - textos)[:5]}")
+        sys.exit(1)
+    if resultados[ESTADO_INVALIDO] != len(invalidos) or enviados != len(esperados):
+        print(f"Se esperaban {len(esperados)} enviados y {len(invalidos)} inválidos")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Genera libros de Excel sintéticos con el formato del export de AppFit: una fila de título,
+el encabezado en la segunda fila, más columnas de las que usa el envío y una columna CELULAR
+sucia como las reales (números como float, con +51, espacios, guiones, dos números en una celda,
+vacíos, texto y longitudes inválidas, además de números repetidos).
+
+Los libros se guardan en una carpeta de caché con la cantidad de filas y la semilla en el nombre,
+así que se generan una sola vez por máquina.
+
+Uso: python benchmarks/libros_sinteticos.py FILAS [xlsx|xls] [--carpeta CARPETA]
+"""
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Cambiar si cambia el contenido generado (invalida los libros en caché)
+VERSION_LIBROS = 1
+
+# El formato .xls admite como máximo 65 536 filas por hoja
+MAXIMO_FILAS_XLS = 65536 - 2
+
+CARPETA_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".libros")
+
+ENCABEZADO = ["CODIGO", "NOMBRES", "DNI", "CELULAR", "CORREO", "MEMBRESIA", "FECHA INICIO", "FECHA FIN",
+              "ESTADO", "SEDE"]
+
+NOMBRES = ["Ana", "Luis", "María", "José", "Rosa", "Carlos", "Lucía", "Jorge", "Carmen", "Miguel",
+           "Sofía", "Pedro", "Valeria", "Diego", "Camila", "Renzo", "Milagros", "Álvaro", "Fiorella", "Iñigo"]
+APELLIDOS = ["Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Huamán", "Mamani", "Torres", "Díaz",
+             "Ramírez", "Chávez", "Vargas", "Castillo", "Rojas", "Mendoza", "Núñez"]
+MEMBRESIAS = ["Mensual", "Trimestral", "Semestral", "Anual", "Día libre"]
+SEDES = ["Miraflores", "San Isidro", "Surco", "Los Olivos", "Arequipa Centro"]
+
+def _celular(azar, anteriores):
+    """Valor de CELULAR con la mezcla de formatos que aparece en los exports reales"""
+    numero = azar.randint(900000000, 999999999)
+    r = azar.random()
+    if r < 0.03 and anteriores:
+        return azar.choice(anteriores)                  # Número repetido (otra fila del mismo socio)
+    anteriores.append(float(numero))
+    if len(anteriores) > 1000:
+        del anteriores[:500]
+    if r < 0.55:
+        return float(numero)                            # Celda numérica: 987654321.0
+    if r < 0.65:
+        return str(numero)                              # Texto
+    if r < 0.73:
+        return f"+51 {str(numero)[:3]} {str(numero)[3:6]} {str(numero)[6:]}"
+    if r < 0.78:
+        return f"{str(numero)[:3]}-{str(numero)[3:6]}-{str(numero)[6:]}"
+    if r < 0.83:
+        return float(f"51{numero}")                     # Con prefijo, numérico
+    if r < 0.86:
+        return f"{numero} / {azar.randint(900000000, 999999999)}"
+    if r < 0.90:
+        return None                                     # Vacío
+    if r < 0.93:
+        return azar.choice(["sin celular", "-", "no tiene", "NO REGISTRA"])
+    return str(numero)[:azar.choice([7, 8])] if azar.random() < 0.5 else f"{numero}{azar.randint(0, 9)}"
+
+def filas_sinteticas(filas, semilla=0):
+    """Genera las filas de datos (sin título ni encabezado)"""
+    azar = random.Random(semilla)
+    anteriores = []
+    base = datetime(2025, 1, 1)
+    for i in range(filas):
+        inicio = base + timedelta(days=azar.randint(0, 365))
+        fin = inicio + timedelta(days=azar.choice([30, 90, 180, 365]))
+        if azar.random() < 0.2:
+            fin = fin.strftime("%d/%m/%Y")  # Algunas fechas vienen escritas como texto
+        nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+        yield [
+            f"S{i:07d}", nombre, str(azar.randint(10000000, 79999999)), _celular(azar, anteriores),
+            f"socio{i}@correo.pe" if azar.random() < 0.7 else None, azar.choice(MEMBRESIAS),
+            inicio, fin, azar.choice(["ACTIVO", "VENCIDO", "CONGELADO"]), azar.choice(SEDES),
+        ]
+
+def escribir_xlsx(path, filas, semilla=0):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    hoja = wb.create_sheet("Socios")
+    hoja.append(["Reporte de socios - AppFit"])
+    hoja.append(ENCABEZADO)
+    for fila in filas_sinteticas(filas, semilla):
+        hoja.append(fila)
+    wb.save(path)
+
+def escribir_xls(path, filas, semilla=0):
+    import pyexcel
+
+    if filas > MAXIMO_FILAS_XLS:
+        raise ValueError(f"El formato .xls admite hasta {MAXIMO_FILAS_XLS} filas de datos")
+    datos = [["Reporte de socios - AppFit"], ENCABEZADO]
+    for fila in filas_sinteticas(filas, semilla):
+        # xlwt no escribe None: celda vacía
+        datos.append(["" if v is None else v for v in fila])
+    try:
+        pyexcel.save_as(array=datos, dest_file_name=path)
+    finally:
+        pyexcel.free_resources()
+
+def obtener_libro(filas, formato="xlsx", semilla=0, carpeta=CARPETA_POR_DEFECTO):
+    """Ruta de un libro sintético con `filas` filas; lo genera si no está en la carpeta de caché"""
+    os.makedirs(carpeta, exist_ok=True)
+    path = os.path.join(carpeta, f"socios_{filas}_s{semilla}_v{VERSION_LIBROS}.{formato}")
+    if not os.path.exists(path):
+        temporal = path + ".tmp." + formato
+        (escribir_xls if formato == "xls" else escribir_xlsx)(temporal, filas, semilla)
+        os.replace(temporal, path)
+    return path
+
+def main():
+    argumentos = sys.argv[1:]
+    carpeta = CARPETA_POR_DEFECTO
+    if "--carpeta" in argumentos:
+        posicion = argumentos.index("--carpeta")
+        carpeta = argumentos[posicion + 1]
+        del argumentos[posicion:posicion + 2]
+    if not argumentos:
+        print(__doc__)
+        sys.exit(1)
+    filas = int(argumentos[0])
+    formato = argumentos[1] if len(argumentos) > 1 else "xlsx"
+    print(obtener_libro(filas, formato, carpeta=carpeta))
+
+if __name__ == "__main__":
+    main()
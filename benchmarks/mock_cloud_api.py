@@ -0,0 +1,107 @@
+"""
+Servidor local que imita la Cloud API de WhatsApp Business (/media y /messages) para probar
+TransporteCloudAPI sin red: simula latencia por petición y respuestas 429 con Retry-After.
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockCloudAPI:
+    """
+    latencia: segundos por petición (o función sin argumentos que los retorna)
+    probabilidad_429: fracción de peticiones a /messages que responden 429
+    retry_after: valor de la cabecera Retry-After en las respuestas 429
+    """
+
+    def __init__(self, puerto=0, latencia=0.05, probabilidad_429=0.0, retry_after=0.2, semilla=None):
+        self.latencia = latencia
+        self.probabilidad_429 = probabilidad_429
+        self.retry_after = retry_after
+        self.mensajes = []
+        self.subidas = []
+        self.rechazos_429 = 0
+        self.conexiones = 0
+        self._azar = random.Random(semilla)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", puerto), self._crear_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, puerto = self._httpd.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def _crear_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True  # Cabeceras y cuerpo se escriben por separado
+
+            def setup(self):
+                super().setup()
+                with mock._lock:
+                    mock.conexiones += 1
+
+            def _responder(self, estado, datos, cabeceras=None):
+                cuerpo = json.dumps(datos).encode()
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                for clave, valor in (cabeceras or {}).items():
+                    self.send_header(clave, valor)
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def do_POST(self):
+                cuerpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                latencia = mock.latencia() if callable(mock.latencia) else mock.latencia
+                if latencia:
+                    time.sleep(latencia)
+
+                if self.path.endswith("/media"):
+                    media_id = uuid.uuid4().hex
+                    with mock._lock:
+                        mock.subidas.append((media_id, len(cuerpo)))
+                    self._responder(200, {"id": media_id})
+                    return
+
+                if self.path.endswith("/messages"):
+                    with mock._lock:
+                        limitado = mock._azar.random() < mock.probabilidad_429
+                        if limitado:
+                            mock.rechazos_429 += 1
+                    if limitado:
+                        self._responder(429, {"error": {"message": "Rate limit hit", "code": 130429}},
+                                        {"Retry-After": str(mock.retry_after)})
+                        return
+                    datos = json.loads(cuerpo)
+                    with mock._lock:
+                        mock.mensajes.append(datos)
+                    self._responder(200, {"messaging_product": "whatsapp",
+                                          "messages": [{"id": f"wamid.{uuid.uuid4().hex}"}]})
+                    return
+
+                self._responder(404, {"error": {"message": "Ruta desconocida", "code": 100}})
+
+            def log_message(self, *args):
+                pass  # Sin log por petición
+
+        return Handler
+
+    def iniciar(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
@@ -0,0 +1,288 @@
+"""
+Suite de rendimiento: lectura del Excel, conversión, validación de números, armado de mensajes
+y una campaña completa de send_messages con un transporte simulado y esperas virtuales
+(las latencias y el intervalo entre contactos avanzan un reloj, no se duermen).
+
+Los libros sintéticos (ver libros_sinteticos.py) se generan una vez y quedan en caché.
+Cada caso se corre una vez sin medir (calentamiento) y luego se repite al menos --repeticiones
+veces, o más si es corto (hasta juntar TIEMPO_OBJETIVO segundos). Se informa el mejor tiempo.
+
+La velocidad de una máquina virtual o de una laptop cambia de un minuto a otro (hasta el doble),
+así que la comparación no usa los segundos sino el tiempo relativo: entre repetición y repetición
+se corre una carga fija de referencia y se toma la mediana de caso / referencia (promedio de las
+referencias de antes y de después). Se marca como regresión todo caso cuyo tiempo relativo supera
+el de la base más la tolerancia, si la diferencia equivale además a más del mínimo significativo.
+
+El archivo base solo vale para la máquina donde se grabó (se anotan su plataforma y procesador):
+en otra máquina, o después de cambiarla, primero grabar una base propia con --guardar-base.
+
+Uso:
+    python benchmarks/suite.py                              # 1k y 10k filas, compara con la base
+    python benchmarks/suite.py --filas 1000,10000,100000,500000
+    python benchmarks/suite.py --guardar-base               # guarda estos resultados como la nueva base
+    python benchmarks/suite.py --solo leer_excel,send_messages --tolerancia 0.3
+
+Termina con código 1 si hay alguna regresión.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, "..", "src"))
+sys.path.insert(0, AQUI)
+
+from libros_sinteticos import MAXIMO_FILAS_XLS, obtener_libro
+
+BASE_POR_DEFECTO = os.path.join(AQUI, "base_rendimiento.json")
+TOLERANCIA_POR_DEFECTO = 0.25
+
+# Diferencias menores a max(MINIMO_SIGNIFICATIVO, MINIMO_RELATIVO * base) son ruido del sistema
+# aunque superen la tolerancia (los casos de ~0.1 s varían más que eso entre corridas)
+MINIMO_SIGNIFICATIVO = 0.02
+MINIMO_RELATIVO = 0.1
+
+# Los casos cortos se repiten hasta sumar unos segundos de medición, con un tope de repeticiones
+TIEMPO_OBJETIVO = 2.0
+REPETICIONES_MAXIMAS = 30
+
+PLANTILLA = "Hola {nombre}, tu membresía vence el {fecha_fin:%d-%m-%Y}. Renueva y recibe 10% de descuento."
+
+# Latencias simuladas por paso del transporte (segundos virtuales, parecidas a WhatsApp Web)
+LATENCIAS_SIMULADAS = {"abrir_chat": 6.0, "enviar_texto": 1.5, "adjuntar_imagenes": 4.0, "cerrar_chat": 1.0}
+
+class RelojVirtual:
+    """Reloj que solo avanza cuando alguien 'duerme'"""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+    def avanzar(self, segundos):
+        self.ahora += max(0.0, segundos)
+
+def _control_virtual(reloj):
+    from logic.control import ControlCampana
+
+    class ControlVirtual(ControlCampana):
+        """Las esperas respetan la cancelación pero avanzan el reloj virtual en lugar de dormir"""
+
+        def esperar(self, segundos):
+            self.verificar()
+            reloj.avanzar(segundos)
+
+    return ControlVirtual()
+
+def referencia():
+    """Carga fija de Python puro (diccionarios, cadenas y ordenamiento) de unos 50 ms"""
+    datos = {str(i): (i * 7919) % 100003 for i in range(50000)}
+    return sorted(datos.items(), key=lambda item: item[1])[0]
+
+def _cronometrar(funcion):
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        return time.perf_counter() - inicio, resultado
+
+def medir(funcion, repeticiones):
+    """
+    (mejor, mediana, relativo, resultado): tiempos en segundos de las ejecuciones medidas, mediana
+    de caso / referencia() (promedio de la corrida justo antes y justo después de cada una)
+    y lo que retornó la última.
+    Una primera ejecución de calentamiento (cachés, imports diferidos) no se cuenta; su duración
+    decide cuántas veces repetir: al menos `repeticiones`, y los casos cortos hasta sumar
+    TIEMPO_OBJETIVO (como máximo REPETICIONES_MAXIMAS). La salida por consola se descarta.
+    """
+    calentamiento, resultado = _cronometrar(funcion)
+    veces = max(repeticiones, min(REPETICIONES_MAXIMAS, math.ceil(TIEMPO_OBJETIVO / max(calentamiento, 1e-6))))
+    tiempos = []
+    relativos = []
+    antes, _ = _cronometrar(referencia)
+    for _ in range(veces):
+        segundos, resultado = _cronometrar(funcion)
+        despues, _ = _cronometrar(referencia)
+        tiempos.append(segundos)
+        relativos.append(segundos / ((antes + despues) / 2))
+        antes = despues
+    return min(tiempos), statistics.median(tiempos), statistics.median(relativos), resultado
+
+def casos(filas, carpeta_temporal):
+    """Lista de (nombre, función sin argumentos, filas procesadas) para un tamaño de libro"""
+    from logic.logic import AlmacenContactos, convertir_xls_a_xlsx, leer_excel, validar_numeros
+    from logic.plantilla import PlantillaMensaje
+
+    xlsx = obtener_libro(filas, "xlsx")
+    xls = obtener_libro(filas, "xls") if filas <= MAXIMO_FILAS_XLS else None
+    df = leer_excel(xlsx, solo_requeridas=True)
+    contactos = AlmacenContactos().obtener_contactos(xlsx).contactos
+    plantilla = PlantillaMensaje(PLANTILLA)
+
+    lista = [
+        (f"leer_excel[xlsx,{filas}]", lambda: leer_excel(xlsx, solo_requeridas=True), filas),
+    ]
+    if xls:
+        destino = os.path.join(carpeta_temporal, f"convertido_{filas}.xlsx")
+        lista += [
+            (f"leer_excel[xls,{filas}]", lambda: leer_excel(xls, solo_requeridas=True), filas),
+            (f"convertir_xls_a_xlsx[{filas}]", lambda: convertir_xls_a_xlsx(xls, destino), filas),
+        ]
+    lista += [
+        (f"validar_numeros[{filas}]", lambda: validar_numeros(df), filas),
+        (f"renderizar[{filas}]", lambda: [plantilla.renderizar(c) for c in contactos], len(contactos)),
+        (f"obtener_contactos[xlsx,{filas}]", lambda: AlmacenContactos().obtener_contactos(xlsx), filas),
+        (f"send_messages[{filas}]", lambda: campana_simulada(xlsx, carpeta_temporal), len(contactos)),
+    ]
+    return lista
+
+def campana_simulada(xlsx, carpeta_temporal):
+    """
+    Campaña completa: lectura, bitácora en disco, medición de fases y un
+    transporte simulado cuyas latencias e intervalo avanzan un reloj virtual.
+    Retorna (enviados, segundos virtuales de la campaña).
+    """
+    from logic.bitacora import BitacoraEnvios
+    from logic.logic import AlmacenContactos
+    from logic.message import send_messages
+    from logic.tiempos import MedidorFases
+    from logic.transporte import TransporteFalso
+
+    reloj = RelojVirtual()
+    transporte = TransporteFalso(latencias=LATENCIAS_SIMULADAS)
+    transporte.llamadas = _SinRegistro()  # 500k contactos x 4 pasos no caben cómodos en memoria
+    ruta_bitacora = os.path.join(carpeta_temporal, "bitacora.sqlite3")
+    bitacora = BitacoraEnvios(ruta_bitacora, tamano_lote=100)
+    try:
+        enviados = send_messages(
+            xlsx, PLANTILLA, contact_store=AlmacenContactos(), transporte=transporte,
+            control=_control_virtual(reloj), bitacora=bitacora, medidor=MedidorFases(reloj=reloj)
+        )
+    finally:
+        bitacora.cerrar()
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(ruta_bitacora + sufijo):
+                os.remove(ruta_bitacora + sufijo)
+    return enviados, reloj.ahora
+
+class _SinRegistro(list):
+    """Lista que descarta lo que se le agrega (TransporteFalso.llamadas sin memoria)"""
+
+    def append(self, _):
+        pass
+
+def _maquina():
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+def leer_base(path):
+    """Contenido del archivo base (vacío si no existe)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def guardar_base(path, resultados, relativos):
+    """Agrega o reemplaza en el archivo base los casos medidos (segundos y tiempos relativos)"""
+    datos = leer_base(path)
+    base = dict(datos.get("resultados", {}), **resultados)
+    base_relativos = dict(datos.get("relativos", {}), **relativos)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generada": datetime.now().isoformat(timespec="seconds"),
+            **_maquina(),
+            "resultados": dict(sorted(base.items())),
+            "relativos": dict(sorted(base_relativos.items())),
+        }, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+def comparar(relativo, base_relativo, base_segundos, tolerancia):
+    """
+    Estado del caso frente a la base: 'nuevo', 'ok', 'mejora' o 'REGRESIÓN'.
+    El cambio se calcula con los tiempos relativos; el mínimo significativo, en segundos de la base.
+    """
+    if base_relativo is None or base_segundos is None:
+        return "nuevo", None
+    cambio = relativo / base_relativo - 1 if base_relativo else 0.0
+    significativa = abs(cambio) * base_segundos > max(MINIMO_SIGNIFICATIVO, MINIMO_RELATIVO * base_segundos)
+    if cambio > tolerancia and significativa:
+        return "REGRESIÓN", cambio
+    if cambio < -tolerancia and significativa:
+        return "mejora", cambio
+    return "ok", cambio
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de WhatsApp Sender")
+    parser.add_argument("--filas", default="1000,10000", help="tamaños de libro separados por coma")
+    parser.add_argument("--repeticiones", type=int, default=5,
+                        help="ejecuciones medidas mínimas por caso (se toma el mejor tiempo)")
+    parser.add_argument("--solo", help="solo los casos cuyo nombre empieza con alguno de estos (separados por coma)")
+    parser.add_argument("--base", default=BASE_POR_DEFECTO, help="archivo JSON con los tiempos de referencia")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_POR_DEFECTO,
+                        help="fracción de tiempo relativo extra aceptada antes de marcar regresión (0.25 = 25%%)")
+    parser.add_argument("--guardar-base", action="store_true", help="guardar los resultados como nueva base")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.filas.split(",") if t.strip()]
+    filtros = [f.strip() for f in (args.solo or "").split(",") if f.strip()]
+    datos_base = leer_base(args.base)
+    base = datos_base.get("resultados", {})
+    base_relativos = datos_base.get("relativos", {})
+    maquina = _maquina()
+    distinta = [clave for clave in ("python", "plataforma", "procesador", "nucleos")
+                if clave in datos_base and datos_base[clave] != maquina[clave]]
+    if base and distinta and not args.guardar_base:
+        print(f"Aviso: la base se grabó en otra máquina ({', '.join(distinta)} distinto); "
+              "las comparaciones son solo orientativas. Graba una base propia con --guardar-base.\n")
+
+    resultados = {}
+    relativos = {}
+    regresiones = []
+    print(f"{'Caso':<34}{'mejor':>10}{'mediana':>10}{'filas/s':>12}{'base':>10}{'cambio':>9}  estado")
+    with tempfile.TemporaryDirectory() as carpeta_temporal:
+        for filas in tamanos:
+            print(f"Preparando libros de {filas} filas...", file=sys.stderr)
+            for nombre, funcion, procesadas in casos(filas, carpeta_temporal):
+                if filtros and not any(nombre.startswith(f) for f in filtros):
+                    continue
+                mejor, mediana, relativo, resultado = medir(funcion, args.repeticiones)
+                resultados[nombre] = round(mejor, 5)
+                relativos[nombre] = round(relativo, 5)
+                estado, cambio = comparar(relativo, base_relativos.get(nombre), base.get(nombre), args.tolerancia)
+                if estado == "REGRESIÓN":
+                    regresiones.append(nombre)
+                base_txt = f"{base[nombre]:.4f}" if nombre in base else "-"
+                cambio_txt = f"{cambio * 100:+.0f}%" if cambio is not None else "-"
+                print(f"{nombre:<34}{mejor:>10.4f}{mediana:>10.4f}{procesadas / mejor:>12,.0f}"
+                      f"{base_txt:>10}{cambio_txt:>9}  {estado}")
+
+                if nombre.startswith("send_messages"):
+                    enviados, virtuales = resultado
+                    print(f"    {enviados} enviados; campaña simulada de {virtuales / 3600:.1f} h virtuales "
+                          f"procesada en {mejor:.2f} s")
+
+    if args.guardar_base:
+        guardar_base(args.base, resultados, relativos)
+        print(f"\nBase actualizada: {args.base}")
+
+    if regresiones:
+        print(f"\nRegresiones (más de {args.tolerancia:.0%} sobre la base): {', '.join(regresiones)}")
+        sys.exit(1)
+    if not args.guardar_base:
+        print("\nSin regresiones" if base else "\nSin base para comparar (usa --guardar-base)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Servidor HTTP local que sirve el simulador de WhatsApp Web (index.html) y registra lo que la
+página "envía". Sirve para medir TransporteNavegador sin red ni cuenta de WhatsApp.
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGINA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
+
+class ServidorWhatsAppLocal:
+    """
+    retardo_carga_ms: demora simulada hasta que la app muestra el chat
+    retardo_subida_ms: demora simulada de la subida de adjuntos
+    invalidos: números (sin +) que muestran el aviso de número inválido
+    """
+
+    def __init__(self, puerto=0, retardo_carga_ms=300, retardo_subida_ms=200, invalidos=()):
+        self.config = {
+            'retardo_carga_ms': retardo_carga_ms,
+            'retardo_subida_ms': retardo_subida_ms,
+            'invalidos': list(invalidos),
+        }
+        self.enviados = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", puerto), self._crear_handler())
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._httpd.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def _crear_handler(self):
+        servidor = self
+        with open(PAGINA, 'rb') as f:
+            pagina = f.read()
+
+        class Handler(BaseHTTPRequestHandler):
+            def _responder(self, cuerpo, tipo):
+                self.send_response(200)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def do_GET(self):
+                if self.path == "/config.js":
+                    cuerpo = f"window.CONFIG = {json.dumps(servidor.config)};".encode()
+                    self._responder(cuerpo, "application/javascript")
+                elif self.path == "/api/enviados":
+                    with servidor._lock:
+                        cuerpo = json.dumps(servidor.enviados).encode()
+                    self._responder(cuerpo, "application/json")
+                else:
+                    self._responder(pagina, "text/html; charset=utf-8")
+
+            def do_POST(self):
+                largo = int(self.headers.get("Content-Length", 0))
+                datos = json.loads(self.rfile.read(largo) or b"{}")
+                if self.path == "/api/enviados":
+                    with servidor._lock:
+                        servidor.enviados.append(datos)
+                self._responder(b"{}", "application/json")
+
+            def log_message(self, *args):
+                pass  # Sin log por petición
+
+        return Handler
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
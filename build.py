@@ -1,9 +1,50 @@
 import os
+import statistics
 import subprocess
 import sys
 import shutil
+import time
 from pathlib import Path
 
+NOMBRE = "WhatsAppSender"
+EJECUTABLE = NOMBRE + (".exe" if os.name == 'nt' else "")
+TITULO_VENTANA = "WhatsApp Sender"  # Título de la ventana principal (ui.launch_app)
+
+# Perfiles de construcción:
+#   onefile: un solo .exe comprimido con UPX (el de siempre). Cada vez que se abre, el .exe
+#            descomprime todo el paquete en una carpeta temporal antes de iniciar Python.
+#   rapido:  carpeta con el .exe y sus archivos ya descomprimidos (--onedir), sin UPX y sin los
+#            módulos que la aplicación nunca usa. Arranca sin extraer nada.
+PERFILES = ("onefile", "rapido")
+
+IMPORTS_OCULTOS = [
+    "pyautogui", "pyperclip", "pandas", "pyexcel", "pyexcel.plugins.xls", "pyexcel.plugins.xlsx",
+    "PIL.Image", "PIL.ImageTk", "openpyxl", "xlrd", "tkinter", "threading", "webbrowser",
+]
+
+# Módulos que PyInstaller arrastra por imports opcionales de pandas/numpy/Pillow y que la
+# aplicación no usa (solo lee Excel, arma mensajes y muestra la ventana de Tk)
+EXCLUSIONES_RAPIDO = [
+    # Pruebas empaquetadas dentro de las librerías
+    "pandas.tests", "numpy.tests", "numpy._core.tests", "numpy.core.tests", "numpy.lib.tests",
+    "numpy.linalg.tests", "numpy.fft.tests", "numpy.random.tests", "numpy.ma.tests",
+    "numpy.polynomial.tests", "numpy.typing.tests", "openpyxl.tests",
+    "tkinter.test", "unittest.test", "lib2to3", "test",
+    # Submódulos de pandas/numpy que no se usan
+    # (pandas importa sus lectores de SQL, HDF, Parquet, etc. al iniciar: esos no se pueden quitar)
+    "pandas.io.formats.style", "pandas.io.formats.style_render", "pandas.io.clipboard",
+    "numpy.f2py", "numpy.distutils", "numpy.testing._private.extbuild",
+    # Dependencias opcionales que pandas o Pillow importan si están instaladas
+    "matplotlib", "scipy", "IPython", "jinja2", "pyarrow", "numexpr", "bottleneck", "tables",
+    "sqlalchemy", "fsspec", "pytest", "hypothesis", "tkinter.tix", "pydoc_data", "setuptools",
+    "distutils", "docutils",
+]
+
+# Datos de Tcl/Tk que la interfaz no usa: demos, imágenes de ejemplo, zonas horarias de Tcl
+# (las fechas las maneja Python) y traducciones de diálogos que no son español ni inglés
+DATOS_TK_SOBRANTES = ("demos", "images", "tzdata")
+IDIOMAS_TK = ("es", "en")
+
 def try_direct_pyinstaller():
     """Intenta usar PyInstaller directamente sin verificar la importación"""
     
@@ -35,23 +76,95 @@ def try_direct_pyinstaller():
     
     return None
 
-def build_executable():
-    """Crea el ejecutable portable de WhatsApp Sender"""
-    
-    print("Construyendo WhatsApp Sender...")
+def comando_pyinstaller(python_exe, perfil, icon_path):
+    """Arma el comando de PyInstaller para el perfil pedido"""
+    cmd = [
+        python_exe, "-m", "PyInstaller",
+        "--onefile" if perfil == "onefile" else "--onedir",
+        "--windowed",
+        "--name", NOMBRE,
+        "--clean",
+        "--noconfirm",
+    ]
+    # Agregar imports ocultos importantes
+    for modulo in IMPORTS_OCULTOS:
+        cmd.extend(["--hidden-import", modulo])
+
+    if perfil == "rapido":
+        # UPX ahorra disco pero cada DLL se descomprime en memoria al cargarla: más lento al abrir
+        cmd.append("--noupx")
+        for modulo in EXCLUSIONES_RAPIDO:
+            cmd.extend(["--exclude-module", modulo])
+
+    # Agregar icono si se encontró
+    if icon_path:
+        cmd.extend(["--icon", icon_path])
+        print(f"Agregando icono: {icon_path}")
+
+    # Agregar assets si existen
+    if os.path.exists('src/assets'):
+        cmd.extend(["--add-data", f"src/assets{os.pathsep}assets"])
+        print("Incluyendo carpeta assets")
+
+    cmd.append("src/main.py")
+    return cmd
+
+def podar_datos_tk(carpeta):
+    """
+    Quita de un paquete --onedir los datos de Tcl/Tk que la interfaz no usa.
+    Retorna los bytes liberados.
+    """
+    liberado = 0
+    for raiz, dirs, _ in os.walk(carpeta):
+        nombre_raiz = os.path.basename(raiz).lower()
+        if not (nombre_raiz.startswith("_tcl_data") or nombre_raiz.startswith("_tk_data")
+                or nombre_raiz.startswith("tcl") or nombre_raiz.startswith("tk")):
+            continue
+        for d in list(dirs):
+            ruta = os.path.join(raiz, d)
+            if d in DATOS_TK_SOBRANTES:
+                liberado += tamano_total(ruta)
+                shutil.rmtree(ruta)
+                dirs.remove(d)
+            elif d == "msgs":
+                # Traducciones: solo español e inglés
+                for archivo in os.listdir(ruta):
+                    if os.path.splitext(archivo)[0].split("_")[0] not in IDIOMAS_TK:
+                        liberado += os.path.getsize(os.path.join(ruta, archivo))
+                        os.remove(os.path.join(ruta, archivo))
+                dirs.remove(d)
+    return liberado
+
+def tamano_total(ruta):
+    """Tamaño en bytes de un archivo o de todo lo que contiene una carpeta"""
+    ruta = Path(ruta)
+    if ruta.is_file():
+        return ruta.stat().st_size
+    return sum(f.stat().st_size for f in ruta.rglob("*") if f.is_file())
+
+def build_executable(perfil="onefile", portable=True):
+    """
+    Crea el ejecutable portable de WhatsApp Sender.
+    Retorna la ruta del ejecutable creado (None si falló).
+    """
+    if perfil not in PERFILES:
+        print(f"Perfil desconocido: {perfil} (usa {', '.join(PERFILES)})")
+        return None
+
+    print(f"Construyendo WhatsApp Sender (perfil {perfil})...")
     
     # Buscar PyInstaller usando ejecución directa
     python_exe = try_direct_pyinstaller()
     
     if not python_exe:
         print("\nNo se encontró PyInstaller funcional")
-        return
+        return None
     
     # Verificar que estamos en el directorio correcto
     if not os.path.exists('src/main.py'):
         print("No se encontró src/main.py")
         print("Ejecuta este script desde la raíz del proyecto (okgym/)")
-        return
+        return None
     
     # Verificar icono
     icon_path = None
@@ -75,40 +188,7 @@ def build_executable():
     
     try:
         # Comando de PyInstaller
-        cmd = [
-            python_exe, "-m", "PyInstaller",
-            "--onefile",
-            "--windowed",
-            "--name", "WhatsAppSender",
-            "--clean",
-            "--noconfirm",
-            # Agregar imports ocultos importantes
-            "--hidden-import", "pywhatkit",
-            "--hidden-import", "pyautogui",
-            "--hidden-import", "pandas",
-            "--hidden-import", "pyexcel",
-            "--hidden-import", "pyexcel.plugins.xls",
-            "--hidden-import", "pyexcel.plugins.xlsx",
-            "--hidden-import", "PIL.Image",
-            "--hidden-import", "PIL.ImageTk",
-            "--hidden-import", "openpyxl",
-            "--hidden-import", "xlrd",
-            "--hidden-import", "tkinter",
-            "--hidden-import", "threading",
-            "--hidden-import", "webbrowser",
-        ]
-        
-        # Agregar icono si se encontró
-        if icon_path:
-            cmd.extend(["--icon", icon_path])
-            print(f"Agregando icono: {icon_path}")
-        
-        # Agregar assets si existen
-        if os.path.exists('src/assets'):
-            cmd.extend(["--add-data", "src/assets;assets"])
-            print("Incluyendo carpeta assets")
-        
-        cmd.append("src/main.py")
+        cmd = comando_pyinstaller(python_exe, perfil, icon_path)
         
         print("Ejecutando PyInstaller...")
         print(f"Usando Python: {python_exe}")
@@ -130,44 +210,151 @@ def build_executable():
         
         process.wait()
         
-        if process.returncode == 0:
-            # Verificar que el ejecutable se creó
-            exe_path = Path("dist/WhatsAppSender.exe")
-            if exe_path.exists():
-                size_mb = exe_path.stat().st_size / (1024 * 1024)
-                print(f"\nEjecutable creado exitosamente!")
-                print(f"Ubicación: {exe_path.absolute()}")
-                print(f"Tamaño: {size_mb:.1f} MB")
-                
-                if icon_path:
-                    print(f"Icono aplicado: {icon_path}")
-                
-                # Crear carpeta de distribución
-                dist_folder = Path("WhatsAppSender_Portable")
-                if dist_folder.exists():
-                    shutil.rmtree(dist_folder)
-                
-                dist_folder.mkdir()
-                shutil.copy2(exe_path, dist_folder / "WhatsAppSender.exe")
-                
-                # Crear README para el usuario
-                create_readme(dist_folder)
-                
-                print(f"Versión portable creada en: {dist_folder.absolute()}")
-                
-                # Abrir carpeta del ejecutable (Windows)
-                if os.name == 'nt':
-                    try:
-                        os.startfile(str(dist_folder))
-                    except Exception:
-                        print(f"Abre manualmente: {dist_folder.absolute()}")
-            else:
-                print("El ejecutable no se creó correctamente")
-        else:
+        if process.returncode != 0:
             print(f"PyInstaller falló con código: {process.returncode}")
+            return None
+
+        # Verificar que el ejecutable se creó
+        if perfil == "onefile":
+            salida = Path("dist")
+            exe_path = salida / EJECUTABLE
+        else:
+            salida = Path("dist") / NOMBRE
+            exe_path = salida / EJECUTABLE
+
+        if not exe_path.exists():
+            print("El ejecutable no se creó correctamente")
+            return None
+
+        if perfil == "rapido":
+            liberado = podar_datos_tk(salida)
+            print(f"Datos de Tcl/Tk sin usar eliminados: {liberado / (1024 * 1024):.1f} MB")
+
+        size_mb = tamano_total(exe_path if perfil == "onefile" else salida) / (1024 * 1024)
+        print(f"\nEjecutable creado exitosamente!")
+        print(f"Ubicación: {exe_path.absolute()}")
+        print(f"Tamaño: {size_mb:.1f} MB")
+        
+        if icon_path:
+            print(f"Icono aplicado: {icon_path}")
+
+        if not portable:
+            return exe_path
+        
+        # Crear carpeta de distribución
+        dist_folder = Path("WhatsAppSender_Portable")
+        if dist_folder.exists():
+            shutil.rmtree(dist_folder)
+        
+        if perfil == "onefile":
+            dist_folder.mkdir()
+            shutil.copy2(exe_path, dist_folder / EJECUTABLE)
+        else:
+            # El .exe necesita la carpeta _internal a su lado: se copia el paquete completo
+            shutil.copytree(salida, dist_folder)
+        
+        # Crear README para el usuario
+        create_readme(dist_folder)
+        
+        print(f"Versión portable creada en: {dist_folder.absolute()}")
+        
+        # Abrir carpeta del ejecutable (Windows)
+        if os.name == 'nt':
+            try:
+                os.startfile(str(dist_folder))
+            except Exception:
+                print(f"Abre manualmente: {dist_folder.absolute()}")
+        return dist_folder / EJECUTABLE
             
     except Exception as e:
         print(f"Error inesperado: {e}")
+        return None
+
+def ventana_abierta(titulo=TITULO_VENTANA):
+    """True si hay una ventana visible con ese título (Windows: pygetwindow; Linux: xdotool)"""
+    if os.name == 'nt':
+        import pygetwindow as gw
+        return any(ventana.title == titulo for ventana in gw.getWindowsWithTitle(titulo))
+    try:
+        resultado = subprocess.run(["xdotool", "search", "--onlyvisible", "--name", f"^{titulo}$"],
+                                   capture_output=True)
+    except FileNotFoundError:
+        raise Exception("Para medir el arranque en Linux instala xdotool:\nsudo apt install xdotool")
+    return resultado.returncode == 0
+
+def cerrar_proceso(proceso):
+    """Cierra el ejecutable y sus hijos (el .exe onefile corre la aplicación en un proceso hijo)"""
+    if proceso.poll() is not None:
+        return
+    if os.name == 'nt':
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(proceso.pid)], capture_output=True)
+    else:
+        proceso.terminate()
+    try:
+        proceso.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proceso.kill()
+
+def medir_arranque(exe_path, corridas=5, timeout=120):
+    """
+    Abre el ejecutable `corridas` veces y mide cuánto tarda en aparecer la ventana principal
+    (se busca por su título desde afuera; la aplicación no sabe que la están midiendo) y la cierra.
+    Retorna la lista de tiempos en segundos.
+    """
+    if ventana_abierta():
+        raise Exception(f"Cierra la ventana de {TITULO_VENTANA} abierta antes de medir el arranque")
+    tiempos = []
+    for _ in range(corridas):
+        inicio = time.perf_counter()
+        proceso = subprocess.Popen([str(exe_path)])
+        try:
+            while not ventana_abierta():
+                if proceso.poll() is not None:
+                    raise Exception(f"{exe_path} se cerró sin mostrar la ventana (código {proceso.returncode})")
+                if time.perf_counter() - inicio > timeout:
+                    raise Exception(f"{exe_path} no mostró la ventana en {timeout} s")
+                time.sleep(0.01)
+            tiempos.append(time.perf_counter() - inicio)
+        finally:
+            cerrar_proceso(proceso)
+    return tiempos
+
+def comparar_perfiles(corridas=5):
+    """Construye ambos perfiles y reporta tamaño y tiempo de arranque de cada uno"""
+    destino = Path("comparacion_builds")
+    if destino.exists():
+        shutil.rmtree(destino)
+    destino.mkdir()
+
+    ejecutables = {}
+    for perfil in PERFILES:
+        exe_path = build_executable(perfil, portable=False)
+        if exe_path is None:
+            print(f"No se pudo construir el perfil {perfil}; comparación cancelada")
+            return
+        # El siguiente build borra dist/: se guarda el resultado aparte
+        origen = exe_path if perfil == "onefile" else exe_path.parent
+        guardado = destino / perfil
+        if perfil == "onefile":
+            guardado.mkdir()
+            shutil.move(str(origen), str(guardado / EJECUTABLE))
+        else:
+            shutil.move(str(origen), str(guardado))
+        ejecutables[perfil] = guardado / EJECUTABLE
+
+    print(f"\nMidiendo el arranque ({corridas} corridas por perfil)...")
+    filas = []
+    for perfil, exe_path in ejecutables.items():
+        paquete = exe_path if perfil == "onefile" else exe_path.parent
+        archivos = 1 if perfil == "onefile" else sum(1 for f in paquete.rglob("*") if f.is_file())
+        tiempos = medir_arranque(exe_path, corridas)
+        filas.append((perfil, tamano_total(paquete) / (1024 * 1024), archivos,
+                      statistics.median(tiempos), max(tiempos)))
+
+    print(f"\n{'Perfil':<10}{'Tamaño':>12}{'Archivos':>10}{'Arranque (mediana)':>21}{'Peor':>10}")
+    for perfil, tamano, archivos, mediana, peor in filas:
+        print(f"{perfil:<10}{tamano:>9.1f} MB{archivos:>10}{mediana:>19.2f} s{peor:>8.2f} s")
+    print(f"\nEjecutables guardados en: {destino.absolute()}")
 
 def create_readme(dist_folder):
     """Crea un archivo README para el usuario final"""
@@ -186,7 +373,7 @@ def create_readme(dist_folder):
 
 3. **Usar el programa:**
    - Seleccionar archivo Excel
-   - Escribir mensaje (usa {nombre}, {fecha_fin})
+   - Escribir mensaje (usa {nombre}, {celular}, {fecha_fin})
    - Adjuntar imágenes/PDFs (opcional)
    - Previsualizar mensaje
    - Enviar mensajes
@@ -213,4 +400,11 @@ Si tienes problemas, verifica que:
         f.write(readme_content)
 
 if __name__ == "__main__":
-    build_executable()
\ No newline at end of file
+    # python build.py            -> un solo .exe (onefile)
+    # python build.py rapido     -> carpeta con arranque rápido (onedir, módulos recortados)
+    # python build.py comparar   -> construye ambos y compara tamaño y tiempo de arranque
+    opcion = sys.argv[1] if len(sys.argv) > 1 else "onefile"
+    if opcion == "comparar":
+        comparar_perfiles(int(sys.argv[2]) if len(sys.argv) > 2 else 5)
+    else:
+        build_executable(opcion)
\ No newline at end of file
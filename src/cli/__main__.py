@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Ejecutable como "python -m cli" desde src/ o "python -m src.cli" desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
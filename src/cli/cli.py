@@ -0,0 +1,229 @@
+"""
+Envío de campañas sin interfaz gráfica (cron, servidores, scripts).
+Usa el mismo núcleo de lectura y envío que la aplicación, sin importar tkinter.
+
+Ejemplos:
+    python -m cli clientes.xlsx --mensaje "Hola {nombre}, tu membresía vence el {fecha_fin}"
+    python -m cli clientes.xls --mensaje-archivo plantilla.txt --imagen promo.jpg --json
+    python -m cli clientes.xlsx --mensaje-archivo plantilla.txt --transporte api --api-phone-id 123
+"""
+import argparse
+import contextlib
+from collections import Counter
+import json
+import os
+import signal
+import sys
+import time
+
+from logic.duplicados import POLITICA_PRIMERA, POLITICAS_DUPLICADOS
+
+TRANSPORTES = ("navegador", "escritorio", "pestana", "api", "multisesion", "simulado")
+
+# Códigos de salida
+SALIDA_OK = 0
+SALIDA_ERROR = 1
+SALIDA_INCOMPLETA = 3  # Quedaron contactos por enviar (fallos, cancelación o cuota): se puede reanudar
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Envía un mensaje de WhatsApp a los contactos de un Excel (.xls o .xlsx).",
+        epilog="Variables del mensaje: {nombre}, {celular}, {fecha_fin} (p. ej. {fecha_fin:%d-%m-%Y})."
+    )
+    parser.add_argument("excel", help="archivo Excel con las columnas CELULAR, NOMBRES y FECHA FIN")
+
+    mensaje = parser.add_mutually_exclusive_group(required=True)
+    mensaje.add_argument("--mensaje", help="texto del mensaje")
+    mensaje.add_argument("--mensaje-archivo", metavar="ARCHIVO", help="archivo de texto UTF-8 con el mensaje")
+
+    parser.add_argument("--imagen", action="append", default=[], metavar="ARCHIVO",
+                        help="imagen a adjuntar (se puede repetir)")
+    parser.add_argument("--pdf", action="append", default=[], metavar="ARCHIVO",
+                        help="PDF a adjuntar (se puede repetir)")
+
+    envio = parser.add_argument_group("envío")
+    envio.add_argument("--transporte", choices=TRANSPORTES, default="navegador",
+                       help="navegador: WebDriver (por defecto); escritorio/pestana: navegador del escritorio "
+                            "con pyautogui (una pestaña por contacto / una sola pestaña); api: WhatsApp Business "
+                            "Cloud API; multisesion: varias sesiones Xvfb (Linux); simulado: no envía nada")
+    envio.add_argument("--url-base", default="https://web.whatsapp.com", help="URL de WhatsApp Web")
+    envio.add_argument("--perfil", help="carpeta del perfil del navegador con la sesión iniciada")
+    envio.add_argument("--ventana", action="store_true", help="abrir el navegador con ventana (no headless)")
+    envio.add_argument("--sesiones", type=int, default=2, help="sesiones en paralelo para multisesion")
+    envio.add_argument("--carpeta-perfiles", default="perfiles", help="perfiles de las sesiones de multisesion")
+    envio.add_argument("--api-phone-id", help="phone number ID de la Cloud API")
+    envio.add_argument("--api-token", default=os.environ.get("WHATSAPP_TOKEN"),
+                       help="token de la Cloud API (por defecto la variable WHATSAPP_TOKEN)")
+    envio.add_argument("--concurrencia", type=int, default=8, help="envíos en paralelo con la Cloud API")
+    envio.add_argument("--intervalo", type=float, help="segundos entre contactos (por defecto 5)")
+
+    ritmo = parser.add_argument_group("ritmo")
+    ritmo.add_argument("--por-minuto", type=float, help="máximo de contactos por minuto")
+    ritmo.add_argument("--rafaga", type=int, default=3, help="contactos seguidos permitidos tras una pausa")
+    ritmo.add_argument("--jitter", type=float, default=2.0, help="segundos al azar entre envíos (con --por-minuto)")
+    ritmo.add_argument("--limite-diario", type=int, help="máximo de contactos por día")
+    ritmo.add_argument("--horario", help="horarios permitidos, p. ej. \"08:00-13:00, 15:00-20:00\"")
+
+    campana = parser.add_argument_group("campaña")
+    campana.add_argument("--duplicados", choices=POLITICAS_DUPLICADOS, default=POLITICA_PRIMERA,
+                         help="cómo fusionar filas con el mismo número")
+    campana.add_argument("--bitacora", help="archivo SQLite de la bitácora de envíos (por defecto el de la aplicación)")
+    campana.add_argument("--sin-bitacora", action="store_true", help="no registrar ni omitir contactos ya enviados")
+    campana.add_argument("--registro", help="registro de envíos en líneas JSON (por defecto el de la aplicación)")
+    campana.add_argument("--nueva-campana", action="store_true",
+                         help="no reanudar una campaña sin terminar: enviar de nuevo a todos")
+
+    salida = parser.add_argument_group("salida")
+    salida.add_argument("--json", action="store_true",
+                        help="progreso en líneas JSON por stdout (los mensajes de registro van a stderr)")
+    salida.add_argument("--tiempos", metavar="ARCHIVO",
+                        help="agregar a ARCHIVO (JSON lines) el tiempo de cada fase por contacto y el resumen")
+    return parser
+
+def crear_transporte(args):
+    """Transporte según --transporte (imports diferidos: solo se carga el backend elegido)"""
+    if args.transporte == "navegador":
+        from logic.transporte_navegador import TransporteNavegador
+        return TransporteNavegador(args.url_base, headless=not args.ventana, perfil=args.perfil)
+    if args.transporte in ("escritorio", "pestana"):
+        from logic.transporte_escritorio import TransporteEscritorio
+        return TransporteEscritorio(reutilizar_pestana=args.transporte == "pestana")
+    if args.transporte == "api":
+        if not (args.api_phone_id and args.api_token):
+            raise ValueError("La Cloud API necesita --api-phone-id y --api-token (o WHATSAPP_TOKEN)")
+        from logic.transporte_api import TransporteCloudAPI
+        return TransporteCloudAPI(args.api_phone_id, args.api_token, concurrencia=args.concurrencia)
+    if args.transporte == "multisesion":
+        from logic.transporte_xvfb import TransporteMultisesion
+        return TransporteMultisesion(args.sesiones, url_base=args.url_base, carpeta_perfiles=args.carpeta_perfiles)
+
+    from logic.transporte import TransporteFalso
+    transporte = TransporteFalso()
+    transporte.intervalo = 0
+    return transporte
+
+class Reporte:
+    """Progreso en texto legible o en líneas JSON (un objeto por evento)"""
+
+    def __init__(self, salida, como_json):
+        self.salida = salida
+        self.como_json = como_json
+        self._inicio = time.monotonic()
+
+    def evento(self, tipo, texto, **datos):
+        if self.como_json:
+            datos = dict(evento=tipo, segundos=round(time.monotonic() - self._inicio, 3), **datos)
+            self.salida.write(json.dumps(datos, ensure_ascii=False, default=str) + "\n")
+        else:
+            self.salida.write(texto + "\n")
+        self.salida.flush()
+
+    def progreso(self, actual, total, nombre=""):
+        self.evento("progreso", f"[{actual}/{total}] {nombre}".rstrip(),
+                    actual=actual, total=total, nombre=nombre)
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    reporte = Reporte(sys.stdout, args.json)
+
+    try:
+        if args.mensaje_archivo:
+            with open(args.mensaje_archivo, encoding="utf-8") as f:
+                texto = f.read().strip()
+        else:
+            texto = args.mensaje
+        if not texto:
+            raise ValueError("El mensaje está vacío")
+
+        # Imports del núcleo después de parsear: --help responde sin cargar pandas
+        from logic.adjuntos import PreparadorAdjuntos
+        from logic.bitacora import ESTADO_ERROR, ESTADO_INVALIDO, BitacoraEnvios, clave_campana
+        from logic.control import ControlCampana
+        from logic.logic import AlmacenContactos
+        from logic.message import send_messages
+        from logic.planificador import PlanificadorEnvios, parsear_ventanas
+        from logic.registro_envios import RegistroEnvios
+        from logic.plantilla import PlantillaMensaje
+        from logic.tiempos import MedidorFases
+
+        plantilla = PlantillaMensaje(texto)
+        adjuntos = PreparadorAdjuntos()
+        adjuntos.preparar(args.imagen, args.pdf)
+
+        almacen = AlmacenContactos(politica_duplicados=args.duplicados)
+        lote = almacen.obtener_contactos(args.excel)
+        reporte.evento("contactos", f"Números válidos: {len(lote.contactos)}/{lote.total} "
+                                    f"(descartados: {len(lote.rechazados)}, repetidos: {lote.duplicados})",
+                       validos=len(lote.contactos), total_filas=lote.total,
+                       descartados=len(lote.rechazados), duplicados=lote.duplicados)
+
+        planificador = None
+        if args.por_minuto or args.limite_diario or args.horario:
+            planificador = PlanificadorEnvios(
+                tasa=args.por_minuto, rafaga=args.rafaga, jitter=args.jitter if args.por_minuto else 0.0,
+                cuota_diaria=args.limite_diario, ventanas=parsear_ventanas(args.horario)
+            )
+
+        bitacora = campana = clave = registro_envios = None
+        # Una prueba simulada no escribe en la bitácora de la aplicación salvo que se indique otra
+        if not args.sin_bitacora and (args.transporte != "simulado" or args.bitacora):
+            bitacora = BitacoraEnvios(args.bitacora)
+            clave = clave_campana(args.excel, plantilla.texto, args.imagen, args.pdf)
+            pendiente = bitacora.campana_pendiente(clave)
+            if pendiente is not None and args.nueva_campana:
+                bitacora.terminar_campana(pendiente)
+            campana = bitacora.abrir_campana(clave)
+        # Como la bitácora: el registro de la aplicación solo se usa con la bitácora de la aplicación
+        if args.registro or (bitacora is not None and args.bitacora is None):
+            registro_envios = RegistroEnvios(args.registro)
+
+        transporte = crear_transporte(args)
+        if args.intervalo is not None:
+            transporte.intervalo = args.intervalo
+        medidor = MedidorFases(args.tiempos, campana=campana)
+    except Exception as e:
+        reporte.evento("error", f"Error: {e}", mensaje=str(e))
+        return SALIDA_ERROR
+
+    # SIGINT / SIGTERM (Ctrl+C, cron, systemd) terminan el contacto en curso y salen limpio
+    control = ControlCampana()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(senal, lambda *_: control.cancelar())
+
+    # Con --json, stdout queda solo para los eventos; el registro detallado del envío va a stderr
+    registro = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    resultados = Counter()
+    try:
+        with registro:
+            enviados = send_messages(
+                args.excel, plantilla, args.imagen, args.pdf, progress_callback=reporte.progreso,
+                contact_store=almacen, transporte=transporte, control=control,
+                bitacora=bitacora, campana=campana, adjuntos=adjuntos, planificador=planificador,
+                medidor=medidor, registro=registro_envios, resultados=resultados
+            )
+        if bitacora is not None:
+            # send_messages cierra la campaña solo si no quedó nada pendiente
+            completa = bitacora.campana_pendiente(clave) != campana
+        else:
+            completa = not control.cancelado and not resultados[ESTADO_ERROR] and \
+                enviados + resultados[ESTADO_INVALIDO] == len(lote.contactos)
+    except Exception as e:
+        reporte.evento("error", f"Error: {e}", mensaje=str(e))
+        return SALIDA_ERROR
+    finally:
+        if bitacora is not None:
+            bitacora.cerrar()
+        if registro_envios is not None:
+            registro_envios.cerrar()
+
+    if args.json:
+        # En texto, send_messages ya imprimió la tabla de tiempos
+        reporte.evento("tiempos", "", fases=medidor.resumen())
+    invalidos = resultados[ESTADO_INVALIDO]
+    reporte.evento("fin", f"Mensajes enviados: {enviados}"
+                   + (f" ({invalidos} números inválidos o sin WhatsApp)" if invalidos else "")
+                   + ("" if completa else " (campaña sin terminar)"),
+                   enviados=enviados, invalidos=invalidos, fallidos=resultados[ESTADO_ERROR],
+                   completa=completa, cancelado=control.cancelado)
+    return SALIDA_OK if completa else SALIDA_INCOMPLETA
@@ -1,27 +1,87 @@
 import threading
+from collections import Counter
 from tkinter import messagebox
 
-from logic.logic import leer_excel, validar_numeros
-from logic.message import send_messages
-from logic.utils import normalizar_numero
+from logic.adjuntos import ErrorAdjunto, PreparadorAdjuntos
+from logic.bitacora import ESTADO_INVALIDO, BitacoraEnvios, clave_campana
+from logic.duplicados import POLITICA_PRIMERA
+from logic.planificador import PlanificadorEnvios, parsear_ventanas
+from logic.plantilla import PlantillaMensaje
+from logic.registro_envios import RegistroEnvios
+from logic.tiempos import MedidorFases, ruta_por_defecto as ruta_tiempos
 
-def enviar_mensajes(excel_file, mensaje, image_path, pdf_path, status_label, 
-                   app_running_check=None, pause_check=None, progress_callback=None, start_index=0):
+# Ritmo configurado desde la UI: hasta 3 contactos seguidos tras una pausa y hasta 2 s al azar
+# entre envíos para que el patrón no sea perfectamente regular
+RAFAGA_POR_DEFECTO = 3
+JITTER_POR_DEFECTO = 2.0
+
+# Almacén compartido: el Excel se lee una vez y se reutiliza hasta que cambie en disco.
+# Se crea al primer uso: logic.logic carga pandas/openpyxl/pyexcel, que no hacen falta para mostrar la ventana
+_contactos = None
+_politica_duplicados = POLITICA_PRIMERA
+_lock_contactos = threading.Lock()
+
+def obtener_almacen():
+    global _contactos
+    with _lock_contactos:
+        if _contactos is None:
+            from logic.logic import AlmacenContactos
+            _contactos = AlmacenContactos(politica_duplicados=_politica_duplicados)
+        return _contactos
+
+# Revisión y optimización de adjuntos (recuerda los archivos ya revisados en la sesión)
+adjuntos = PreparadorAdjuntos()
+
+# Bitácora de envíos en disco (se abre al primer uso)
+_bitacora = None
+_lock_bitacora = threading.Lock()
+
+def obtener_bitacora():
+    global _bitacora
+    with _lock_bitacora:
+        if _bitacora is None:
+            _bitacora = BitacoraEnvios()
+        return _bitacora
+
+# Registro de envíos en líneas JSON con rotación (se abre al primer uso)
+_registro = None
+
+def obtener_registro():
+    global _registro
+    with _lock_bitacora:
+        if _registro is None:
+            _registro = RegistroEnvios()
+        return _registro
+
+def enviar_mensajes(excel_file, mensaje, image_path, pdf_path, eventos, 
+                   app_running_check=None, pause_check=None, progress_callback=None, start_index=0,
+                   contact_store=None, transporte=None, control=None, bitacora=None, campana=None,
+                   planificador=None):
     """
-    Envía mensajes con verificación de si la aplicación sigue ejecutándose
+    Envía mensajes con verificación de si la aplicación sigue ejecutándose.
+    Corre en el hilo de envío: no toca widgets, publica estados y errores en `eventos`.
+    eventos: ColaEventosUI (o cualquier objeto con estado(texto) y error(titulo, texto))
     app_running_check: función que retorna True si la app sigue ejecutándose
     pause_check: función que retorna True si no está pausado
     progress_callback: función para actualizar progreso (current, total, contact_name)
     start_index: índice desde donde empezar el envío
+    contact_store: almacén de contactos a usar (por defecto el compartido del controlador)
+    transporte: backend de envío (por defecto navegador del escritorio + pyautogui)
+    control: ControlCampana con la pausa/cancelación por eventos
+    bitacora: BitacoraEnvios (por defecto la compartida en la carpeta de datos del usuario)
+    campana: id de campaña a reanudar o crear (ver validar_y_enviar)
+    planificador: PlanificadorEnvios con el ritmo, la cuota y los horarios (ver crear_planificador)
     """
+    from logic.message import send_messages
+
+    contact_store = contact_store or obtener_almacen()
+
     if not excel_file:
-        if app_running_check and app_running_check():
-            status_label.config(text="❌ Por favor selecciona un archivo de Excel")
+        eventos.estado("❌ Por favor selecciona un archivo de Excel")
         return
 
     if not mensaje:
-        if app_running_check and app_running_check():
-            status_label.config(text="❌ Por favor escribe un mensaje")
+        eventos.estado("❌ Por favor escribe un mensaje")
         return
 
     try:
@@ -29,33 +89,27 @@ def enviar_mensajes(excel_file, mensaje, image_path, pdf_path, status_label,
         if app_running_check and not app_running_check():
             return
 
-        if app_running_check and app_running_check():
-            status_label.config(text="📊 Leyendo archivo Excel...")
-
-        df = leer_excel(excel_file)
+        eventos.estado("📊 Leyendo archivo Excel...")
+        lote = contact_store.obtener_contactos(excel_file)
         
         # Verificar nuevamente
         if app_running_check and not app_running_check():
             return
 
-        if app_running_check and app_running_check():
-            status_label.config(text="🔍 Validando números...")
-
-        validos = validar_numeros(df, normalizar_numero)
-        total = len(df)
-
-        # Verificar antes de mostrar estadísticas
-        if app_running_check and not app_running_check():
-            return
+        eventos.estado("🔍 Validando números...")
+        validos = len(lote.contactos)
+        total = lote.total
 
-        if app_running_check and app_running_check():
-            status_label.config(text=f"📱 Números válidos: {validos}/{total}")
+        repetidos = f" ({lote.duplicados} repetidos omitidos)" if lote.duplicados else ""
+        eventos.estado(f"📱 Números válidos: {validos}/{total}{repetidos}")
 
         if validos == 0:
-            if app_running_check and app_running_check():
-                status_label.config(text="❌ No hay números válidos para enviar")
+            eventos.estado("❌ No hay números válidos para enviar")
             return
 
+        # Validar la plantilla antes de enviar a nadie
+        plantilla = PlantillaMensaje(mensaje)
+
         # Verificar antes de iniciar envío
         if app_running_check and not app_running_check():
             return
@@ -64,62 +118,155 @@ def enviar_mensajes(excel_file, mensaje, image_path, pdf_path, status_label,
         if progress_callback:
             progress_callback(start_index, validos)
 
-        if app_running_check and app_running_check():
-            if start_index > 0:
-                status_label.config(text=f"🚀 Reanudando envío desde contacto {start_index + 1}...")
-            else:
-                status_label.config(text="🚀 Iniciando envío de mensajes...")
+        if start_index > 0:
+            eventos.estado(f"🚀 Reanudando envío desde contacto {start_index + 1}...")
+        else:
+            eventos.estado("🚀 Iniciando envío de mensajes...")
 
         # Pasar todas las funciones de verificación al módulo de envío
+        resultados = Counter()
         enviados = send_messages(
-            excel_file, mensaje, image_path, pdf_path, 
-            app_running_check, pause_check, progress_callback, start_index
+            excel_file, plantilla, image_path, pdf_path, 
+            app_running_check, pause_check, progress_callback, start_index,
+            contact_store=contact_store, transporte=transporte, control=control,
+            bitacora=bitacora or obtener_bitacora(), campana=campana, adjuntos=adjuntos,
+            planificador=planificador,
+            medidor=MedidorFases(ruta_tiempos(), campana=campana),  # Tiempos por fase de cada contacto
+            registro=obtener_registro(), resultados=resultados
         )
 
         # Verificar antes de mostrar resultado final
         if app_running_check and not app_running_check():
             return
 
-        if app_running_check and app_running_check():
-            if enviados > 0:
-                status_label.config(text=f"✅ Mensajes enviados: {enviados}/{validos}")
-            else:
-                status_label.config(text="❌ No se pudieron enviar mensajes")
+        invalidos = resultados[ESTADO_INVALIDO]
+        sin_whatsapp = f" ({invalidos} números inválidos o sin WhatsApp)" if invalidos else ""
+        if enviados > 0:
+            eventos.estado(f"✅ Mensajes enviados: {enviados}/{validos}{sin_whatsapp}")
+        elif invalidos:
+            eventos.estado(f"❌ No se enviaron mensajes{sin_whatsapp}")
+        else:
+            eventos.estado("❌ No se pudieron enviar mensajes")
 
+    except ErrorAdjunto as e:
+        # Una imagen que no se pudo abrir u optimizar (la revisión en la UI no decodifica)
+        eventos.estado("❌ Error en los adjuntos")
+        eventos.error("Error en los adjuntos", str(e))
     except Exception as e:
-        if app_running_check and app_running_check():
-            status_label.config(text=f"❌ Error: {str(e)}")
-            messagebox.showerror("Error", f"Error al enviar mensajes:\n{str(e)}")
+        eventos.estado(f"❌ Error: {str(e)}")
+        eventos.error("Error", f"Error al enviar mensajes:\n{str(e)}")
+
+def crear_planificador(por_minuto="", limite_diario="", horario=""):
+    """
+    Arma el PlanificadorEnvios a partir de los campos de la UI (texto; vacío = sin límite).
+    Retorna None si no se configuró nada. Sin máx. por minuto se mantiene la espera fija entre contactos.
+    Lanza ValueError con un mensaje para el usuario si algún valor no es válido.
+    """
+    por_minuto, limite_diario, horario = (str(v or "").strip() for v in (por_minuto, limite_diario, horario))
+    if not (por_minuto or limite_diario or horario):
+        return None
+
+    try:
+        tasa = float(por_minuto.replace(",", ".")) if por_minuto else None
+    except ValueError:
+        raise ValueError(f"Máx. por minuto no válido: '{por_minuto}'")
+    try:
+        cuota = int(limite_diario) if limite_diario else None
+    except ValueError:
+        raise ValueError(f"Límite diario no válido: '{limite_diario}'")
+
+    return PlanificadorEnvios(
+        tasa=tasa, rafaga=RAFAGA_POR_DEFECTO, jitter=JITTER_POR_DEFECTO if tasa else 0.0,
+        cuota_diaria=cuota, ventanas=parsear_ventanas(horario)
+    )
+
+def configurar_duplicados(politica):
+    """
+    Cambia cómo se fusionan los contactos con el mismo número (ver logic.duplicados.POLITICAS_DUPLICADOS;
+    una política desconocida falla al armar el lote)
+    """
+    global _politica_duplicados
+    with _lock_contactos:
+        _politica_duplicados = politica
+        if _contactos is not None:
+            _contactos.politica_duplicados = politica
+
+def elegir_campana(excel_file, mensaje, image_path=None, pdf_path=None):
+    """
+    Si quedó una campaña sin terminar con el mismo Excel, mensaje y adjuntos y ya se le envió a
+    alguien, pregunta si se continúa (omitiendo los ya enviados y los números inválidos) o se empieza
+    de nuevo. Si no se le envió a nadie se continúa sin preguntar, para no perder los números ya
+    marcados como inválidos. Retorna el id de campaña a usar.
+    """
+    bitacora = obtener_bitacora()
+    clave = clave_campana(excel_file, mensaje, image_path, pdf_path)
+    pendiente = bitacora.campana_pendiente(clave)
+    if pendiente is None:
+        return bitacora.nueva_campana(clave)
+
+    ya_enviados = len(bitacora.entregados(pendiente))
+    if not ya_enviados:
+        return pendiente
 
-def validar_y_enviar(excel_file, mensaje, status_label, message_text, iniciar_hilo, show_progress_callback=None):
+    invalidos = len(bitacora.resueltos(pendiente)) - ya_enviados
+    aviso_invalidos = f" y {invalidos} número(s) se marcaron como inválidos" if invalidos else ""
+    if messagebox.askyesno(
+        "Campaña sin terminar",
+        f"Este mensaje ya se envió a {ya_enviados} contacto(s) de este Excel{aviso_invalidos} "
+        "en un envío que no terminó.\n\n"
+        "¿Continuar donde quedó? (No = enviar de nuevo a todos)"
+    ):
+        return pendiente
+
+    bitacora.terminar_campana(pendiente)
+    return bitacora.nueva_campana(clave)
+
+def validar_y_enviar(excel_file, mensaje, status_label, message_text, iniciar_hilo, show_progress_callback=None,
+                     image_path=None, pdf_path=None):
     if not excel_file:
         messagebox.showerror("Error", "Selecciona un archivo de Excel")
         return
 
     try:
-        df = leer_excel(excel_file)
-        validos = validar_numeros(df, normalizar_numero)
+        PlantillaMensaje(mensaje)
+    except ValueError as e:
+        messagebox.showerror("Error en el mensaje", str(e))
+        return
+
+    # Revisión rápida de los adjuntos antes de empezar; la optimización de las imágenes
+    # (decodificar y reducir con Pillow) la hace send_messages en el hilo de envío
+    try:
+        adjuntos.revisar(image_path or (), pdf_path or ())
+    except ErrorAdjunto as e:
+        messagebox.showerror("Error en los adjuntos", str(e))
+        return
+
+    try:
+        lote = obtener_almacen().obtener_contactos(excel_file)
+        validos = len(lote.contactos)
 
         if validos == 0:
             messagebox.showwarning("Advertencia", "No se encontró ningún número válido con formato peruano.")
             return
 
+        campana = elegir_campana(excel_file, mensaje, image_path, pdf_path)
+
         # Mostrar controles de progreso antes de iniciar
         if show_progress_callback:
             show_progress_callback(validos)
 
-        messagebox.showinfo("Validación exitosa", f"Se detectaron {validos} números válidos. Iniciando envío...")
-        iniciar_hilo()
+        repetidos = f"\nSe omitieron {lote.duplicados} filas con números repetidos." if lote.duplicados else ""
+        messagebox.showinfo("Validación exitosa", f"Se detectaron {validos} números válidos.{repetidos}\nIniciando envío...")
+        iniciar_hilo(campana)
 
     except Exception as e:
         messagebox.showerror("Error", f"No se pudo validar el archivo:\n{e}")
 
 def obtener_mensaje_previsualizacion(excel_file, mensaje_raw):
-    df = leer_excel(excel_file)
-    if df.empty:
-        raise ValueError("El archivo Excel está vacío.")
-
-    nombre = str(df.loc[0, 'NOMBRES'])
-    celular = str(df.loc[0, 'CELULAR'])
-    fecha_fin = str(df.loc[0, 'FECHA FIN'])
-    return mensaje_raw.format(nombre=nombre, celular=celular, fecha_fin=fecha_fin)
+    lote = obtener_almacen().obtener_contactos(excel_file)
+    if not lote.contactos:
+        raise ValueError("El archivo Excel no tiene contactos válidos.")
+
+    # Se previsualiza con el primer contacto que realmente recibirá el mensaje
+    contacto = lote.contactos[0]
+    return PlantillaMensaje(mensaje_raw).renderizar(contacto)
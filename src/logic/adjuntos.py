@@ -0,0 +1,189 @@
+import hashlib
+import os
+import threading
+
+# Límites de WhatsApp para adjuntos (bytes)
+LIMITE_IMAGEN = 5 * 1024 * 1024
+LIMITE_DOCUMENTO = 100 * 1024 * 1024
+
+# WhatsApp reescala las fotos a ~1600 px por lado: subir más resolución solo agrega tiempo de subida
+LADO_MAXIMO = 1600
+CALIDAD_JPEG = 85
+CALIDAD_MINIMA = 50
+
+# Cambiar si cambia la forma de optimizar, para no reutilizar archivos generados con la anterior
+VERSION_OPTIMIZACION = 2  # 2: respeta la orientación EXIF de las fotos de celular
+
+# Firmas de archivo aceptadas (primeros bytes)
+FIRMAS_IMAGEN = {b'\x89PNG\r\n\x1a\n': 'png', b'\xff\xd8\xff': 'jpeg'}
+FIRMA_PDF = b'%PDF-'
+
+class ErrorAdjunto(Exception):
+    """Uno o más adjuntos no se pueden enviar (no existen, tipo no válido o demasiado grandes)"""
+
+def carpeta_cache_por_defecto():
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, "WhatsappSender", "adjuntos")
+
+def _hash_archivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+def _leer_firma(path):
+    with open(path, 'rb') as f:
+        return f.read(8)
+
+def _tipo_imagen(path):
+    firma = _leer_firma(path)
+    for prefijo, tipo in FIRMAS_IMAGEN.items():
+        if firma.startswith(prefijo):
+            return tipo
+    return None
+
+class PreparadorAdjuntos:
+    """
+    Revisión previa de adjuntos, una vez por campaña: existencia, tipo real (por firma, no por
+    extensión) y límites de tamaño de WhatsApp. Las imágenes más grandes que LADO_MAXIMO o que
+    LIMITE_IMAGEN se reducen o recomprimen con Pillow.
+    Las versiones optimizadas se guardan en disco con el hash del contenido como nombre, así que
+    una campaña posterior con la misma imagen reutiliza el archivo ya procesado.
+
+    revisar() hace solo las comprobaciones baratas (sin abrir las imágenes con Pillow), para la UI;
+    preparar() además decodifica y optimiza, y se llama desde el hilo de envío.
+    """
+
+    def __init__(self, carpeta_cache=None):
+        self.carpeta_cache = carpeta_cache or carpeta_cache_por_defecto()
+        # (ruta, mtime, tamaño) -> ruta a enviar: evita volver a leer el archivo en la misma sesión
+        self._memoria = {}
+        self._lock = threading.Lock()
+
+    def preparar(self, image_paths=(), pdf_paths=()):
+        """
+        Retorna (imagenes, pdfs) con las rutas que se deben enviar.
+        Lanza ErrorAdjunto con todos los problemas encontrados antes de enviar a nadie.
+        """
+        return self._recorrer(image_paths, pdf_paths, self._preparar_imagen)
+
+    def revisar(self, image_paths=(), pdf_paths=()):
+        """
+        Como preparar() pero sin decodificar ni optimizar las imágenes (existencia, tipo y tamaño
+        de los PDFs): rápido, para llamarlo desde la interfaz antes de empezar.
+        """
+        self._recorrer(image_paths, pdf_paths, self._revisar_imagen)
+
+    def _recorrer(self, image_paths, pdf_paths, revisar_imagen):
+        errores = []
+        imagenes = []
+        pdfs = []
+
+        for path in image_paths:
+            try:
+                imagenes.append(revisar_imagen(path))
+            except ErrorAdjunto as e:
+                errores.append(str(e))
+
+        for path in pdf_paths:
+            try:
+                pdfs.append(self._revisar_pdf(path))
+            except ErrorAdjunto as e:
+                errores.append(str(e))
+
+        if errores:
+            raise ErrorAdjunto("Problemas con los adjuntos:\n" + "\n".join(f"• {e}" for e in errores))
+        return imagenes, pdfs
+
+    @staticmethod
+    def _info(path):
+        nombre = os.path.basename(path)
+        try:
+            info = os.stat(path)
+        except OSError:
+            raise ErrorAdjunto(f"{nombre}: el archivo no existe o no se puede leer")
+        return nombre, (os.path.abspath(path), info.st_mtime_ns, info.st_size), info.st_size
+
+    def _revisar_pdf(self, path):
+        nombre, _, tamano = self._info(path)
+        if not _leer_firma(path).startswith(FIRMA_PDF):
+            raise ErrorAdjunto(f"{nombre}: no es un PDF válido")
+        if tamano > LIMITE_DOCUMENTO:
+            raise ErrorAdjunto(f"{nombre}: pesa {tamano / 1024 / 1024:.1f} MB, WhatsApp admite hasta "
+                               f"{LIMITE_DOCUMENTO // 1024 // 1024} MB")
+        return path
+
+    def _revisar_imagen(self, path):
+        nombre, _, _ = self._info(path)
+        if _tipo_imagen(path) is None:
+            raise ErrorAdjunto(f"{nombre}: no es una imagen PNG o JPG válida")
+        return path
+
+    def _preparar_imagen(self, path):
+        nombre, clave, tamano = self._info(path)
+        with self._lock:
+            if clave in self._memoria:
+                return self._memoria[clave]
+
+        self._revisar_imagen(path)
+
+        from PIL import Image  # Import diferido: solo se carga si hay imágenes adjuntas
+
+        try:
+            with Image.open(path) as img:
+                ancho, alto = img.size
+        except Exception as e:
+            raise ErrorAdjunto(f"{nombre}: no se pudo abrir la imagen ({e})")
+
+        if tamano <= LIMITE_IMAGEN and max(ancho, alto) <= LADO_MAXIMO:
+            resultado = path  # Ya cumple: se envía tal cual
+        else:
+            resultado = self._optimizar(path, nombre)
+
+        with self._lock:
+            self._memoria[clave] = resultado
+        return resultado
+
+    def _optimizar(self, path, nombre):
+        """Reduce y recomprime la imagen; reutiliza el resultado si ya se procesó ese contenido"""
+        from PIL import Image, ImageOps
+
+        hash_contenido = _hash_archivo(path)
+        destino = os.path.join(self.carpeta_cache, f"{hash_contenido[:32]}_v{VERSION_OPTIMIZACION}.jpg")
+        if os.path.exists(destino):
+            print(f"Imagen optimizada reutilizada: {nombre}")
+            return destino
+
+        os.makedirs(self.carpeta_cache, exist_ok=True)
+        with Image.open(path) as img:
+            # El JPEG nuevo no lleva la etiqueta Orientation: se rota antes (fotos verticales de celular)
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((LADO_MAXIMO, LADO_MAXIMO), Image.LANCZOS)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # JPEG no tiene transparencia: fondo blanco, como la muestra WhatsApp
+                fondo = Image.new('RGB', img.size, (255, 255, 255))
+                rgba = img.convert('RGBA')
+                fondo.paste(rgba, mask=rgba.split()[-1])
+                img = fondo
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            # Se escribe en un temporal y se renombra: un corte a mitad no deja un archivo dañado en caché
+            temporal = destino + ".tmp"
+            calidad = CALIDAD_JPEG
+            while True:
+                img.save(temporal, 'JPEG', quality=calidad, optimize=True)
+                if os.path.getsize(temporal) <= LIMITE_IMAGEN or calidad <= CALIDAD_MINIMA:
+                    break
+                calidad -= 10
+
+        if os.path.getsize(temporal) > LIMITE_IMAGEN:
+            os.remove(temporal)
+            raise ErrorAdjunto(f"{nombre}: no se pudo reducir por debajo de "
+                               f"{LIMITE_IMAGEN // 1024 // 1024} MB")
+        os.replace(temporal, destino)
+
+        print(f"Imagen optimizada: {nombre} ({os.path.getsize(path) // 1024} KB -> "
+              f"{os.path.getsize(destino) // 1024} KB)")
+        return destino
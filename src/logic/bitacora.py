@@ -0,0 +1,167 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Estados que se registran por contacto
+ESTADO_ENVIADO = "enviado"
+ESTADO_ERROR = "error"
+ESTADO_INVALIDO = "invalido"  # Número inválido o sin WhatsApp: no se envió y no se reintenta al reanudar
+
+# Niveles de PRAGMA synchronous aceptados. Con WAL, NORMAL sobrevive a un cierre o caída de la
+# aplicación sin hacer fsync en cada commit; FULL también sobrevive a un corte de luz.
+SINCRONIZACION = ("OFF", "NORMAL", "FULL")
+
+def ruta_por_defecto():
+    """Bitácora en la carpeta de datos del usuario (el .exe de PyInstaller corre desde una carpeta temporal)"""
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, "WhatsappSender", "envios.sqlite3")
+
+def clave_campana(excel_file, texto_mensaje, image_paths=None, pdf_paths=None):
+    """
+    Identifica una campaña por el Excel, el texto del mensaje y los adjuntos (path o lista de paths).
+    No incluye la fecha de modificación del Excel: si se edita el libro a mitad de campaña,
+    se sigue reconociendo como la misma y se omiten los números ya enviados.
+    """
+    partes = [os.path.abspath(excel_file), texto_mensaje]
+    for paths in (image_paths, pdf_paths):
+        if isinstance(paths, str):
+            paths = [paths]
+        partes += sorted(os.path.abspath(p) for p in paths or ())
+        partes.append("")  # Separa imágenes de PDFs
+    return hashlib.sha256("\0".join(partes).encode('utf-8')).hexdigest()
+
+class BitacoraEnvios:
+    """
+    Bitácora de envíos en SQLite (modo WAL), solo de inserción: un registro por resultado de
+    contacto, con la campaña y el número normalizado. Sobrevive a cierres, caídas y reinicios,
+    y al reanudar permite omitir los contactos ya enviados sin depender de su posición en el Excel.
+
+    tamano_lote: resultados que se acumulan en memoria antes de escribirlos en una sola transacción
+                 (1 = cada resultado se escribe de inmediato; flush() y cerrar() escriben lo pendiente)
+    sincronizacion: PRAGMA synchronous (ver SINCRONIZACION)
+    """
+
+    def __init__(self, path=None, tamano_lote=1, sincronizacion="NORMAL"):
+        if sincronizacion not in SINCRONIZACION:
+            raise ValueError(f"sincronizacion debe ser una de {SINCRONIZACION}")
+        self.path = path or ruta_por_defecto()
+        self.tamano_lote = max(1, tamano_lote)
+        self._pendientes = []
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Se usa desde el hilo de envío y desde la UI; el acceso se serializa con _lock
+        self._conexion = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(f"PRAGMA synchronous={sincronizacion}")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS campanas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                clave TEXT NOT NULL,
+                creada REAL NOT NULL,
+                terminada REAL
+            );
+            CREATE INDEX IF NOT EXISTS campanas_clave ON campanas (clave, terminada);
+            CREATE TABLE IF NOT EXISTS envios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campana INTEGER NOT NULL REFERENCES campanas (id),
+                numero TEXT NOT NULL,
+                estado TEXT NOT NULL,
+                detalle TEXT,
+                momento REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS envios_campana ON envios (campana, estado, numero);
+            CREATE INDEX IF NOT EXISTS envios_momento ON envios (momento);
+        """)
+
+    def campana_pendiente(self, clave):
+        """Id de la última campaña sin terminar con esta clave, o None"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT id FROM campanas WHERE clave = ? AND terminada IS NULL ORDER BY id DESC LIMIT 1",
+                (clave,)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def nueva_campana(self, clave):
+        """Crea una campaña y retorna su id"""
+        with self._lock:
+            cursor = self._conexion.execute(
+                "INSERT INTO campanas (clave, creada) VALUES (?, ?)", (clave, time.time())
+            )
+        return cursor.lastrowid
+
+    def abrir_campana(self, clave):
+        """Retoma la campaña sin terminar con esta clave o crea una nueva"""
+        campana = self.campana_pendiente(clave)
+        return campana if campana is not None else self.nueva_campana(clave)
+
+    def terminar_campana(self, campana):
+        """Marca la campaña como terminada: el próximo envío igual empezará una nueva"""
+        self.flush()
+        with self._lock:
+            self._conexion.execute("UPDATE campanas SET terminada = ? WHERE id = ?", (time.time(), campana))
+
+    def entregados(self, campana):
+        """Conjunto de números ya enviados en la campaña (consulta O(1) por contacto)"""
+        self.flush()
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT DISTINCT numero FROM envios WHERE campana = ? AND estado = ?",
+                (campana, ESTADO_ENVIADO)
+            )
+            return {numero for (numero,) in filas}
+
+    def resueltos(self, campana):
+        """Números de la campaña que no hay que volver a intentar: enviados o inválidos"""
+        self.flush()
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT DISTINCT numero FROM envios WHERE campana = ? AND estado IN (?, ?)",
+                (campana, ESTADO_ENVIADO, ESTADO_INVALIDO)
+            )
+            return {numero for (numero,) in filas}
+
+    def contar_enviados(self, desde):
+        """Contactos enviados desde `desde` (datetime) en todas las campañas, p. ej. para la cuota diaria"""
+        self.flush()
+        with self._lock:
+            (cantidad,) = self._conexion.execute(
+                "SELECT COUNT(*) FROM envios WHERE estado = ? AND momento >= ?",
+                (ESTADO_ENVIADO, desde.timestamp())
+            ).fetchone()
+        return cantidad
+
+    def registrar(self, campana, numero, estado, detalle=None):
+        """Agrega un resultado; se escribe al completar el lote"""
+        with self._lock:
+            self._pendientes.append((campana, numero, estado, detalle, time.time()))
+            if len(self._pendientes) >= self.tamano_lote:
+                self._escribir()
+
+    def flush(self):
+        with self._lock:
+            self._escribir()
+
+    def _escribir(self):
+        if not self._pendientes:
+            return
+        self._conexion.execute("BEGIN")
+        try:
+            self._conexion.executemany(
+                "INSERT INTO envios (campana, numero, estado, detalle, momento) VALUES (?, ?, ?, ?, ?)",
+                self._pendientes
+            )
+            self._conexion.execute("COMMIT")
+        except Exception:
+            self._conexion.execute("ROLLBACK")
+            raise
+        self._pendientes.clear()
+
+    def cerrar(self):
+        self.flush()
+        with self._lock:
+            self._conexion.close()
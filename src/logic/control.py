@@ -0,0 +1,94 @@
+import threading
+import time
+
+# Cada cuánto se vuelven a consultar las funciones de verificación heredadas (app_running_check / pause_check)
+INTERVALO_SONDEO = 0.05
+
+class EnvioInterrumpido(Exception):
+    """La campaña se canceló (p. ej. se cerró la aplicación) durante el envío"""
+
+class ControlCampana:
+    """
+    Pausa, reanudación y cancelación de una campaña basadas en eventos.
+    La UI llama a pausar/reanudar/cancelar; el hilo de envío usa dormir() y verificar(),
+    que despiertan de inmediato ante cualquier cambio en lugar de sondear cada medio segundo.
+
+    app_running_check / pause_check: funciones opcionales del esquema anterior; si se pasan,
+    se consultan cada INTERVALO_SONDEO mientras se espera.
+    """
+
+    def __init__(self, app_running_check=None, pause_check=None):
+        self._condicion = threading.Condition()
+        self._pausado = False
+        self._cancelado = False
+        self._app_running_check = app_running_check
+        self._pause_check = pause_check
+
+    @property
+    def pausado(self):
+        with self._condicion:
+            self._sincronizar()
+            return self._pausado
+
+    @property
+    def cancelado(self):
+        with self._condicion:
+            self._sincronizar()
+            return self._cancelado
+
+    def pausar(self):
+        with self._condicion:
+            self._pausado = True
+            self._condicion.notify_all()
+
+    def reanudar(self):
+        with self._condicion:
+            self._pausado = False
+            self._condicion.notify_all()
+
+    def cancelar(self):
+        with self._condicion:
+            self._cancelado = True
+            self._condicion.notify_all()
+
+    def _sincronizar(self):
+        # Debe llamarse con self._condicion tomado
+        if self._app_running_check and not self._app_running_check():
+            self._cancelado = True
+        if self._pause_check:
+            self._pausado = not self._pause_check()
+
+    def _esperar_cambio(self, timeout=None):
+        if self._app_running_check or self._pause_check:
+            timeout = INTERVALO_SONDEO if timeout is None else min(timeout, INTERVALO_SONDEO)
+        self._condicion.wait(timeout)
+
+    def dormir(self, segundos):
+        """
+        Duerme hasta segundos. Mientras está pausado el tiempo restante se congela.
+        Retorna False apenas se cancela la campaña, True si completó la espera.
+        """
+        restante = segundos
+        with self._condicion:
+            while True:
+                self._sincronizar()
+                if self._cancelado:
+                    return False
+                if self._pausado:
+                    self._esperar_cambio()
+                    continue
+                if restante <= 0:
+                    return True
+                inicio = time.monotonic()
+                self._esperar_cambio(restante)
+                restante -= time.monotonic() - inicio
+
+    def verificar(self):
+        """Bloquea mientras esté pausado; lanza EnvioInterrumpido si se canceló"""
+        if not self.dormir(0):
+            raise EnvioInterrumpido()
+
+    def esperar(self, segundos):
+        """Como dormir(), pero lanza EnvioInterrumpido si se cancela (para usar como Transporte.esperar)"""
+        if not self.dormir(segundos):
+            raise EnvioInterrumpido()
@@ -0,0 +1,6 @@
+# Cómo se fusionan las filas que tienen el mismo número normalizado.
+# Módulo aparte, sin dependencias: la UI y la CLI las usan sin cargar pandas (logic.logic)
+POLITICA_PRIMERA = "primera"               # la primera fila del Excel
+POLITICA_FECHA_RECIENTE = "fecha_reciente"  # la fila con la FECHA FIN más reciente
+POLITICA_UNIR_NOMBRES = "unir_nombres"     # la primera fila, con los nombres de todas unidos
+POLITICAS_DUPLICADOS = (POLITICA_PRIMERA, POLITICA_FECHA_RECIENTE, POLITICA_UNIR_NOMBRES)
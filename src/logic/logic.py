@@ -1,52 +1,292 @@
 import os
+import threading
+import openpyxl
 import pandas as pd
 import pyexcel
 
-def convertir_xls_a_xlsx(path_xls):
-    """Convierte un archivo .xls a .xlsx usando pyexcel y retorna la nueva ruta con nombre único"""
+from logic.duplicados import POLITICA_FECHA_RECIENTE, POLITICA_PRIMERA, POLITICA_UNIR_NOMBRES, POLITICAS_DUPLICADOS
+from logic.utils import normalizar_columna
+
+def convertir_xls_a_xlsx(path_xls, path_xlsx=None):
+    """
+    Exporta un archivo .xls a .xlsx (opcional: la lectura ya no necesita este paso).
+    Si no se indica destino se usa <nombre>_converted.xlsx junto al original. Retorna la ruta creada.
+    """
     try:
-        sheet0 = pyexcel.get_sheet(file_name=path_xls, name_columns_by_row=0)
-        
-        xlsarray = sheet0.to_array()
-        
-        print(f"Filas leídas: {len(xlsarray)}")
-        
-        sheet1 = pyexcel.Sheet(xlsarray)
-        
-        nombre_base = os.path.splitext(os.path.basename(path_xls))[0]
-        directorio = os.path.dirname(path_xls)
-        path_xlsx = os.path.join(directorio, f"{nombre_base}_converted.xlsx")
-        
-        sheet1.save_as(path_xlsx)
-        
+        if path_xlsx is None:
+            nombre_base = os.path.splitext(os.path.basename(path_xls))[0]
+            directorio = os.path.dirname(path_xls)
+            path_xlsx = os.path.join(directorio, f"{nombre_base}_converted.xlsx")
+
+        # Copia directa hoja a hoja, sin pasar por to_array() ni crear un Sheet intermedio
+        pyexcel.save_as(file_name=path_xls, dest_file_name=path_xlsx)
+
         print(f"Archivo convertido: {os.path.basename(path_xlsx)}")
         return path_xlsx
-        
+
     except Exception as e:
         raise Exception(f"Error al convertir archivo: {e}")
+    finally:
+        pyexcel.free_resources()
+
+# Columnas que usa el envío; el resto del export de AppFit se ignora
+COLUMNAS_REQUERIDAS = ('CELULAR', 'NOMBRES', 'FECHA FIN')
+
+def _es_vacio(valor):
+    # openpyxl usa None para celdas vacías, pyexcel (.xls) usa ''
+    return valor is None or valor == ""
 
-def leer_excel(path):
+def _filtrar_columnas(filas, columnas, fila_encabezado):
+    """Ubica las columnas por nombre en el encabezado y produce una tupla por fila con solo esas columnas"""
+    for _ in range(fila_encabezado):
+        next(filas, None)
+
+    encabezado = next(filas, None)
+    if encabezado is None:
+        raise Exception("El archivo Excel está vacío.")
+
+    nombres = [str(c).strip() if c is not None else "" for c in encabezado]
+    faltantes = [c for c in columnas if c not in nombres]
+    if faltantes:
+        raise Exception(f"Faltan columnas en el Excel: {', '.join(faltantes)}")
+    posiciones = [nombres.index(c) for c in columnas]
+
+    for fila in filas:
+        # Igual que pandas, se saltan las filas completamente vacías
+        if all(_es_vacio(v) for v in fila):
+            continue
+        yield tuple(
+            None if p >= len(fila) or _es_vacio(fila[p]) else fila[p]
+            for p in posiciones
+        )
+
+def iterar_filas_xlsx(path, columnas=COLUMNAS_REQUERIDAS, fila_encabezado=1):
+    """
+    Recorre un .xlsx con el iterador de solo lectura de openpyxl y produce una tupla por fila
+    con solo las columnas pedidas (buscadas por nombre en el encabezado).
+    fila_encabezado usa la misma convención que header= de pandas (1 = segunda fila).
+    La memoria no crece con el número de filas: nunca se carga la hoja completa.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _filtrar_columnas(wb.active.iter_rows(values_only=True), columnas, fila_encabezado)
+    finally:
+        wb.close()
+
+def iterar_filas_xls(path, columnas=COLUMNAS_REQUERIDAS, fila_encabezado=1):
+    """Igual que iterar_filas_xlsx pero para .xls, leyendo en memoria con pyexcel sin archivo intermedio"""
+    try:
+        yield from _filtrar_columnas(iter(pyexcel.iget_array(file_name=path)), columnas, fila_encabezado)
+    finally:
+        pyexcel.free_resources()
+
+def _leer_columnas(filas, columnas=COLUMNAS_REQUERIDAS):
+    """Arma un DataFrame compacto solo con las columnas requeridas"""
+    datos = {c: [] for c in columnas}
+    for fila in filas:
+        for c, valor in zip(columnas, fila):
+            datos[c].append(valor)
+    return pd.DataFrame(datos)
+
+def _leer_xls_completo(path, fila_encabezado=1):
+    """Carga todas las columnas de un .xls en un DataFrame, directamente desde memoria"""
+    try:
+        filas = pyexcel.get_array(file_name=path)
+    finally:
+        pyexcel.free_resources()
+
+    if len(filas) <= fila_encabezado:
+        return pd.DataFrame()
+
+    encabezado = [str(c).strip() for c in filas[fila_encabezado]]
+    ancho = len(encabezado)
+    datos = [
+        [None if _es_vacio(v) else v for v in (fila + [None] * ancho)[:ancho]]
+        for fila in filas[fila_encabezado + 1:]
+        if not all(_es_vacio(v) for v in fila)
+    ]
+    return pd.DataFrame(datos, columns=encabezado)
+
+def leer_excel(path, solo_requeridas=False):
+    """
+    Lee el Excel de contactos (encabezado en la segunda fila).
+    solo_requeridas: usa el lector en streaming y carga solo CELULAR, NOMBRES y FECHA FIN
+    """
     ext = os.path.splitext(path)[1].lower()
     if ext == '.xls':
         try:
-            # Convertir .xls a .xlsx automáticamente
-            path_xlsx = convertir_xls_a_xlsx(path)
-            return pd.read_excel(path_xlsx, header=1)
+            # El .xls se lee directo en memoria, sin generar un _converted.xlsx
+            if solo_requeridas:
+                return _leer_columnas(iterar_filas_xls(path))
+            return _leer_xls_completo(path)
         except ImportError:
-            raise Exception("Instala xlrd==1.2.0 y openpyxl:\npip install xlrd==1.2.0 openpyxl")
+            raise Exception("Instala pyexcel-xls y xlrd==1.2.0:\npip install pyexcel-xls xlrd==1.2.0")
     elif ext == '.xlsx':
         try:
+            if solo_requeridas:
+                return _leer_columnas(iterar_filas_xlsx(path))
             return pd.read_excel(path, header=1, engine="openpyxl")
         except ImportError:
             raise Exception("Instala openpyxl:\npip install openpyxl")
     else:
         raise Exception("Formato no soportado: solo .xls y .xlsx")
 
-def validar_numeros(df, normalizar_func):
-    validos = 0
-    for i in range(len(df)):
-        celular = df.loc[i, 'CELULAR']
-        celular_normalizado = normalizar_func(celular)
-        if celular_normalizado:
-            validos += 1
-    return validos
+class Contacto:
+    """Registro compacto de un contacto válido (sin __dict__ por instancia)"""
+    __slots__ = ('fila', 'celular', 'nombre', 'fecha_fin')
+
+    def __init__(self, fila, celular, nombre, fecha_fin):
+        self.fila = fila            # Fila de origen en el Excel (0 = primera fila de datos)
+        self.celular = celular      # Número normalizado con 51
+        self.nombre = nombre
+        self.fecha_fin = fecha_fin  # datetime/date, texto o None; la plantilla le da formato
+
+    def __repr__(self):
+        return f"Contacto({self.fila}, {self.celular!r}, {self.nombre!r}, {self.fecha_fin!r})"
+
+class LoteContactos:
+    """
+    Resultado de cargar un libro: contactos válidos (sin números repetidos), motivos de rechazo
+    por fila, total de filas y cantidad de filas repetidas que se fusionaron
+    """
+    __slots__ = ('contactos', 'rechazados', 'total', 'duplicados')
+
+    def __init__(self, contactos, rechazados, total, duplicados=0):
+        self.contactos = contactos    # list[Contacto]
+        self.rechazados = rechazados  # dict fila -> motivo
+        self.total = total
+        self.duplicados = duplicados
+
+class AlmacenContactos:
+    """
+    Guarda los contactos del libro ya leído para no parsearlo en cada clic.
+    La clave es ruta + fecha de modificación + tamaño: si el archivo cambia en disco
+    se vuelve a leer, si no se reutiliza el mismo lote en validar, previsualizar y enviar.
+    Solo se conservan los registros compactos; el DataFrame se libera tras la extracción.
+
+    politica_duplicados: cómo se fusionan las filas con el mismo número (ver POLITICAS_DUPLICADOS);
+    si cambia, el lote se vuelve a armar en el siguiente uso.
+    """
+
+    def __init__(self, solo_requeridas=True, politica_duplicados=POLITICA_PRIMERA):
+        self.solo_requeridas = solo_requeridas  # Lector en streaming con solo las columnas del envío
+        self.politica_duplicados = politica_duplicados
+        self._clave = None
+        self._lote = None
+        self._lock = threading.Lock()  # Previsualizar (hilo de UI) y enviar (hilo de envío) comparten el almacén
+
+    def _clave_archivo(self, path):
+        info = os.stat(path)
+        return (os.path.abspath(path), info.st_mtime_ns, info.st_size, self.politica_duplicados)
+
+    def obtener_contactos(self, path):
+        """Retorna el LoteContactos del archivo, leyéndolo solo si no está en caché o cambió"""
+        clave = self._clave_archivo(path)
+        with self._lock:
+            if self._lote is None or clave != self._clave:
+                df = leer_excel(path, solo_requeridas=self.solo_requeridas)
+                validos, rechazados = preparar_contactos(df)
+                unicos = deduplicar_contactos(validos, self.politica_duplicados)
+                self._lote = LoteContactos(
+                    extraer_contactos(unicos), rechazados.to_dict(), len(df), len(validos) - len(unicos)
+                )
+                self._clave = clave
+            return self._lote
+
+    def invalidar(self):
+        """Descarta los datos en caché (se leerán de nuevo en el próximo uso)"""
+        with self._lock:
+            self._clave = None
+            self._lote = None
+
+def preparar_contactos(df):
+    """
+    Normaliza la columna CELULAR en una sola pasada vectorizada.
+    Retorna (validos, rechazados): validos es un DataFrame con index, celular, nombre y fecha_fin
+    (fecha_fin sin formatear: datetime, texto o None); rechazados es una Series con el motivo de rechazo por fila.
+    """
+    celulares, motivos = normalizar_columna(df['CELULAR'])
+    mascara = celulares.notna()
+    # Una celda NOMBRES vacía llega como None/NaN: se deja "" en lugar del texto "None"/"nan"
+    nombres = df.loc[mascara, 'NOMBRES'].astype(object)
+    nombres = nombres.where(nombres.notna(), "").map(str).str.strip()
+
+    validos = pd.DataFrame({
+        'index': df.index[mascara],
+        'celular': celulares[mascara].to_numpy(),
+        'nombre': nombres.to_numpy(),
+        # dtype object explícito: si no, pandas 3 infiere str y convierte los None en NaN
+        'fecha_fin': pd.Series(_valores_fecha(df.loc[mascara, 'FECHA FIN']), dtype=object),
+    })
+    return validos, motivos[~mascara]
+
+def _fechas_comparables(valores):
+    """Convierte fecha_fin (datetime, texto dd/mm/aaaa o None) a datetime64 para poder compararlas"""
+    serie = pd.Series(valores, dtype=object)
+    es_texto = serie.map(lambda v: isinstance(v, str)).astype(bool)
+    fechas = pd.Series(pd.NaT, index=serie.index, dtype='datetime64[ns]')
+    if es_texto.any():
+        fechas[es_texto] = pd.to_datetime(serie[es_texto], format='mixed', dayfirst=True, errors='coerce')
+    # Las fechas que ya vienen como datetime no se reinterpretan con dayfirst
+    otros = ~es_texto & serie.notna()
+    if otros.any():
+        fechas[otros] = pd.to_datetime(serie[otros], errors='coerce')
+    return fechas
+
+def _unir_nombres(nombres):
+    """'Ana', 'Luis', 'Ana', 'Pedro' -> 'Ana, Luis y Pedro'"""
+    unicos = list(dict.fromkeys(n for n in nombres if n))
+    if len(unicos) <= 1:
+        return unicos[0] if unicos else ""
+    return ", ".join(unicos[:-1]) + " y " + unicos[-1]
+
+def deduplicar_contactos(validos, politica=POLITICA_PRIMERA):
+    """
+    Deja una sola fila por número normalizado (agrupación por hash del celular).
+    politica: POLITICA_PRIMERA conserva la primera fila; POLITICA_FECHA_RECIENTE la de FECHA FIN más
+    reciente (sin fecha legible cuenta como la más antigua); POLITICA_UNIR_NOMBRES la primera fila
+    con los nombres de todas las filas unidos. El orden de envío sigue el de la primera aparición.
+    """
+    if politica not in POLITICAS_DUPLICADOS:
+        raise ValueError(f"Política de duplicados desconocida: {politica}")
+
+    repetidos = validos['celular'].duplicated(keep=False)
+    if not repetidos.any():
+        return validos
+
+    primeras = validos[~validos['celular'].duplicated(keep='first')]
+
+    if politica == POLITICA_FECHA_RECIENTE:
+        # Orden estable por fecha: ante empate gana la primera fila
+        fechas = _fechas_comparables(validos['fecha_fin'].tolist())
+        orden = validos.assign(_fecha=fechas.to_numpy(), _pos=range(len(validos)))
+        orden = orden.sort_values(['_fecha', '_pos'], ascending=[False, True], na_position='last', kind='stable')
+        elegidas = orden.drop_duplicates('celular', keep='first').set_index('celular')
+        unicos = elegidas.loc[primeras['celular'], ['index', 'nombre', 'fecha_fin']].reset_index()
+        return unicos[['index', 'celular', 'nombre', 'fecha_fin']]
+
+    if politica == POLITICA_UNIR_NOMBRES:
+        nombres = validos.groupby('celular', sort=False)['nombre'].agg(_unir_nombres)
+        return primeras.assign(nombre=nombres.loc[primeras['celular']].to_numpy()).reset_index(drop=True)
+
+    return primeras.reset_index(drop=True)
+
+def _valores_fecha(columna):
+    """Conserva las fechas como objetos fecha (la plantilla decide el formato); vacíos como None"""
+    valores = columna.astype(object).where(columna.notna(), None)
+    return [v.strip() if isinstance(v, str) else v for v in valores.tolist()]
+
+def extraer_contactos(validos):
+    """Convierte el DataFrame de preparar_contactos en una lista de Contacto"""
+    return [
+        Contacto(fila, celular, nombre, fecha_fin)
+        for fila, celular, nombre, fecha_fin in zip(
+            validos['index'].tolist(), validos['celular'].tolist(),
+            validos['nombre'].tolist(), validos['fecha_fin'].tolist()
+        )
+    ]
+
+def validar_numeros(df):
+    """Cuenta los números válidos de la columna CELULAR"""
+    celulares, _ = normalizar_columna(df['CELULAR'])
+    return int(celulares.notna().sum())
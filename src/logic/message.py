@@ -1,266 +1,272 @@
-import pandas as pd
-import pywhatkit
-import time
-import os
-import pygetwindow as gw
-import pyautogui as pg
-from logic.utils import normalizar_numero
-
-def send_messages(excel_file, message_template, image_path=None, pdf_path=None, 
-                 app_running_check=None, pause_check=None, progress_callback=None, start_index=0):
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from logic.adjuntos import PreparadorAdjuntos
+from logic.bitacora import ESTADO_ENVIADO, ESTADO_ERROR, ESTADO_INVALIDO, clave_campana
+from logic.control import ControlCampana, EnvioInterrumpido
+from logic.logic import AlmacenContactos
+from logic.plantilla import PlantillaMensaje
+from logic.tiempos import FASE_INTERVALO, FASE_PREPARAR, MedidorFases
+from logic.transporte import NumeroInvalido
+
+# Segundos de espera entre un contacto y el siguiente
+INTERVALO_ENTRE_ENVIOS = 5
+
+def _como_lista(paths):
+    """Normaliza un path o una colección de paths a lista"""
+    if not paths:
+        return []
+    if isinstance(paths, str):
+        return [paths]
+    return list(paths)
+
+def send_messages(excel_file, message_template, image_path=None, pdf_path=None,
+                 app_running_check=None, pause_check=None, progress_callback=None, start_index=0,
+                 contact_store=None, transporte=None, control=None, bitacora=None, campana=None,
+                 adjuntos=None, planificador=None, medidor=None, registro=None, resultados=None):
     """
     Envía mensajes con verificación de interrupción y progreso
     app_running_check: función que retorna True si la app sigue ejecutándose
     pause_check: función que retorna True si no está pausado
     progress_callback: función para actualizar progreso (current, total, contact_name)
     start_index: índice desde donde empezar el envío
+    message_template: texto del mensaje o PlantillaMensaje ya compilada
+    contact_store: AlmacenContactos con el libro ya leído (evita volver a parsear el Excel)
+    transporte: implementación de logic.transporte.Transporte (por defecto navegador del escritorio + pyautogui)
+    control: ControlCampana para pausar/cancelar por eventos; si no se pasa se arma uno
+             a partir de app_running_check y pause_check
+    bitacora: BitacoraEnvios donde se registra el resultado de cada contacto; los números que ya
+              figuran como enviados en la campaña se omiten (reanudación tras cierre o caída)
+    campana: id de campaña en la bitácora (por defecto se retoma la pendiente con el mismo Excel,
+             mensaje y adjuntos, o se crea una nueva)
+    adjuntos: PreparadorAdjuntos que revisa y optimiza las imágenes/PDFs una vez antes de enviar
+    planificador: PlanificadorEnvios con tasa, ráfaga, jitter, cuota diaria y horarios; si fija una tasa,
+                  reemplaza la espera fija entre contactos (INTERVALO_ENTRE_ENVIOS)
+    medidor: MedidorFases que registra el tiempo de cada fase por contacto (por defecto uno en memoria);
+             al final se imprime el resumen p50/p95/máximo por fase
+    registro: RegistroEnvios donde se anota cada envío (número, resultado y hash de la plantilla)
+    resultados: dict (p. ej. Counter) que se completa con la cantidad de contactos por estado
+                (ESTADO_ENVIADO, ESTADO_INVALIDO, ESTADO_ERROR)
+    Retorna la cantidad de mensajes enviados: los números inválidos o sin WhatsApp no cuentan como
+    enviados ni como fallidos (se registran con ESTADO_INVALIDO y no se reintentan al reanudar).
     """
-    df = pd.read_excel(excel_file, header=1)
+    if contact_store is None:
+        contact_store = AlmacenContactos()
+    if transporte is None:
+        # Import diferido: pyautogui/pygetwindow solo se cargan si se usa este transporte
+        from logic.transporte_escritorio import TransporteEscritorio
+        transporte = TransporteEscritorio()
     enviados = 0
-    contactos_validos = []
-    
-    # Primero, crear lista de contactos válidos
-    for i in range(len(df)):
-        celular = normalizar_numero(df.loc[i, 'CELULAR'])
-        if celular:
-            contactos_validos.append({
-                'index': i,
-                'celular': celular,
-                'nombre': str(df.loc[i, 'NOMBRES']).strip(),
-                'fecha_fin': str(df.loc[i, 'FECHA FIN']).strip()
-            })
-    
-    total_validos = len(contactos_validos)
-    
-    # Empezar desde el índice especificado
-    for contacto_idx in range(start_index, total_validos):
-        try:
-            # Verificar si la aplicación sigue ejecutándose
-            if app_running_check and not app_running_check():
-                print("Envío interrumpido por cierre de aplicación")
-                break
-            
-            # Verificar si está pausado - esperar hasta que se reanude
-            while pause_check and not pause_check():
-                if app_running_check and not app_running_check():
-                    return enviados
-                time.sleep(0.5)  # Esperar medio segundo antes de verificar de nuevo
-            
-            contacto = contactos_validos[contacto_idx]
-            celular = contacto['celular']
-            nombre = contacto['nombre']
-            fecha_fin = contacto['fecha_fin']
-            
-            # Actualizar progreso con nombre del contacto
-            if progress_callback:
-                progress_callback(contacto_idx + 1, total_validos, nombre)
-            
-            mensaje = message_template.format(nombre=nombre, fecha_fin=fecha_fin)
-            numero = f"+{celular}"
 
-            print(f"Enviando mensaje {contacto_idx + 1}/{total_validos} a {nombre} ({numero})")
+    if control is None:
+        control = ControlCampana(app_running_check, pause_check)
+    transporte.esperar = control.esperar
 
-            # Verificar antes de cada operación importante
-            if app_running_check and not app_running_check():
-                break
+    if medidor is None:
+        medidor = MedidorFases()
+    transporte.fase = medidor.fase
 
-            # Determinar qué archivos enviar
-            tiene_imagenes = image_path and len(image_path) > 0
-            tiene_pdfs = pdf_path and len(pdf_path) > 0
-
-            if tiene_imagenes or tiene_pdfs:
-                # Normalizar a listas
-                if tiene_imagenes:
-                    if isinstance(image_path, str):
-                        image_paths = [image_path]
-                    else:
-                        image_paths = list(image_path)
-                else:
-                    image_paths = []
-
-                if tiene_pdfs:
-                    if isinstance(pdf_path, str):
-                        pdf_paths = [pdf_path]
-                    else:
-                        pdf_paths = list(pdf_path)
-                else:
-                    pdf_paths = []
-
-                total_archivos = len(image_paths) + len(pdf_paths)
-                print(f"Enviando {len(image_paths)} imagen(es) y {len(pdf_paths)} PDF(s) a {numero} (Total: {total_archivos} archivos)")
-
-                # Verificar pausa antes de abrir WhatsApp
-                while pause_check and not pause_check():
-                    if app_running_check and not app_running_check():
-                        return enviados
-                    time.sleep(0.5)
-
-                # Abre el chat con el mensaje usando pywhatkit
-                pywhatkit.sendwhatmsg_instantly(
-                    phone_no=numero,
-                    message=mensaje,
-                    wait_time=10,
-                    tab_close=False
-                )
-                
-                # Verificar durante la espera con posibilidad de pausa
-                for _ in range(10):
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-                    
-                    if app_running_check and not app_running_check():
-                        break
-                    time.sleep(1)
-                
-                if app_running_check and not app_running_check():
-                    break
+    # Se parsea y valida una sola vez: un error de variable falla aquí, no en cada contacto
+    plantilla = message_template if isinstance(message_template, PlantillaMensaje) else PlantillaMensaje(message_template)
+
+    # Registros compactos de contactos válidos (cacheados en el almacén, sin el DataFrame de origen)
+    lote = contact_store.obtener_contactos(excel_file)
+    contactos_validos = lote.contactos
+    if lote.rechazados:
+        print(f"Números descartados: {dict(Counter(lote.rechazados.values()))}")
+    if lote.duplicados:
+        print(f"Números repetidos omitidos: {lote.duplicados} (política: {contact_store.politica_duplicados})")
 
-                # Activar ventana de WhatsApp Web
+    total_validos = len(contactos_validos)
+
+    # Determinar qué archivos enviar
+    image_paths = _como_lista(image_path)
+    pdf_paths = _como_lista(pdf_path)
+    total_archivos = len(image_paths) + len(pdf_paths)
+
+    intervalo = INTERVALO_ENTRE_ENVIOS if transporte.intervalo is None else transporte.intervalo
+
+    # Contactos por enviar: se omiten los que la bitácora ya registra como enviados o inválidos
+    por_enviar = range(start_index, total_validos)
+    if bitacora is not None:
+        if campana is None:
+            campana = bitacora.abrir_campana(clave_campana(excel_file, plantilla.texto, image_paths, pdf_paths))
+        if planificador is not None and planificador.cuota_diaria is not None:
+            # La cuota cuenta también lo enviado hoy en ejecuciones anteriores
+            planificador.sincronizar_cuota(bitacora.contar_enviados(planificador.inicio_dia()))
+        resueltos = bitacora.resueltos(campana)
+        if resueltos:
+            por_enviar = [i for i in por_enviar if contactos_validos[i].celular not in resueltos]
+            print(f"Reanudando campaña: {total_validos - start_index - len(por_enviar)} contacto(s) ya enviados o inválidos se omiten")
+    fallidos = 0
+    invalidos = 0
+
+    # Revisión previa de adjuntos, una sola vez por campaña: un archivo faltante o demasiado grande
+    # falla aquí (ErrorAdjunto) en lugar de fallar en cada contacto
+    if adjuntos is None:
+        adjuntos = PreparadorAdjuntos()
+    image_paths, pdf_paths = adjuntos.preparar(image_paths, pdf_paths)
+
+    # El registro de envíos guarda el texto de la plantilla una vez y cada envío solo su hash
+    hash_plantilla = registro.registrar_plantilla(plantilla.texto) if registro is not None else None
+
+    def anotar(contacto_idx, error=None):
+        """Registra el resultado del contacto en la bitácora y en el registro de envíos (si los hay)"""
+        nonlocal fallidos, invalidos
+        if error is None:
+            estado = ESTADO_ENVIADO
+        elif isinstance(error, NumeroInvalido):
+            estado = ESTADO_INVALIDO
+            invalidos += 1
+        else:
+            estado = ESTADO_ERROR
+            fallidos += 1
+        detalle = None if error is None else f"{type(error).__name__}: {error}"
+        celular = contactos_validos[contacto_idx].celular
+        if bitacora is not None:
+            bitacora.registrar(campana, celular, estado, detalle)
+        if error is not None and planificador is not None:
+            # La cuota cuenta solo lo enviado (igual que contar_enviados en la bitácora)
+            planificador.devolver_turno()
+        if registro is not None:
+            registro.registrar_envio(celular, estado, hash_plantilla, campana,
+                                     len(image_paths), len(pdf_paths), detalle)
+
+    def enviar_contacto(contacto_idx):
+        contacto = contactos_validos[contacto_idx]
+        with medidor.fase(FASE_PREPARAR):
+            mensaje = plantilla.renderizar(contacto)
+            numero = f"+{contacto.celular}"
+
+        print(f"Enviando mensaje {contacto_idx + 1}/{total_validos} a {contacto.nombre} ({numero})")
+        if total_archivos:
+            print(f"Enviando {len(image_paths)} imagen(es) y {len(pdf_paths)} PDF(s) a {numero} (Total: {total_archivos} archivos)")
+        else:
+            print(f"Enviando solo texto a {numero}")
+
+        transporte.enviar(numero, mensaje, image_paths, pdf_paths)
+        print(f"Mensaje completo enviado a {contacto.nombre}")
+
+    def enviar_contacto_medido(contacto_idx):
+        """enviar_contacto con sus fases medidas (en el hilo que lo envía)"""
+        with medidor.contacto(contacto_idx):
+            enviar_contacto(contacto_idx)
+
+    completa = False
+    transporte.iniciar()
+    try:
+        if transporte.concurrencia > 1:
+            enviados = _enviar_concurrente(
+                enviar_contacto_medido, contactos_validos, por_enviar, transporte.concurrencia,
+                control, progress_callback, anotar, planificador
+            )
+        else:
+            # Empezar desde el índice especificado (omitiendo los ya enviados)
+            for contacto_idx in por_enviar:
+                nombre = ""
                 try:
-                    window = gw.getWindowsWithTitle("WhatsApp")[0]
-                    window.activate()
-                    time.sleep(1)
-                except Exception:
-                    print("No se pudo activar la ventana de WhatsApp Web")
-
-                # Verificar pausa antes de continuar
-                while pause_check and not pause_check():
-                    if app_running_check and not app_running_check():
-                        return enviados
-                    time.sleep(0.5)
-
-                if app_running_check and not app_running_check():
+                    # Verificar si la aplicación sigue ejecutándose o está pausada
+                    control.verificar()
+                    with medidor.contacto(contacto_idx):
+                        if planificador is not None:
+                            with medidor.fase(FASE_INTERVALO):
+                                planificador.esperar_turno(control.esperar)
+
+                        nombre = contactos_validos[contacto_idx].nombre
+
+                        # Actualizar progreso con nombre del contacto
+                        if progress_callback:
+                            progress_callback(contacto_idx + 1, total_validos, nombre)
+
+                        enviar_contacto(contacto_idx)
+                        enviados += 1
+                        anotar(contacto_idx)
+
+                        # Intervalo entre envíos con verificación de pausa (salvo que el planificador
+                        # marque el ritmo con una tasa; con solo cuota u horario se mantiene el intervalo)
+                        if planificador is None or planificador.tasa is None:
+                            with medidor.fase(FASE_INTERVALO):
+                                control.esperar(intervalo)
+
+                except EnvioInterrumpido:
+                    print("Envío interrumpido por cierre de aplicación")
                     break
+                except NumeroInvalido as e:
+                    # No se envió nada: se pasa al siguiente sin el intervalo entre envíos
+                    print(f"Número inválido en el contacto {contacto_idx + 1} ({nombre}): {e}")
+                    anotar(contacto_idx, e)
+                except Exception as e:
+                    print(f"Error con el contacto {contacto_idx + 1} ({nombre}): {type(e).__name__}: {e}")
+                    anotar(contacto_idx, e)
+                    # Continuar con el siguiente contacto
+
+        # Una campaña interrumpida o con fallos queda pendiente para reanudarla
+        completa = not control.cancelado and not fallidos
+    finally:
+        transporte.finalizar()
+        if bitacora is not None:
+            if completa:
+                bitacora.terminar_campana(campana)
+            else:
+                bitacora.flush()
+        if resultados is not None:
+            resultados.update({ESTADO_ENVIADO: enviados, ESTADO_INVALIDO: invalidos, ESTADO_ERROR: fallidos})
+        if invalidos:
+            print(f"Números inválidos o sin WhatsApp: {invalidos} (no se cuentan como enviados)")
+        medidor.terminar()
+        resumen = medidor.lineas_resumen()
+        if resumen:
+            print("Tiempos por fase:\n" + "\n".join(resumen))
 
-                # --- ENVIAR IMÁGENES PRIMERO (si las hay) ---
-                if tiene_imagenes:
-                    print(f"Enviando {len(image_paths)} imagen(es)...")
-                    
-                    # Clic en ícono de clip (adjuntar)
-                    #pg.click(x=485, y=700)
-                    pg.click(x=671, y=1004)
-                    time.sleep(1)
-                    
-                    # Verificar pausa
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-
-                    # Clic en ícono de imagen
-                    #pg.click(x=470, y=455)
-                    pg.click(x=672, y=699)
-                    time.sleep(2)
-
-                    # Escribir paths de imágenes separados por espacio y entre comillas
-                    all_image_paths = " ".join(f'"{os.path.abspath(p)}"' for p in image_paths)
-                    pg.write(all_image_paths)
-                    time.sleep(2)
-
-                    # Verificar pausa antes de enviar
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-
-                    pg.press('enter')  # Abrir imágenes
-                    time.sleep(3)
-
-                    pg.press('enter')  # Enviar imágenes
-                    time.sleep(4)
-
-                    print(f"Imágenes enviadas")
-
-                # --- ENVIAR PDFs DESPUÉS (si los hay) ---
-                if tiene_pdfs:
-                    print(f"Enviando {len(pdf_paths)} PDF(s)...")
-                    
-                    # Verificar pausa antes de enviar PDFs
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-
-                    # Esperar un poco entre envíos de diferentes tipos
-                    time.sleep(2)
-
-                    # Clic en ícono de clip (adjuntar)
-                    #pg.click(x=485, y=700)
-                    pg.click(x=671, y=1004)
-                    time.sleep(1)
-                    
-                    # Verificar pausa
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-
-                    # Clic en ícono de documento
-                    #pg.click(x=470, y=424)
-                    pg.click(x=651, y=660)
-                    time.sleep(2)
-
-                    # Escribir paths de PDFs separados por espacio y entre comillas
-                    all_pdf_paths = " ".join(f'"{os.path.abspath(p)}"' for p in pdf_paths)
-                    pg.write(all_pdf_paths)
-                    time.sleep(2)
-
-                    # Verificar pausa antes de enviar
-                    while pause_check and not pause_check():
-                        if app_running_check and not app_running_check():
-                            return enviados
-                        time.sleep(0.5)
-
-                    pg.press('enter')  # Abrir PDFs
-                    time.sleep(3)
-                    pg.press('enter')  # Enviar PDFs
-                    time.sleep(4)
-
-                    print(f"PDFs enviados")
-
-                # Cerrar la pestaña de WhatsApp Web
-                pg.hotkey('ctrl', 'w')
-                print("Ventana de WhatsApp cerrada.")
+    return enviados
 
-            else:
-                # Solo enviar texto si no hay archivos adjuntos
-                print(f"Enviando solo texto a {numero}")
-                
-                # Verificar pausa antes de enviar texto
-                while pause_check and not pause_check():
-                    if app_running_check and not app_running_check():
-                        return enviados
-                    time.sleep(0.5)
-
-                pywhatkit.sendwhatmsg_instantly(
-                    phone_no=numero,
-                    message=mensaje,
-                    wait_time=10,
-                    tab_close=True
-                )
-
-            enviados += 1
-            print(f"Mensaje completo enviado a {nombre}")
-            
-            # Verificar antes del intervalo entre envíos
-            if app_running_check and not app_running_check():
+def _enviar_concurrente(enviar_contacto, contactos_validos, por_enviar, concurrencia, control, progress_callback,
+                        anotar, planificador=None):
+    """
+    Envía con hasta `concurrencia` contactos en vuelo a la vez (transportes con enviar() seguro entre hilos).
+    La pausa, la cancelación y el planificador se respetan antes de despachar cada contacto;
+    al cancelar se esperan los envíos ya iniciados. El progreso cuenta contactos terminados, que pueden llegar en otro orden.
+    """
+    total_validos = len(contactos_validos)
+    enviados = 0
+    terminados = total_validos - len(por_enviar)
+    pendientes = {}
+
+    def recoger(listos):
+        nonlocal enviados, terminados
+        for futuro in listos:
+            contacto_idx = pendientes.pop(futuro)
+            nombre = contactos_validos[contacto_idx].nombre
+            terminados += 1
+            try:
+                futuro.result()
+                enviados += 1
+                anotar(contacto_idx)
+            except EnvioInterrumpido:
+                pass  # Cancelado a mitad del contacto: queda sin registrar y se reintenta al reanudar
+            except NumeroInvalido as e:
+                print(f"Número inválido en el contacto {contacto_idx + 1} ({nombre}): {e}")
+                anotar(contacto_idx, e)
+            except Exception as e:
+                print(f"Error con el contacto {contacto_idx + 1} ({nombre}): {type(e).__name__}: {e}")
+                anotar(contacto_idx, e)
+            if progress_callback:
+                progress_callback(terminados, total_validos, nombre)
+
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        for contacto_idx in por_enviar:
+            try:
+                control.verificar()
+                if planificador is not None:
+                    planificador.esperar_turno(control.esperar)
+            except EnvioInterrumpido:
+                print("Envío interrumpido por cierre de aplicación")
                 break
 
-            # Intervalo entre envíos con verificación de pausa
-            for _ in range(5):
-                while pause_check and not pause_check():
-                    if app_running_check and not app_running_check():
-                        return enviados
-                    time.sleep(0.5)
-                
-                if app_running_check and not app_running_check():
-                    break
-                time.sleep(1)
+            if len(pendientes) >= concurrencia:
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                recoger(listos)
+            pendientes[pool.submit(enviar_contacto, contacto_idx)] = contacto_idx
 
-        except Exception as e:
-            print(f"Error con el contacto {contacto_idx + 1} ({nombre}): {type(e).__name__}: {e}")
-            # Continuar con el siguiente contacto
+        recoger(wait(pendientes).done)
 
     return enviados
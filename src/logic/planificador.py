@@ -0,0 +1,157 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+# Las esperas largas (fuera de horario, cuota agotada) se hacen en tramos para volver a mirar el reloj
+# del sistema: si la PC se suspende o cambia la hora, la espera se corrige sola
+TRAMO_ESPERA = 60
+
+def parsear_ventanas(texto):
+    """
+    "08:00-12:30, 15:00-20:00" -> [(time(8, 0), time(12, 30)), (time(15, 0), time(20, 0))]
+    Una ventana con fin menor que el inicio cruza la medianoche ("22:00-02:00"). Texto vacío: sin ventanas.
+    """
+    ventanas = []
+    for parte in (texto or "").replace(";", ",").split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        try:
+            inicio, fin = (datetime.strptime(h.strip(), "%H:%M").time() for h in parte.split("-"))
+        except ValueError:
+            raise ValueError(f"Horario no válido: '{parte}' (usa HH:MM-HH:MM, p. ej. 08:00-20:00)")
+        if inicio == fin:
+            raise ValueError(f"Horario no válido: '{parte}' (el inicio y el fin son iguales)")
+        ventanas.append((inicio, fin))
+    return ventanas
+
+class PlanificadorEnvios:
+    """
+    Ritmo de envío por cubeta de fichas (token bucket), delante del transporte.
+    Cada contacto consume una ficha; las fichas se reponen a `tasa` por minuto hasta `rafaga`,
+    así que tras una pausa se pueden enviar hasta `rafaga` contactos seguidos y luego se mantiene la tasa.
+
+    tasa: contactos por minuto (None = sin límite de velocidad)
+    rafaga: fichas máximas acumuladas
+    jitter: segundos al azar (entre 0 y jitter) que se agregan antes de cada envío
+    cuota_diaria: máximo de contactos por día calendario (None = sin límite)
+    ventanas: lista de (inicio, fin) datetime.time con los horarios permitidos (vacía = todo el día)
+
+    Fuera de horario o con la cuota del día agotada, esperar_turno() duerme hasta la siguiente
+    ventana: los contactos que faltan se difieren solos, respetando la pausa y el cierre.
+    Cada turno reserva un lugar en la cuota; si el contacto no se envía (error o número inválido)
+    se devuelve con devolver_turno(), así la cuota cuenta lo mismo que la bitácora: solo lo enviado.
+    """
+
+    def __init__(self, tasa=None, rafaga=1, jitter=0.0, cuota_diaria=None, ventanas=None,
+                 reloj=time.monotonic, ahora=datetime.now, azar=None):
+        if tasa is not None and tasa <= 0:
+            raise ValueError("La tasa debe ser mayor que 0 contactos por minuto")
+        if rafaga < 1:
+            raise ValueError("La ráfaga debe ser de al menos 1 contacto")
+        if cuota_diaria is not None and cuota_diaria < 1:
+            raise ValueError("La cuota diaria debe ser de al menos 1 contacto")
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.jitter = jitter
+        self.cuota_diaria = cuota_diaria
+        self.ventanas = list(ventanas or [])
+        self._reloj = reloj
+        self._ahora = ahora
+        self._azar = azar or random.Random()
+
+        self._fichas = float(rafaga)
+        self._ultima_reposicion = reloj()
+        self._dia = ahora().date()
+        self._enviados_dia = 0
+
+    def inicio_dia(self):
+        """Comienzo del día actual (para contar en la bitácora los envíos que ya se hicieron hoy)"""
+        return datetime.combine(self._ahora().date(), datetime.min.time())
+
+    def sincronizar_cuota(self, enviados_hoy):
+        """Fija cuántos contactos ya se enviaron hoy (p. ej. en una ejecución anterior del programa)"""
+        self._dia = self._ahora().date()
+        self._enviados_dia = enviados_hoy
+
+    def devolver_turno(self):
+        """Libera el lugar en la cuota del día de un contacto que no se llegó a enviar"""
+        self._enviados_dia = max(0, self._enviados_dia - 1)
+
+    def _en_ventana(self, momento):
+        if not self.ventanas:
+            return True
+        hora = momento.time()
+        for inicio, fin in self.ventanas:
+            if inicio < fin:
+                if inicio <= hora < fin:
+                    return True
+            elif hora >= inicio or hora < fin:  # Cruza la medianoche
+                return True
+        return False
+
+    def _siguiente_apertura(self, momento, desde_manana=False):
+        """Primer instante permitido a partir de `momento` (o del día siguiente si desde_manana)"""
+        dia = momento.date()
+        if desde_manana:
+            dia += timedelta(days=1)
+            momento = datetime.combine(dia, datetime.min.time())
+        if self._en_ventana(momento):
+            return momento
+        candidatos = [
+            datetime.combine(dia + timedelta(days=d), inicio)
+            for d in range(2) for inicio, _ in self.ventanas
+        ]
+        return min(c for c in candidatos if c >= momento)
+
+    def _reponer(self):
+        ahora = self._reloj()
+        if self.tasa is None:
+            self._fichas = float(self.rafaga)
+        else:
+            transcurrido = ahora - self._ultima_reposicion
+            self._fichas = min(float(self.rafaga), self._fichas + transcurrido * self.tasa / 60)
+        self._ultima_reposicion = ahora
+
+    def _esperar_hasta_momento(self, destino, esperar):
+        while True:
+            restante = (destino - self._ahora()).total_seconds()
+            if restante <= 0:
+                return
+            esperar(min(restante, TRAMO_ESPERA))
+
+    def esperar_turno(self, esperar=time.sleep):
+        """
+        Bloquea hasta que se pueda enviar el siguiente contacto y consume su ficha.
+        esperar: función de espera (ControlCampana.esperar para respetar pausa y cancelación)
+        """
+        while True:
+            momento = self._ahora()
+            if momento.date() != self._dia:
+                self._dia = momento.date()
+                self._enviados_dia = 0
+
+            if self.cuota_diaria is not None and self._enviados_dia >= self.cuota_diaria:
+                reanudacion = self._siguiente_apertura(momento, desde_manana=True)
+                print(f"Cuota diaria de {self.cuota_diaria} contactos alcanzada; "
+                      f"se continúa el {reanudacion:%d/%m/%Y a las %H:%M}")
+                self._esperar_hasta_momento(reanudacion, esperar)
+                continue
+
+            if not self._en_ventana(momento):
+                reanudacion = self._siguiente_apertura(momento)
+                print(f"Fuera del horario de envío; se continúa el {reanudacion:%d/%m/%Y a las %H:%M}")
+                self._esperar_hasta_momento(reanudacion, esperar)
+                continue
+
+            self._reponer()
+            if self._fichas < 1:
+                esperar((1 - self._fichas) * 60 / self.tasa)
+                continue  # Volver a revisar horario y cuota tras la espera
+
+            self._fichas -= 1
+            self._enviados_dia += 1
+            break
+
+        if self.jitter:
+            esperar(self._azar.uniform(0, self.jitter))
@@ -0,0 +1,68 @@
+from datetime import date
+from string import Formatter
+
+# Variables que se pueden usar en el mensaje (atributos de Contacto)
+CAMPOS_DISPONIBLES = ('nombre', 'celular', 'fecha_fin')
+
+# Formato de fecha cuando la variable no indica uno, p. ej. {fecha_fin}
+FORMATO_FECHA = "%d/%m/%Y"
+
+class PlantillaMensaje:
+    """
+    Plantilla de mensaje parseada y validada una sola vez.
+    Acepta especificaciones de formato de str.format, p. ej. {fecha_fin:%d-%m-%Y} o {nombre:.10}.
+    Lanza ValueError al crearla si usa variables que no existen, antes de iniciar cualquier envío.
+    """
+
+    def __init__(self, texto, campos=CAMPOS_DISPONIBLES, formato_fecha=FORMATO_FECHA):
+        self.texto = texto
+        self.formato_fecha = formato_fecha
+        self._partes = self._compilar(texto, campos)
+
+    @staticmethod
+    def _compilar(texto, campos):
+        """Divide el texto en (literal, campo, conversion, formato) y valida los nombres de campo"""
+        try:
+            partes = list(Formatter().parse(texto))
+        except ValueError as e:
+            raise ValueError(f"El mensaje tiene llaves mal cerradas: {e}")
+
+        desconocidos = []
+        for _, campo, _, _ in partes:
+            if campo is not None and campo not in campos:
+                desconocidos.append("{" + campo + "}")
+
+        if desconocidos:
+            disponibles = ", ".join("{" + c + "}" for c in campos)
+            raise ValueError(
+                f"Variables desconocidas en el mensaje: {', '.join(desconocidos)}\n"
+                f"Variables disponibles: {disponibles}"
+            )
+        return partes
+
+    def _formatear(self, valor, conversion, formato):
+        if valor is None:
+            return ""
+        if conversion == 's':
+            valor = str(valor)
+        elif conversion == 'r':
+            valor = repr(valor)
+        elif conversion == 'a':
+            valor = ascii(valor)
+
+        if isinstance(valor, date) and not formato:
+            formato = self.formato_fecha
+        try:
+            return format(valor, formato)
+        except (ValueError, TypeError):
+            # Formato que no aplica al valor (p. ej. fecha escrita como texto en el Excel)
+            return str(valor).strip()
+
+    def renderizar(self, contacto):
+        """Genera el mensaje para un contacto (cualquier objeto con los atributos de CAMPOS_DISPONIBLES)"""
+        salida = []
+        for literal, campo, formato, conversion in self._partes:
+            salida.append(literal)
+            if campo is not None:
+                salida.append(self._formatear(getattr(contacto, campo), conversion, formato))
+        return "".join(salida)
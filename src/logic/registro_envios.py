@@ -0,0 +1,164 @@
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+# Rotación por tamaño: envios.jsonl -> envios.jsonl.1 -> ... -> envios.jsonl.<COPIAS> (la más vieja se borra)
+TAMANO_MAXIMO = 5 * 1024 * 1024
+COPIAS = 3
+
+# Registros que el hilo de escritura junta como máximo en una sola escritura
+LOTE_ESCRITURA = 500
+
+def ruta_por_defecto():
+    """Registro en la carpeta de datos del usuario, junto a la bitácora (no en la carpeta de trabajo)"""
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, "WhatsappSender", "envios.jsonl")
+
+def hash_plantilla(texto):
+    """Identificador corto y estable del texto de la plantilla"""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]
+
+class RegistroEnvios:
+    """
+    Registro de envíos en líneas JSON, compacto y con rotación por tamaño. Reemplaza al
+    PyWhatKit_DB.txt de pywhatkit (texto libre con el mensaje completo repetido en cada envío,
+    en la carpeta de trabajo y sin límite de tamaño).
+
+    Un registro por contacto con el número, el resultado y el hash de la plantilla; el texto de cada
+    plantilla se escribe una sola vez por archivo (registro de tipo "plantilla").
+    registrar_envio() solo encola: un hilo aparte escribe por lotes, así el hilo de envío no
+    espera al disco. cerrar() (también al salir del programa) escribe lo pendiente.
+
+    path: archivo .jsonl (por defecto en la carpeta de datos del usuario)
+    tamano_maximo: bytes a partir de los cuales se rota el archivo (se revisa después de cada lote)
+    copias: archivos rotados que se conservan
+    """
+
+    def __init__(self, path=None, tamano_maximo=TAMANO_MAXIMO, copias=COPIAS):
+        self.path = path or ruta_por_defecto()
+        self.tamano_maximo = tamano_maximo
+        self.copias = copias
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._cola = queue.Queue()
+        self._plantillas = {}  # hash -> texto de las plantillas usadas en esta sesión
+        self._escritas = set()  # hashes cuyo texto ya está en el archivo actual
+        self._archivo = None
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._escribir, name="registro-envios", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    # Desde el hilo de envío: solo encolan
+
+    def registrar_plantilla(self, texto):
+        """Anota el texto de la plantilla de una campaña y retorna su hash"""
+        clave = hash_plantilla(texto)
+        self._cola.put(("plantilla", clave, texto))
+        return clave
+
+    def registrar_envio(self, numero, estado, plantilla, campana=None, imagenes=0, pdfs=0, detalle=None):
+        registro = {
+            "tipo": "envio",
+            "momento": datetime.now().isoformat(timespec="seconds"),
+            "campana": campana,
+            "numero": numero,
+            "estado": estado,
+            "plantilla": plantilla,
+        }
+        if imagenes:
+            registro["imagenes"] = imagenes
+        if pdfs:
+            registro["pdfs"] = pdfs
+        if detalle:
+            registro["detalle"] = detalle
+        self._cola.put(("envio", registro))
+
+    def flush(self):
+        """Espera a que todo lo encolado hasta ahora esté escrito en disco"""
+        listo = threading.Event()
+        self._cola.put(("flush", listo))
+        listo.wait()
+
+    def cerrar(self):
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._cola.put(None)
+        self._hilo.join()
+        atexit.unregister(self.cerrar)
+
+    # Hilo de escritura
+
+    def _abrir(self):
+        self._archivo = open(self.path, "a", encoding="utf-8")
+        self._escritas = set()
+
+    def _rotar(self):
+        self._archivo.close()
+        for n in range(self.copias - 1, 0, -1):
+            origen = f"{self.path}.{n}"
+            if os.path.exists(origen):
+                os.replace(origen, f"{self.path}.{n + 1}")
+        if self.copias > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._abrir()
+
+    def _linea_plantilla(self, clave):
+        self._escritas.add(clave)
+        return json.dumps({
+            "tipo": "plantilla",
+            "momento": datetime.now().isoformat(timespec="seconds"),
+            "hash": clave,
+            "texto": self._plantillas[clave],
+        }, ensure_ascii=False) + "\n"
+
+    def _escribir(self):
+        self._abrir()
+        terminar = False
+        while not terminar:
+            lote = [self._cola.get()]
+            while len(lote) < LOTE_ESCRITURA:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            lineas = []
+            avisos = []
+            for item in lote:
+                if item is None:
+                    terminar = True
+                elif item[0] == "plantilla":
+                    _, clave, texto = item
+                    self._plantillas[clave] = texto
+                    if clave not in self._escritas:
+                        lineas.append(self._linea_plantilla(clave))
+                elif item[0] == "envio":
+                    registro = item[1]
+                    clave = registro["plantilla"]
+                    if clave in self._plantillas and clave not in self._escritas:
+                        lineas.append(self._linea_plantilla(clave))
+                    lineas.append(json.dumps(registro, ensure_ascii=False) + "\n")
+                else:
+                    avisos.append(item[1])
+
+            try:
+                if lineas:
+                    self._archivo.write("".join(lineas))
+                    self._archivo.flush()
+                    if self._archivo.tell() >= self.tamano_maximo:
+                        # En el archivo nuevo cada plantilla se vuelve a escribir antes de su primer envío
+                        self._rotar()
+            except OSError as e:
+                print(f"No se pudo escribir el registro de envíos: {e}")
+            for aviso in avisos:
+                aviso.set()
+
+        self._archivo.close()
@@ -0,0 +1,157 @@
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from logic.control import EnvioInterrumpido
+
+# Fases de cada contacto, en el orden en que ocurren
+FASE_PREPARAR = "preparar"          # Armar el mensaje del contacto con la plantilla (el Excel ya está leído)
+FASE_ABRIR_CHAT = "abrir_chat"      # Navegar al chat (URL, buscador o nada en la Cloud API)
+FASE_ESPERA_LISTO = "espera_listo"  # Esperar a que el chat cargue y acepte texto
+FASE_IMAGENES = "imagenes"          # Adjuntar y enviar las imágenes
+FASE_PDFS = "pdfs"                  # Adjuntar y enviar los PDFs
+FASE_ENVIO = "envio"                # Escribir y enviar el texto, y cerrar el chat
+FASE_INTERVALO = "intervalo"        # Espera entre contactos (fija, del planificador o de la sesión)
+FASES = (FASE_PREPARAR, FASE_ABRIR_CHAT, FASE_ESPERA_LISTO, FASE_IMAGENES, FASE_PDFS, FASE_ENVIO, FASE_INTERVALO)
+
+def ruta_por_defecto():
+    """Registro de tiempos en la carpeta de datos del usuario, junto a la bitácora de envíos"""
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, "WhatsappSender", "tiempos.jsonl")
+
+def percentil(valores, p):
+    """Percentil p (0-100) por rango más cercano de una lista ya ordenada"""
+    if not valores:
+        return None
+    return valores[max(0, math.ceil(p / 100 * len(valores)) - 1)]
+
+class MedidorFases:
+    """
+    Tiempos por contacto y por fase (ver FASES) con reloj monotónico.
+
+    send_messages abre un contacto() por destinatario y el transporte marca sus pasos con fase();
+    una fase dentro de otra se descuenta de la de afuera (p. ej. la espera del chat dentro de
+    abrir_chat), así las fases de un contacto suman su tiempo medido. El tiempo en pausa cuenta
+    en la fase donde se pausó.
+
+    Cada contacto se escribe como una línea JSON en `path` (si se indica) y al terminar() se agrega
+    una línea con el resumen p50/p95/máximo por fase. Los contactos cortados por una cancelación
+    se escriben pero no entran en el resumen. Con transportes concurrentes cada hilo mide
+    su propio contacto.
+
+    path: archivo .jsonl donde se agregan los registros (None = solo en memoria)
+    campana: id de campaña que se anota en cada registro
+    """
+
+    def __init__(self, path=None, campana=None, reloj=time.monotonic):
+        self.path = path
+        self.campana = campana
+        self._reloj = reloj
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._duraciones = {fase: [] for fase in FASES + ("total",)}
+        self._archivo = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._archivo = open(path, "a", encoding="utf-8")
+
+    def _escribir(self, registro):
+        if self._archivo is not None:
+            self._archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    @contextlib.contextmanager
+    def contacto(self, indice):
+        """Mide un contacto; el resultado es 'enviado' o el nombre de la excepción que lo cortó"""
+        registro = {"fases": {}, "pila": []}
+        self._local.registro = registro
+        inicio = self._reloj()
+        resultado = "enviado"
+        interrumpido = False
+        try:
+            yield
+        except BaseException as e:
+            resultado = type(e).__name__
+            interrumpido = isinstance(e, EnvioInterrumpido)
+            raise
+        finally:
+            total = self._reloj() - inicio
+            self._local.registro = None
+            fases = registro["fases"]
+            with self._lock:
+                if not interrumpido:
+                    for fase, segundos in fases.items():
+                        self._duraciones.setdefault(fase, []).append(segundos)
+                    self._duraciones["total"].append(total)
+                self._escribir({
+                    "tipo": "contacto",
+                    "campana": self.campana,
+                    "indice": indice,
+                    "resultado": resultado,
+                    "momento": datetime.now().isoformat(timespec="seconds"),
+                    "fases": {fase: round(segundos, 4) for fase, segundos in fases.items()},
+                    "total": round(total, 4),
+                })
+
+    @contextlib.contextmanager
+    def fase(self, nombre):
+        """Mide una fase del contacto en curso en este hilo (fuera de un contacto no mide nada)"""
+        registro = getattr(self._local, "registro", None)
+        if registro is None:
+            yield
+            return
+
+        pila = registro["pila"]
+        marco = [self._reloj(), 0.0]  # inicio, tiempo de las fases anidadas
+        pila.append(marco)
+        try:
+            yield
+        finally:
+            pila.pop()
+            duracion = self._reloj() - marco[0]
+            registro["fases"][nombre] = registro["fases"].get(nombre, 0.0) + duracion - marco[1]
+            if pila:
+                pila[-1][1] += duracion
+
+    def resumen(self):
+        """{fase: {"contactos", "p50", "p95", "max"}} con las fases que se midieron al menos una vez"""
+        with self._lock:
+            duraciones = {fase: sorted(valores) for fase, valores in self._duraciones.items() if valores}
+        return {
+            fase: {
+                "contactos": len(valores),
+                "p50": round(percentil(valores, 50), 4),
+                "p95": round(percentil(valores, 95), 4),
+                "max": round(valores[-1], 4),
+            }
+            for fase, valores in duraciones.items()
+        }
+
+    def lineas_resumen(self):
+        """Resumen como tabla de texto (una línea por fase)"""
+        resumen = self.resumen()
+        if not resumen:
+            return []
+        lineas = [f"{'Fase':<14}{'contactos':>10}{'p50':>9}{'p95':>9}{'máx':>9}"]
+        for fase in FASES + ("total",):
+            if fase in resumen:
+                r = resumen[fase]
+                lineas.append(f"{fase:<14}{r['contactos']:>10}{r['p50']:>8.2f}s{r['p95']:>8.2f}s{r['max']:>8.2f}s")
+        return lineas
+
+    def terminar(self):
+        """Agrega la línea de resumen y cierra el archivo (el resumen sigue disponible en memoria)"""
+        with self._lock:
+            archivo = self._archivo
+            self._archivo = None
+        if archivo is not None:
+            archivo.write(json.dumps({
+                "tipo": "resumen",
+                "campana": self.campana,
+                "momento": datetime.now().isoformat(timespec="seconds"),
+                "fases": self.resumen(),
+            }, ensure_ascii=False) + "\n")
+            archivo.close()
@@ -0,0 +1,153 @@
+import contextlib
+import time
+
+from logic.tiempos import FASE_ABRIR_CHAT, FASE_ENVIO, FASE_IMAGENES, FASE_PDFS
+
+class NumeroInvalido(Exception):
+    """El número no es válido o no tiene WhatsApp: no se envió nada y no tiene sentido reintentarlo"""
+
+class Transporte:
+    """
+    Interfaz de envío usada por send_messages. Cada contacto sigue la secuencia:
+    abrir_chat -> enviar_texto -> adjuntar_imagenes / adjuntar_documentos (opcionales) -> cerrar_chat.
+    Las esperas internas deben usar self.esperar, que send_messages reemplaza por una
+    espera que respeta la pausa y el cierre de la aplicación.
+    Los pasos se miden con self.fase(nombre) (ver logic.tiempos), que send_messages reemplaza
+    por la del MedidorFases de la campaña; por defecto no mide nada.
+    Si el chat no se puede abrir porque el número no existe en WhatsApp, el transporte cierra el aviso
+    y lanza NumeroInvalido en cuanto lo detecta, sin esperar el tiempo máximo ni seguir con los adjuntos.
+
+    Los transportes que pueden atender varios contactos a la vez (p. ej. la API HTTP) declaran
+    concurrencia > 1 y sobrescriben enviar(), que entonces debe ser seguro entre hilos.
+    """
+    nombre = "base"
+    concurrencia = 1      # Contactos que send_messages puede enviar en paralelo
+    intervalo = None      # Segundos entre contactos (None = INTERVALO_ENTRE_ENVIOS de send_messages)
+
+    def __init__(self):
+        self.esperar = time.sleep
+        self.fase = lambda nombre: contextlib.nullcontext()
+
+    def esperar_hasta(self, condicion, timeout, intervalo=0.2):
+        """
+        Espera hasta que condicion() sea verdadera o pasen timeout segundos.
+        Retorna True si la condición se cumplió (una excepción en condicion cuenta como no cumplida).
+        """
+        # Se cuenta el tiempo efectivamente esperado: una pausa de la campaña no agota el timeout
+        esperado = 0
+        while True:
+            try:
+                if condicion():
+                    return True
+            except Exception:
+                pass
+            if esperado >= timeout:
+                return False
+            paso = min(intervalo, timeout - esperado)
+            self.esperar(paso)
+            esperado += paso
+
+    def iniciar(self):
+        """Se llama una vez antes del primer contacto de la campaña"""
+
+    def finalizar(self):
+        """Se llama una vez al terminar (o interrumpir) la campaña"""
+
+    def enviar(self, numero, mensaje, image_paths=(), pdf_paths=()):
+        """Envía el mensaje y los adjuntos a un contacto con la secuencia completa de pasos"""
+        with self.fase(FASE_ABRIR_CHAT):
+            self.abrir_chat(numero)
+        with self.fase(FASE_ENVIO):
+            self.enviar_texto(mensaje)
+
+        # --- ENVIAR IMÁGENES PRIMERO (si las hay) ---
+        if image_paths:
+            with self.fase(FASE_IMAGENES):
+                self.esperar(0)  # Respeta una pausa pedida entre pasos
+                print(f"Enviando {len(image_paths)} imagen(es)...")
+                self.adjuntar_imagenes(image_paths)
+                print("Imágenes enviadas")
+
+        # --- ENVIAR PDFs DESPUÉS (si los hay) ---
+        if pdf_paths:
+            with self.fase(FASE_PDFS):
+                self.esperar(0)
+                print(f"Enviando {len(pdf_paths)} PDF(s)...")
+                self.adjuntar_documentos(pdf_paths)
+                print("PDFs enviados")
+
+        with self.fase(FASE_ENVIO):
+            self.cerrar_chat()
+
+    def abrir_chat(self, numero):
+        raise NotImplementedError
+
+    def enviar_texto(self, mensaje):
+        raise NotImplementedError
+
+    def adjuntar_imagenes(self, paths):
+        raise NotImplementedError
+
+    def adjuntar_documentos(self, paths):
+        raise NotImplementedError
+
+    def cerrar_chat(self):
+        raise NotImplementedError
+
+class TransporteFalso(Transporte):
+    """
+    Transporte en memoria para pruebas y benchmarks sin escritorio ni teléfono.
+    Registra cada llamada en self.llamadas como (operacion, numero, *args) y simula latencias.
+    latencias: dict operacion -> segundos o función sin argumentos que retorna segundos
+    numeros_fallidos: números para los que abrir_chat lanza una excepción
+    numeros_invalidos: números para los que abrir_chat lanza NumeroInvalido
+    """
+    nombre = "falso"
+
+    def __init__(self, latencias=None, numeros_fallidos=(), numeros_invalidos=()):
+        super().__init__()
+        self.latencias = dict(latencias or {})
+        self.numeros_fallidos = set(numeros_fallidos)
+        self.numeros_invalidos = set(numeros_invalidos)
+        self.llamadas = []
+        self._numero = None
+
+    def _registrar(self, operacion, *args):
+        self.llamadas.append((operacion, self._numero) + args)
+        latencia = self.latencias.get(operacion, 0)
+        if callable(latencia):
+            latencia = latencia()
+        if latencia:
+            self.esperar(latencia)
+
+    def iniciar(self):
+        self._registrar('iniciar')
+
+    def finalizar(self):
+        self._registrar('finalizar')
+
+    def abrir_chat(self, numero):
+        self._numero = numero
+        self._registrar('abrir_chat')
+        if numero in self.numeros_fallidos:
+            raise Exception(f"No se pudo abrir el chat de {numero}")
+        if numero in self.numeros_invalidos:
+            raise NumeroInvalido(f"{numero} no tiene WhatsApp")
+
+    def enviar_texto(self, mensaje):
+        self._registrar('enviar_texto', mensaje)
+
+    def adjuntar_imagenes(self, paths):
+        self._registrar('adjuntar_imagenes', tuple(paths))
+
+    def adjuntar_documentos(self, paths):
+        self._registrar('adjuntar_documentos', tuple(paths))
+
+    def cerrar_chat(self):
+        self._registrar('cerrar_chat')
+        self._numero = None
+
+    @property
+    def mensajes(self):
+        """Lista de (numero, mensaje) enviados"""
+        return [(numero, args[0]) for operacion, numero, *args in self.llamadas if operacion == 'enviar_texto']
@@ -0,0 +1,241 @@
+import http.client
+import json
+import mimetypes
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from logic.tiempos import FASE_ENVIO, FASE_IMAGENES, FASE_PDFS
+from logic.transporte import NumeroInvalido, Transporte
+
+# Códigos de error de la Cloud API que indican límite de velocidad (además del HTTP 429)
+CODIGOS_LIMITE = {4, 80007, 130429, 131048, 131056}
+
+# Códigos de error de la Cloud API para destinatarios que no tienen WhatsApp
+CODIGOS_NUMERO_INVALIDO = {131026}
+
+def espera_retry_after(valor):
+    """
+    Segundos que pide la cabecera Retry-After, en segundos ("30") o como fecha HTTP
+    ("Wed, 21 Oct 2015 07:28:00 GMT"). None si falta o no se entiende.
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def parametro_plantilla(texto):
+    """
+    La Cloud API rechaza parámetros de plantilla con saltos de línea, tabulaciones o más de
+    4 espacios seguidos (error 132018): los saltos y tabulaciones pasan a un espacio y los
+    espacios repetidos se reducen a uno.
+    """
+    return re.sub(r"\s+", " ", texto).strip()
+
+class ErrorAPI(Exception):
+    """Respuesta de error de la API de WhatsApp Business"""
+
+    def __init__(self, estado, cuerpo):
+        self.estado = estado
+        self.cuerpo = cuerpo
+        error = cuerpo.get('error', {}) if isinstance(cuerpo, dict) else {}
+        self.codigo = error.get('code')
+        super().__init__(f"HTTP {estado}: {error.get('message', cuerpo)}")
+
+class _PoolConexiones:
+    """Conexiones HTTP keep-alive reutilizables, hasta `tamano` abiertas a la vez"""
+
+    def __init__(self, url_base, tamano, timeout):
+        partes = urlsplit(url_base)
+        self._clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self._host = partes.netloc
+        self.prefijo = partes.path.rstrip('/')
+        self._timeout = timeout
+        self._libres = queue.LifoQueue()
+        self._cupos = threading.BoundedSemaphore(tamano)
+
+    def solicitar(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        """Hace la petición con una conexión del pool; retorna (estado, cabeceras, bytes)"""
+        with self._cupos:
+            try:
+                conexion = self._libres.get_nowait()
+                reutilizada = True
+            except queue.Empty:
+                conexion = self._clase(self._host, timeout=self._timeout)
+                reutilizada = False
+            try:
+                conexion.request(metodo, self.prefijo + ruta, body=cuerpo, headers=cabeceras or {})
+                respuesta = conexion.getresponse()
+                datos = respuesta.read()
+            except (http.client.HTTPException, OSError):
+                conexion.close()
+                if not reutilizada:
+                    raise
+                # Conexión inactiva que el servidor ya cerró: se reintenta una vez con una nueva
+                conexion = self._clase(self._host, timeout=self._timeout)
+                conexion.request(metodo, self.prefijo + ruta, body=cuerpo, headers=cabeceras or {})
+                respuesta = conexion.getresponse()
+                datos = respuesta.read()
+
+            if respuesta.will_close:
+                conexion.close()
+            else:
+                self._libres.put(conexion)
+            return respuesta.status, respuesta.headers, datos
+
+    def cerrar(self):
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                return
+
+class TransporteCloudAPI(Transporte):
+    """
+    Envío por la API oficial de WhatsApp Business (Cloud API) sobre HTTP.
+    Usa un pool de conexiones keep-alive con hasta `concurrencia` envíos en paralelo,
+    sube cada adjunto una sola vez (el media ID se reutiliza para todos los destinatarios)
+    y ante un límite de velocidad (HTTP 429 o códigos de CODIGOS_LIMITE) espera Retry-After
+    o un tiempo creciente antes de reintentar.
+
+    plantilla_api: (nombre, idioma) de una plantilla aprobada con un único parámetro {{1}} en el cuerpo;
+    necesaria para escribir a contactos fuera de la ventana de 24 h. Sin ella se envía texto libre.
+    Un parámetro de plantilla no admite saltos de línea: el mensaje se envía en una sola línea
+    (ver parametro_plantilla); los saltos fijos deben ir en el texto de la plantilla aprobada.
+    """
+    nombre = "cloud_api"
+    intervalo = 0  # La API no necesita pausa entre contactos; el límite lo marca el servidor
+
+    def __init__(self, phone_number_id, token, url_base="https://graph.facebook.com", version="v19.0",
+                 concurrencia=8, plantilla_api=None, reintentos=5, espera_base=1.0, timeout=30):
+        super().__init__()
+        self.phone_number_id = phone_number_id
+        self.token = token
+        self.version = version
+        self.concurrencia = concurrencia
+        self.plantilla_api = plantilla_api
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self._pool = _PoolConexiones(url_base, concurrencia, timeout)
+        self._media_ids = {}
+        self._lock_media = threading.Lock()
+
+    def _ruta(self, recurso):
+        return f"/{self.version}/{self.phone_number_id}/{recurso}"
+
+    def _solicitar(self, ruta, cuerpo, tipo="application/json"):
+        """POST con reintentos ante límite de velocidad; retorna el JSON de respuesta"""
+        cabeceras = {"Authorization": f"Bearer {self.token}", "Content-Type": tipo}
+        for intento in range(self.reintentos + 1):
+            estado, respuesta_cabeceras, datos = self._pool.solicitar("POST", ruta, cuerpo, cabeceras)
+            try:
+                respuesta = json.loads(datos or b"{}")
+            except ValueError:
+                respuesta = {"error": {"message": datos[:200].decode(errors='replace')}}
+
+            if 200 <= estado < 300:
+                return respuesta
+
+            error = ErrorAPI(estado, respuesta)
+            if (estado == 429 or error.codigo in CODIGOS_LIMITE) and intento < self.reintentos:
+                espera = espera_retry_after(respuesta_cabeceras.get("Retry-After"))
+                if espera is None:
+                    espera = self.espera_base * (2 ** intento)
+                print(f"Límite de velocidad de la API, reintentando en {espera:.1f} s")
+                self.esperar(espera)
+                continue
+            if error.codigo in CODIGOS_NUMERO_INVALIDO:
+                raise NumeroInvalido(str(error)) from error
+            raise error
+
+    def _subir(self, path):
+        """Sube un archivo a /media (multipart) y retorna su media ID"""
+        tipo = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        limite = uuid.uuid4().hex
+        with open(path, 'rb') as f:
+            contenido = f.read()
+
+        partes = [
+            f'--{limite}\r\nContent-Disposition: form-data; name="messaging_product"\r\n\r\nwhatsapp\r\n'.encode(),
+            f'--{limite}\r\nContent-Disposition: form-data; name="type"\r\n\r\n{tipo}\r\n'.encode(),
+            (f'--{limite}\r\nContent-Disposition: form-data; name="file"; filename="{os.path.basename(path)}"\r\n'
+             f'Content-Type: {tipo}\r\n\r\n').encode() + contenido + b'\r\n',
+            f'--{limite}--\r\n'.encode(),
+        ]
+        respuesta = self._solicitar(self._ruta("media"), b"".join(partes), f"multipart/form-data; boundary={limite}")
+        return respuesta["id"]
+
+    def media_id(self, path):
+        """Media ID del archivo, subiéndolo solo la primera vez que se pide"""
+        clave = os.path.abspath(path)
+        with self._lock_media:
+            if clave not in self._media_ids:
+                print(f"Subiendo adjunto {os.path.basename(path)}...")
+                self._media_ids[clave] = self._subir(path)
+            return self._media_ids[clave]
+
+    def _enviar_mensaje(self, numero, tipo, contenido):
+        cuerpo = {
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "to": numero.lstrip('+'),
+            "type": tipo,
+            tipo: contenido,
+        }
+        return self._solicitar(self._ruta("messages"), json.dumps(cuerpo).encode())
+
+    def _enviar_texto(self, numero, mensaje):
+        if self.plantilla_api:
+            nombre, idioma = self.plantilla_api
+            return self._enviar_mensaje(numero, "template", {
+                "name": nombre,
+                "language": {"code": idioma},
+                "components": [{"type": "body", "parameters": [{"type": "text", "text": parametro_plantilla(mensaje)}]}],
+            })
+        return self._enviar_mensaje(numero, "text", {"body": mensaje, "preview_url": False})
+
+    def iniciar(self):
+        self._media_ids.clear()
+
+    def finalizar(self):
+        self._pool.cerrar()
+
+    def enviar(self, numero, mensaje, image_paths=(), pdf_paths=()):
+        # Seguro entre hilos: no guarda estado por contacto
+        with self.fase(FASE_ENVIO):
+            self._enviar_texto(numero, mensaje)
+        with self.fase(FASE_IMAGENES):
+            for path in image_paths:
+                self._enviar_mensaje(numero, "image", {"id": self.media_id(path)})
+        with self.fase(FASE_PDFS):
+            for path in pdf_paths:
+                self._enviar_mensaje(numero, "document", {"id": self.media_id(path), "filename": os.path.basename(path)})
+
+    # Secuencia paso a paso de la interfaz, por compatibilidad con código que la use directamente
+    def abrir_chat(self, numero):
+        self._numero = numero
+
+    def enviar_texto(self, mensaje):
+        self._enviar_texto(self._numero, mensaje)
+
+    def adjuntar_imagenes(self, paths):
+        for path in paths:
+            self._enviar_mensaje(self._numero, "image", {"id": self.media_id(path)})
+
+    def adjuntar_documentos(self, paths):
+        for path in paths:
+            self._enviar_mensaje(self._numero, "document", {"id": self.media_id(path), "filename": os.path.basename(path)})
+
+    def cerrar_chat(self):
+        self._numero = None
@@ -0,0 +1,189 @@
+import os
+import webbrowser
+from urllib.parse import quote
+
+import pygetwindow as gw
+import pyautogui as pg
+import pyperclip
+
+from logic.tiempos import FASE_ABRIR_CHAT, FASE_ESPERA_LISTO
+from logic.transporte import NumeroInvalido, Transporte
+
+class PuntoControl:
+    """Pixel de pantalla que toma un color conocido cuando un elemento de WhatsApp Web está visible"""
+    __slots__ = ('x', 'y', 'color', 'tolerancia')
+
+    def __init__(self, x, y, color, tolerancia=24):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.tolerancia = tolerancia
+
+    def visible(self):
+        return pg.pixelMatchesColor(self.x, self.y, self.color, tolerance=self.tolerancia)
+
+class TransporteEscritorio(Transporte):
+    """
+    Envío por WhatsApp Web en el navegador del escritorio: abre el chat por URL (como pywhatkit)
+    y adjunta archivos con clics de pyautogui en la ventana activa.
+    Cada paso espera a que la pantalla esté lista (puntos de control por color de pixel o ventanas)
+    con un tiempo máximo, en lugar de dormir un tiempo fijo.
+
+    reutilizar_pestana: abre WhatsApp Web una sola vez y pasa de un chat a otro con el buscador de
+    "Nuevo chat" (Ctrl+Alt+N) dentro de la misma pestaña, sin recargar la aplicación por contacto.
+    """
+    nombre = "escritorio"
+
+    # Coordenadas de pantalla de los íconos de WhatsApp Web
+    CLIP = (671, 1004)             # anterior: (485, 700)
+    ICONO_IMAGEN = (672, 699)      # anterior: (470, 455)
+    ICONO_DOCUMENTO = (651, 660)   # anterior: (470, 424)
+
+    # Puntos de control de disponibilidad (ajustar junto con las coordenadas de arriba)
+    CHAT_LISTO = PuntoControl(*CLIP, (84, 101, 111))          # ícono del clip: caja de texto cargada
+    MENU_ADJUNTAR = PuntoControl(*ICONO_IMAGEN, (0, 123, 252))  # ícono azul de "Fotos y videos"
+    APP_LISTA = PuntoControl(60, 140, (240, 242, 245))        # barra lateral de chats cargada
+    RESULTADO_BUSQUEDA = PuntoControl(60, 260, (223, 229, 231))  # primer resultado del buscador de "Nuevo chat"
+    SIN_RESULTADOS = PuntoControl(230, 250, (102, 119, 129))  # texto gris "No se encontró ningún chat..." del buscador
+    NUMERO_INVALIDO = PuntoControl(1085, 585, (0, 168, 132))  # botón verde "OK" del aviso de número inválido
+
+    # Títulos del diálogo de selección de archivos (Windows en español / inglés)
+    TITULOS_DIALOGO = ("Abrir", "Open")
+
+    # Tiempos máximos por paso (segundos); solo se agotan si la pantalla no responde
+    TIMEOUT_CARGA_CHAT = 30
+    TIMEOUT_CARGA_APP = 60
+    TIMEOUT_BUSQUEDA = 10
+    CONFIRMAR_SIN_RESULTADOS = 1  # El buscador puede mostrar "sin resultados" un momento antes de encontrar el chat
+    TIMEOUT_MENU = 3
+    TIMEOUT_DIALOGO = 5
+    TIMEOUT_VISTA_PREVIA = 10
+    TIMEOUT_SUBIDA = 30
+
+    def __init__(self, close_time=3, reutilizar_pestana=False):
+        super().__init__()
+        self.close_time = close_time  # Espera antes de cerrar la pestaña cuando solo se envió texto
+        self.reutilizar_pestana = reutilizar_pestana
+        self._numero = None
+        self._con_adjuntos = False
+
+    def _ventana_whatsapp(self):
+        ventanas = gw.getWindowsWithTitle("WhatsApp")
+        return ventanas[0] if ventanas else None
+
+    def _dialogo_abierto(self):
+        return any(gw.getWindowsWithTitle(titulo) for titulo in self.TITULOS_DIALOGO)
+
+    def _activar_ventana(self, timeout):
+        """Espera a que exista la ventana de WhatsApp Web y la trae al frente"""
+        if self.esperar_hasta(self._ventana_whatsapp, timeout):
+            try:
+                self._ventana_whatsapp().activate()
+            except Exception:
+                print("No se pudo activar la ventana de WhatsApp Web")
+
+    def iniciar(self):
+        if not self.reutilizar_pestana:
+            return
+
+        # Una sola carga de WhatsApp Web para toda la campaña
+        webbrowser.open("https://web.whatsapp.com/")
+        self._activar_ventana(self.TIMEOUT_CARGA_APP)
+        if not self.esperar_hasta(self.APP_LISTA.visible, self.TIMEOUT_CARGA_APP):
+            print("WhatsApp Web no terminó de cargar a tiempo, se continúa igual")
+
+    def abrir_chat(self, numero):
+        self._numero = numero
+        self._con_adjuntos = False
+        if not self.reutilizar_pestana:
+            return
+
+        # Navegar al chat dentro de la misma pestaña con el buscador de "Nuevo chat"
+        pg.hotkey('ctrl', 'alt', 'n')
+        pg.write(numero.lstrip('+'))
+        # Lo que aparezca primero: un resultado o el aviso de que no hay ninguno
+        encontrado = self.esperar_hasta(lambda: self.RESULTADO_BUSQUEDA.visible() or self.SIN_RESULTADOS.visible(),
+                                        self.TIMEOUT_BUSQUEDA)
+        if encontrado and not self.RESULTADO_BUSQUEDA.visible():
+            encontrado = self.esperar_hasta(self.RESULTADO_BUSQUEDA.visible, self.CONFIRMAR_SIN_RESULTADOS)
+            if not encontrado and self.SIN_RESULTADOS.visible():
+                # Un número sin WhatsApp no aparece en el buscador
+                pg.press('escape')
+                raise NumeroInvalido(f"{numero} no es válido o no tiene WhatsApp")
+        if not encontrado:
+            pg.press('escape')
+            raise Exception(f"No se encontró el chat de {numero} en el buscador")
+        pg.press('enter')
+
+        with self.fase(FASE_ESPERA_LISTO):
+            listo = self.esperar_hasta(self.CHAT_LISTO.visible, self.TIMEOUT_CARGA_CHAT)
+        if not listo:
+            raise Exception(f"No se abrió el chat de {numero}")
+
+    def enviar_texto(self, mensaje):
+        if self.reutilizar_pestana:
+            # Pegar desde el portapapeles conserva tildes y saltos de línea (pg.write solo escribe ASCII)
+            pyperclip.copy(mensaje)
+            pg.hotkey('ctrl', 'v')
+            pg.press('enter')
+            return
+
+        # Misma URL que usa pywhatkit.sendwhatmsg_instantly, con el texto precargado en la caja
+        # (en este modo el chat se abre aquí, con el texto)
+        with self.fase(FASE_ABRIR_CHAT):
+            webbrowser.open(f"https://web.whatsapp.com/send?phone={self._numero}&text={quote(mensaje)}")
+
+        with self.fase(FASE_ESPERA_LISTO):
+            # Activar ventana de WhatsApp Web en cuanto aparezca
+            self._activar_ventana(self.TIMEOUT_CARGA_CHAT)
+            # Lo que aparezca primero: el chat o el aviso de número inválido
+            listo = self.esperar_hasta(lambda: self.CHAT_LISTO.visible() or self.NUMERO_INVALIDO.visible(),
+                                       self.TIMEOUT_CARGA_CHAT)
+        if listo and self.NUMERO_INVALIDO.visible():
+            pg.press('enter')  # "OK" del aviso
+            pg.hotkey('ctrl', 'w')
+            raise NumeroInvalido(f"{self._numero} no es válido o no tiene WhatsApp")
+        if not listo:
+            print("WhatsApp Web no mostró el chat a tiempo, se intenta enviar igual")
+        pg.press('enter')
+
+    def _adjuntar(self, icono, paths):
+        # Clic en ícono de clip (adjuntar) y luego en el tipo de archivo
+        pg.click(*self.CLIP)
+        self.esperar_hasta(self.MENU_ADJUNTAR.visible, self.TIMEOUT_MENU)
+        pg.click(*icono)
+
+        # Escribir paths separados por espacio y entre comillas en el diálogo de archivos
+        if not self.esperar_hasta(self._dialogo_abierto, self.TIMEOUT_DIALOGO):
+            raise Exception("No se abrió el diálogo para adjuntar archivos")
+        pg.write(" ".join(f'"{os.path.abspath(p)}"' for p in paths))
+        pg.press('enter')  # Abrir archivos
+
+        # La vista previa aparece cuando el diálogo se cierra y el clip deja de verse
+        self.esperar_hasta(lambda: not self._dialogo_abierto(), self.TIMEOUT_VISTA_PREVIA)
+        self.esperar_hasta(lambda: not self.CHAT_LISTO.visible(), self.TIMEOUT_VISTA_PREVIA)
+        pg.press('enter')  # Enviar archivos
+
+        # Envío terminado cuando la vista previa se cierra y vuelve la caja de texto
+        if not self.esperar_hasta(self.CHAT_LISTO.visible, self.TIMEOUT_SUBIDA):
+            print("La subida de archivos no terminó a tiempo")
+        self._con_adjuntos = True
+
+    def adjuntar_imagenes(self, paths):
+        self._adjuntar(self.ICONO_IMAGEN, paths)
+
+    def adjuntar_documentos(self, paths):
+        self._adjuntar(self.ICONO_DOCUMENTO, paths)
+
+    def cerrar_chat(self):
+        if self.reutilizar_pestana:
+            # La pestaña queda abierta para el siguiente contacto
+            self._numero = None
+            return
+
+        if not self._con_adjuntos:
+            # Solo texto: dar tiempo a que salga el mensaje, como hacía tab_close=True
+            self.esperar(self.close_time)
+        pg.hotkey('ctrl', 'w')
+        print("Ventana de WhatsApp cerrada.")
+        self._numero = None
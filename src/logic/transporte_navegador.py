@@ -0,0 +1,142 @@
+import os
+from urllib.parse import quote
+
+from logic.tiempos import FASE_ESPERA_LISTO
+from logic.transporte import NumeroInvalido, Transporte
+
+# Selectores CSS de WhatsApp Web (cambian con las versiones de la web; ajustar aquí)
+SELECTORES_WHATSAPP = {
+    'app_lista': '#side',
+    'caja_texto': 'footer div[contenteditable="true"]',
+    'boton_adjuntar': 'footer span[data-icon="plus"], footer span[data-icon="clip"]',
+    'input_imagenes': 'input[type="file"][accept*="image"]',
+    'input_documentos': 'input[type="file"][accept="*"]',
+    'boton_enviar_adjunto': 'div[role="button"][aria-label="Enviar"], span[data-icon="send"]',
+    # Botón "OK" del aviso de número inválido o sin WhatsApp (el aviso de "Iniciando chat" no tiene botón)
+    'boton_numero_invalido': 'div[data-animate-modal-popup="true"] button',
+}
+
+class TransporteNavegador(Transporte):
+    """
+    Envío manejando el navegador por WebDriver (selenium) con selectores del DOM.
+    Puede correr sin ventana (headless), no usa el mouse ni el teclado del usuario
+    y los adjuntos se cargan directo en el <input type="file">, sin diálogo del sistema.
+
+    url_base: WhatsApp Web o el simulador local de benchmarks/whatsapp_local
+    perfil: carpeta de perfil del navegador para conservar la sesión iniciada (QR escaneado)
+    display: pantalla X donde abrir el navegador (p. ej. ":101" de un Xvfb); None = la del proceso
+    """
+    nombre = "navegador"
+
+    TIMEOUT_CARGA_APP = 60
+    TIMEOUT_CARGA_CHAT = 30
+    TIMEOUT_ADJUNTO = 10
+    TIMEOUT_SUBIDA = 60
+
+    def __init__(self, url_base="https://web.whatsapp.com", headless=True, perfil=None,
+                 selectores=None, display=None):
+        super().__init__()
+        self.url_base = url_base.rstrip('/')
+        self.headless = headless
+        self.perfil = perfil
+        self.selectores = dict(SELECTORES_WHATSAPP, **(selectores or {}))
+        self.display = display
+        self.driver = None
+        self._numero = None
+
+    def _crear_driver(self):
+        try:
+            from selenium import webdriver
+        except ImportError:
+            raise Exception("Instala selenium:\npip install selenium")
+
+        opciones = webdriver.ChromeOptions()
+        if self.headless:
+            opciones.add_argument("--headless=new")
+        if self.perfil:
+            opciones.add_argument(f"--user-data-dir={os.path.abspath(self.perfil)}")
+        opciones.add_argument("--window-size=1280,900")
+        if self.display:
+            # El navegador hereda el entorno de chromedriver: así cada sesión usa su propia pantalla
+            servicio = webdriver.ChromeService(env=dict(os.environ, DISPLAY=self.display))
+            return webdriver.Chrome(options=opciones, service=servicio)
+        return webdriver.Chrome(options=opciones)
+
+    def _buscar(self, clave):
+        from selenium.webdriver.common.by import By
+        elementos = self.driver.find_elements(By.CSS_SELECTOR, self.selectores[clave])
+        return elementos[0] if elementos else None
+
+    def _esperar_elemento(self, clave, timeout):
+        """Espera a que aparezca el elemento del selector y lo retorna (None si no aparece)"""
+        if self.esperar_hasta(lambda: self._buscar(clave) is not None, timeout, intervalo=0.05):
+            return self._buscar(clave)
+        return None
+
+    def iniciar(self):
+        self.driver = self._crear_driver()
+        self.driver.get(self.url_base + "/")
+        if self._esperar_elemento('app_lista', self.TIMEOUT_CARGA_APP) is None:
+            raise Exception("WhatsApp Web no cargó (¿sesión sin iniciar en el perfil?)")
+
+    def finalizar(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+    def abrir_chat(self, numero):
+        self._numero = numero
+        self.driver.get(f"{self.url_base}/send?phone={quote(numero.lstrip('+'))}")
+        with self.fase(FASE_ESPERA_LISTO):
+            # Lo que aparezca primero: la caja de texto o el aviso de número inválido
+            self.esperar_hasta(lambda: self._buscar('caja_texto') or self._buscar('boton_numero_invalido'),
+                               self.TIMEOUT_CARGA_CHAT, intervalo=0.05)
+        aviso = self._buscar('boton_numero_invalido')
+        if aviso is not None:
+            aviso.click()
+            raise NumeroInvalido(f"{numero} no es válido o no tiene WhatsApp")
+        if self._buscar('caja_texto') is None:
+            raise Exception(f"No se abrió el chat de {numero}")
+
+    def enviar_texto(self, mensaje):
+        from selenium.webdriver.common.keys import Keys
+
+        caja = self._buscar('caja_texto')
+        caja.click()
+        # Los saltos de línea se escriben con Shift+Enter; Enter solo envía
+        for i, linea in enumerate(mensaje.split("\n")):
+            if i:
+                caja.send_keys(Keys.SHIFT, Keys.ENTER, Keys.SHIFT)
+            if linea:
+                caja.send_keys(linea)
+        caja.send_keys(Keys.ENTER)
+
+    def _adjuntar(self, clave_input, paths):
+        boton = self._esperar_elemento('boton_adjuntar', self.TIMEOUT_ADJUNTO)
+        if boton is None:
+            raise Exception("No se encontró el botón de adjuntar")
+        boton.click()
+
+        entrada = self._esperar_elemento(clave_input, self.TIMEOUT_ADJUNTO)
+        if entrada is None:
+            raise Exception("No se encontró el campo para adjuntar archivos")
+        entrada.send_keys("\n".join(os.path.abspath(p) for p in paths))
+
+        enviar = self._esperar_elemento('boton_enviar_adjunto', self.TIMEOUT_ADJUNTO)
+        if enviar is None:
+            raise Exception("No apareció la vista previa de los adjuntos")
+        enviar.click()
+
+        # La subida termina cuando la vista previa se cierra
+        if not self.esperar_hasta(lambda: self._buscar('boton_enviar_adjunto') is None,
+                                  self.TIMEOUT_SUBIDA, intervalo=0.05):
+            print("La subida de archivos no terminó a tiempo")
+
+    def adjuntar_imagenes(self, paths):
+        self._adjuntar('input_imagenes', paths)
+
+    def adjuntar_documentos(self, paths):
+        self._adjuntar('input_documentos', paths)
+
+    def cerrar_chat(self):
+        self._numero = None
@@ -0,0 +1,146 @@
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import time
+
+from logic.tiempos import FASE_INTERVALO
+from logic.transporte import Transporte
+
+class ServidorXvfb:
+    """Pantalla X virtual (Xvfb) para una sesión de envío, sin ventana en el escritorio"""
+
+    TIMEOUT_INICIO = 10
+
+    def __init__(self, numero, resolucion="1280x900x24"):
+        self.numero = numero
+        self.resolucion = resolucion
+        self.display = f":{numero}"
+        self._proceso = None
+
+    def iniciar(self):
+        if not sys.platform.startswith("linux"):
+            raise Exception("Las sesiones en pantallas virtuales (Xvfb) solo están disponibles en Linux")
+        if shutil.which("Xvfb") is None:
+            raise Exception("Instala Xvfb:\nsudo apt install xvfb")
+
+        self._proceso = subprocess.Popen(
+            ["Xvfb", self.display, "-screen", "0", self.resolucion, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        # La pantalla está lista cuando aparece su socket
+        socket_x = f"/tmp/.X11-unix/X{self.numero}"
+        limite = time.monotonic() + self.TIMEOUT_INICIO
+        while not os.path.exists(socket_x):
+            if self._proceso.poll() is not None:
+                raise Exception(f"Xvfb no pudo iniciar la pantalla {self.display} (¿ya está en uso?)")
+            if time.monotonic() > limite:
+                self.detener()
+                raise Exception(f"Xvfb no inició la pantalla {self.display} a tiempo")
+            time.sleep(0.05)
+
+    def detener(self):
+        if self._proceso is not None:
+            self._proceso.terminate()
+            try:
+                self._proceso.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proceso.kill()
+            self._proceso = None
+
+class TransporteMultisesion(Transporte):
+    """
+    Envío en paralelo con varias sesiones aisladas de WhatsApp Web (Linux).
+    Cada sesión tiene su propia pantalla virtual Xvfb y su propio perfil de navegador, así que no
+    comparten mouse, teclado ni ventana activa. send_messages reparte los contactos entre las
+    sesiones (cada contacto va a la primera que quede libre) y el progreso de todas llega al mismo
+    progress_callback.
+
+    Cada perfil debe tener la sesión iniciada (QR escaneado) una vez, p. ej. abriéndolo con
+    TransporteNavegador(perfil=..., headless=False) en el escritorio.
+
+    sesiones: cantidad de sesiones en paralelo
+    carpeta_perfiles: carpeta con un perfil por sesión (sesion_1, sesion_2, ...)
+    intervalo_sesion: segundos mínimos entre dos contactos de una misma sesión (cuenta)
+    display_inicial: número de la primera pantalla virtual (:99, :100, ...)
+    fabrica_sesion: función (indice, display) -> Transporte para cada sesión; por defecto TransporteNavegador
+    xvfb: False para no iniciar pantallas virtuales (p. ej. con sesiones que no necesitan pantalla)
+    """
+    nombre = "multisesion"
+    intervalo = 0  # El ritmo lo marca intervalo_sesion en cada sesión
+
+    def __init__(self, sesiones=2, url_base="https://web.whatsapp.com", carpeta_perfiles="perfiles",
+                 intervalo_sesion=5, display_inicial=99, fabrica_sesion=None, xvfb=True):
+        super().__init__()
+        if sesiones < 1:
+            raise ValueError("Se necesita al menos una sesión")
+        self.concurrencia = sesiones
+        self.url_base = url_base
+        self.carpeta_perfiles = carpeta_perfiles
+        self.intervalo_sesion = intervalo_sesion
+        self.display_inicial = display_inicial
+        self.fabrica_sesion = fabrica_sesion or self._crear_navegador
+        self.xvfb = xvfb
+        self._pantallas = []
+        self._sesiones = []
+        self._libres = queue.Queue()
+        self._listo_en = {}  # sesión -> momento (monotonic) desde el que puede enviar otra vez
+
+    def _crear_navegador(self, indice, display):
+        from logic.transporte_navegador import TransporteNavegador
+        perfil = os.path.join(self.carpeta_perfiles, f"sesion_{indice + 1}")
+        # Con pantalla virtual el navegador corre con ventana (WhatsApp Web se comporta como en un escritorio)
+        return TransporteNavegador(self.url_base, headless=display is None, perfil=perfil, display=display)
+
+    def iniciar(self):
+        try:
+            for indice in range(self.concurrencia):
+                display = None
+                if self.xvfb:
+                    pantalla = ServidorXvfb(self.display_inicial + indice)
+                    pantalla.iniciar()
+                    self._pantallas.append(pantalla)
+                    display = pantalla.display
+
+                sesion = self.fabrica_sesion(indice, display)
+                sesion.esperar = self.esperar  # Las esperas de cada sesión respetan pausa y cancelación
+                sesion.fase = self.fase        # y sus pasos se miden en el contacto en curso
+                self._sesiones.append(sesion)  # Antes de iniciar: si falla a medias igual se cierra
+                sesion.iniciar()
+                self._listo_en[sesion] = 0.0
+                self._libres.put(sesion)
+                print(f"Sesión {indice + 1}/{self.concurrencia} lista" + (f" en {display}" if display else ""))
+        except Exception:
+            self.finalizar()
+            raise
+
+    def finalizar(self):
+        for sesion in self._sesiones:
+            try:
+                sesion.finalizar()
+            except Exception as e:
+                print(f"No se pudo cerrar una sesión: {e}")
+        for pantalla in self._pantallas:
+            pantalla.detener()
+        self._sesiones = []
+        self._pantallas = []
+        self._libres = queue.Queue()
+        self._listo_en = {}
+
+    def enviar(self, numero, mensaje, image_paths=(), pdf_paths=()):
+        with self.fase(FASE_INTERVALO):
+            sesion = self._libres.get()
+        try:
+            # Ritmo por cuenta: se espera antes de enviar, así un cierre durante la espera no deja
+            # un contacto enviado sin registrar
+            restante = self._listo_en[sesion] - time.monotonic()
+            if restante > 0:
+                with self.fase(FASE_INTERVALO):
+                    self.esperar(restante)
+            try:
+                sesion.enviar(numero, mensaje, image_paths, pdf_paths)
+            finally:
+                self._listo_en[sesion] = time.monotonic() + self.intervalo_sesion
+        finally:
+            self._libres.put(sesion)
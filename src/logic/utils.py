@@ -1,3 +1,5 @@
+import pandas as pd
+
 # Prevee que los numeros de celular estén en el formato correcto para WhatsApp
 # Normaliza y valida el número al formato peruano con 51
 def normalizar_numero(celular):
@@ -14,4 +16,41 @@ def normalizar_numero(celular):
         return "51" + celular
     else:
         return None
-  
\ No newline at end of file
+
+# Motivos de rechazo que retorna normalizar_columna
+MOTIVO_VACIO = "vacio"
+MOTIVO_SIN_DIGITOS = "sin_digitos"
+MOTIVO_LONGITUD = "longitud_invalida"
+
+# Primer número de 9 dígitos (opcionalmente con prefijo 51 / +51) dentro de la celda.
+# Acepta espacios y guiones entre dígitos: "+51 912-345-678", "987 654 321 / 988776655".
+# El número empieza en un dígito o en "+" y no puede ir precedido de "-": "-987654321" es un número
+# negativo (lo rechaza también normalizar_numero), no un guion separador
+_PATRON_CELULAR = r'(?<![\d\-])((?:\+?51[\s\-]*)?\d(?:[\s\-]*\d){8})(?!\d)'
+
+def normalizar_columna(columna):
+    """
+    Versión vectorizada de normalizar_numero para toda la columna CELULAR.
+    Retorna (normalizados, motivos): normalizados tiene el número con 51 o NA,
+    motivos tiene el código de rechazo para las filas inválidas (NA en las válidas).
+    """
+    # Los valores numéricos (float de Excel o texto numérico) se truncan igual que int(float(x))
+    numeros = pd.to_numeric(columna, errors='coerce')
+    es_numero = numeros.notna() & (numeros.abs() < 1e15)
+
+    texto = columna.astype(object).where(columna.notna(), "").astype(str)
+    texto[es_numero] = numeros[es_numero].astype('int64').astype(str)
+
+    candidato = texto.str.extract(_PATRON_CELULAR, expand=False)
+    digitos = candidato.str.replace(r'\D', '', regex=True)
+    normalizados = digitos.where(digitos.str.len() == 11, "51" + digitos)
+
+    invalidos = normalizados.isna()
+    vacios = texto.str.strip() == ""
+    con_digitos = texto.str.contains(r'\d', regex=True)
+    motivos = pd.Series(pd.NA, index=columna.index, dtype=object)
+    motivos[invalidos & vacios] = MOTIVO_VACIO
+    motivos[invalidos & ~vacios & ~con_digitos] = MOTIVO_SIN_DIGITOS
+    motivos[invalidos & ~vacios & con_digitos] = MOTIVO_LONGITUD
+
+    return normalizados, motivos
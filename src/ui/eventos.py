@@ -0,0 +1,112 @@
+import threading
+
+# Cuadros por segundo con los que la ventana dibuja los eventos pendientes
+FPS_POR_DEFECTO = 30
+
+# Eventos pendientes como máximo (sin contar los que se fusionan); al llenarse, el hilo que publica
+# espera a que la ventana los dibuje
+MAXIMO_POR_DEFECTO = 1000
+
+class ColaEventosUI:
+    """
+    Cola de eventos de interfaz entre el hilo de envío y la ventana de Tk.
+
+    Tk no es seguro entre hilos: el hilo de envío (o los de la Cloud API) nunca tocan un widget,
+    solo publican eventos aquí, y el mainloop los vacía a un ritmo fijo con conectar().
+    Los eventos de estado y de progreso se fusionan: si llegan varios antes del siguiente cuadro
+    solo se dibuja el último, así miles de actualizaciones por segundo cuestan un redibujo por cuadro.
+    Los demás eventos (error, fin) se entregan todos y en orden; un estado o progreso publicado
+    después de uno de ellos no lo adelanta.
+
+    No importa tkinter: conectar() recibe cualquier widget con after().
+    """
+
+    COALESCIBLES = ("estado", "progreso")
+
+    def __init__(self, maximo=MAXIMO_POR_DEFECTO):
+        self.maximo = maximo
+        self._eventos = []        # [(tipo, datos)] en orden de publicación
+        self._posiciones = {}     # tipo fusionable -> índice en _eventos desde el último evento no fusionable
+        self._condicion = threading.Condition()
+        self._cerrada = False
+        self._hilo_ventana = None  # El que vacía la cola nunca espera (se bloquearía a sí mismo)
+
+    # Publicación (desde cualquier hilo)
+
+    def publicar(self, tipo, *datos):
+        with self._condicion:
+            if self._cerrada:
+                return
+            if tipo in self.COALESCIBLES:
+                posicion = self._posiciones.get(tipo)
+                if posicion is not None:
+                    self._eventos[posicion] = (tipo, datos)  # Reemplaza al que nadie llegó a ver
+                    return
+                self._posiciones[tipo] = len(self._eventos)
+            else:
+                # Cola llena: el publicador espera (la ventana no se queda atrás sin límite)
+                while (len(self._eventos) >= self.maximo and not self._cerrada
+                       and threading.get_ident() != self._hilo_ventana):
+                    self._condicion.wait(0.1)
+                if self._cerrada:
+                    return
+                self._posiciones = {}  # Lo publicado después no puede adelantarse a este evento
+            self._eventos.append((tipo, datos))
+
+    def estado(self, texto):
+        self.publicar("estado", texto)
+
+    def progreso(self, actual, total, nombre=""):
+        self.publicar("progreso", actual, total, nombre)
+
+    def error(self, titulo, texto):
+        self.publicar("error", titulo, texto)
+
+    def fin(self):
+        self.publicar("fin")
+
+    # Consumo (hilo de la ventana)
+
+    def drenar(self):
+        """Retorna y quita los eventos pendientes, en orden"""
+        with self._condicion:
+            eventos = self._eventos
+            self._eventos = []
+            self._posiciones = {}
+            self._condicion.notify_all()
+        return eventos
+
+    def pendientes(self):
+        with self._condicion:
+            return len(self._eventos)
+
+    def conectar(self, widget, manejadores, fps=FPS_POR_DEFECTO):
+        """
+        Vacía la cola `fps` veces por segundo con widget.after() y llama al manejador de cada evento.
+        manejadores: dict tipo -> función(*datos). Un manejador que falla no detiene a los demás.
+        """
+        self._hilo_ventana = threading.get_ident()
+        intervalo = max(1, int(1000 / fps))
+
+        def cuadro():
+            if self._cerrada:
+                return
+            for tipo, datos in self.drenar():
+                manejador = manejadores.get(tipo)
+                if manejador is None:
+                    continue
+                try:
+                    manejador(*datos)
+                except Exception as e:
+                    print(f"Error al mostrar el evento '{tipo}': {e}")
+            widget.after(intervalo, cuadro)
+
+        widget.after(intervalo, cuadro)
+
+    def cerrar(self):
+        """Descarta lo pendiente y hace que publicar() no haga nada (la ventana se está cerrando)"""
+        with self._condicion:
+            self._cerrada = True
+            self._eventos = []
+            self._posiciones = {}
+            self._condicion.notify_all()
@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from PIL import Image, ImageTk
 import os
 import threading
 import sys
 
-from controller.controller import enviar_mensajes, validar_y_enviar, obtener_mensaje_previsualizacion
+from controller.controller import enviar_mensajes, validar_y_enviar, obtener_mensaje_previsualizacion, configurar_duplicados
+from controller.controller import crear_planificador
+from logic.control import ControlCampana
+from logic.duplicados import POLITICA_FECHA_RECIENTE, POLITICA_PRIMERA, POLITICA_UNIR_NOMBRES
+from ui.eventos import ColaEventosUI
 
 # Variables globales
 excel_file = None
@@ -16,12 +19,25 @@ app = None  # Variable para la ventana principal
 
 image_files = []
 pdf_files = []
+reuse_tab_var = None  # Checkbox "Reutilizar una sola pestaña de WhatsApp Web"
+duplicates_var = None  # Política para filas con el mismo número
+rate_entry = None         # Máx. contactos por minuto
+daily_limit_entry = None  # Máx. contactos por día
+hours_entry = None        # Horario permitido, p. ej. "08:00-20:00"
+
+# Opciones del selector de números repetidos -> política de logic.logic
+DUPLICATE_POLICIES = {
+    "Enviar una vez (primera fila)": POLITICA_PRIMERA,
+    "Enviar una vez (FECHA FIN más reciente)": POLITICA_FECHA_RECIENTE,
+    "Enviar una vez (unir nombres)": POLITICA_UNIR_NOMBRES,
+}
 
 # Variables para control de envío
 app_running = True
 current_thread = None
+campaign_control = None  # ControlCampana del envío en curso (pausa/cancelación por eventos)
+ui_events = None  # ColaEventosUI: única vía del hilo de envío hacia los widgets
 sending_paused = False
-last_sent_index = 0  # Índice del último contacto enviado
 total_contacts = 0   # Total de contactos válidos
 progress_bar = None
 progress_label = None
@@ -48,6 +64,10 @@ def on_closing():
     
     # Marcar que la aplicación se está cerrando
     app_running = False
+    if ui_events:
+        ui_events.cerrar()  # El hilo de envío ya no encola nada para una ventana que no existe
+    if campaign_control:
+        campaign_control.cancelar()  # El hilo de envío despierta y termina de inmediato
     
     # Intentar terminar hilos activos de manera más agresiva
     if current_thread and current_thread.is_alive():
@@ -71,23 +91,24 @@ def toggle_pause():
     if sending_paused:
         # Reanudar envío
         sending_paused = False
+        if campaign_control:
+            campaign_control.reanudar()
         pause_button.config(text="⏸️ Pausar", bg="#ef4444", activebackground="#fecaca")
-        status_label.config(text=f"▶️ Reanudando envío desde contacto {last_sent_index + 1}...")
+        ui_events.estado("▶️ Reanudando envío...")
         # Mantener interfaz bloqueada durante la reanudación
         lock_interface()
     else:
         # Pausar envío - puede permitir edición del mensaje si se desea
         sending_paused = True
+        if campaign_control:
+            campaign_control.pausar()
         pause_button.config(text="▶️ Reanudar", bg="#10b981", activebackground="#a7f3d0")
-        status_label.config(text=f"⏸️ Envío pausado en contacto {last_sent_index}. Haz clic en Reanudar para continuar.")
+        ui_events.estado("⏸️ Envío pausado. Haz clic en Reanudar para continuar.")
         # Opcional: desbloquear mensaje durante la pausa para permitir edición
         # unlock_interface()
 
 def update_progress(current, total, contact_name=""):
     """Actualiza la barra de progreso y el contador"""
-    global last_sent_index
-    
-    last_sent_index = current
     progress = (current / total) * 100 if total > 0 else 0
     
     # Actualizar barra de progreso
@@ -174,9 +195,8 @@ def unlock_interface_complete():
 
 def reset_progress():
     """Resetea el progreso y oculta los controles"""
-    global last_sent_index, sending_paused, total_contacts
+    global sending_paused, total_contacts
     
-    last_sent_index = 0
     sending_paused = False
     total_contacts = 0
     
@@ -274,32 +294,39 @@ def browse_file():
     global excel_file
     filename = filedialog.askopenfilename(filetypes=[("Archivos de Excel", "*.xls *.xlsx")])
     if filename:
-        # Verificar si es .xls y convertir automáticamente
-        if filename.lower().endswith('.xls'):
-            try:
-                from logic.logic import convertir_xls_a_xlsx
-                messagebox.showinfo("Conversión", "Archivo .xls detectado. Convirtiendo automáticamente a .xlsx...")
-                
-                # Convertir el archivo y actualizar la variable excel_file
-                archivo_convertido = convertir_xls_a_xlsx(filename)
-                excel_file = archivo_convertido
-                
-                # Actualizar la interfaz con el archivo convertido
-                update_icon(True, archivo_convertido)
-                messagebox.showinfo("Éxito", f"Archivo convertido exitosamente:\n{os.path.basename(archivo_convertido)}")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo convertir el archivo:\n{e}")
-                excel_file = None
-                update_icon(False)
-        else:
-            # Si es .xlsx, usar directamente
-            excel_file = filename
-            update_icon(True, filename)
+        # .xls y .xlsx se leen directamente, sin generar archivos intermedios
+        excel_file = filename
+        update_icon(True, filename)
     else:
         excel_file = None
         update_icon(False)
 
+    # La exportación a .xlsx solo aplica a archivos .xls
+    es_xls = bool(excel_file) and excel_file.lower().endswith('.xls')
+    export_button.config(state='normal' if es_xls else 'disabled')
+
+def export_xlsx():
+    """Exporta el .xls seleccionado a .xlsx (opcional, el envío no lo necesita)"""
+    if not excel_file or not excel_file.lower().endswith('.xls'):
+        return
+
+    nombre_base = os.path.splitext(os.path.basename(excel_file))[0]
+    destino = filedialog.asksaveasfilename(
+        defaultextension=".xlsx",
+        initialdir=os.path.dirname(excel_file),
+        initialfile=f"{nombre_base}.xlsx",
+        filetypes=[("Libro de Excel", "*.xlsx")]
+    )
+    if not destino:
+        return
+
+    try:
+        from logic.logic import convertir_xls_a_xlsx
+        archivo_convertido = convertir_xls_a_xlsx(excel_file, destino)
+        messagebox.showinfo("Éxito", f"Archivo exportado exitosamente:\n{os.path.basename(archivo_convertido)}")
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo exportar el archivo:\n{e}")
+
 def browse_image():
     seleccionar_archivo(
         "Imagen", "*.png;*.jpg;*.jpeg", image_label,
@@ -329,46 +356,63 @@ def remove_pdf():
     globals()['pdf_files'] = []
     pdf_label.config(text="Sin PDF", fg="gray")
 
-def send_in_thread():
-    """Ejecuta el envío en un hilo separado con control de cierre"""
-    global current_thread, app_running, sending_paused, last_sent_index
+def pacing_values():
+    """(por minuto, límite diario, horario) tal como están escritos en la UI"""
+    return tuple(entry.get() if entry else "" for entry in (rate_entry, daily_limit_entry, hours_entry))
+
+def send_in_thread(campana=None):
+    """
+    Ejecuta el envío en un hilo separado con control de cierre.
+    campana: id de campaña en la bitácora; los contactos que ya figuran como enviados se omiten
+    """
+    global current_thread, app_running, sending_paused, campaign_control
     
     mensaje = message_text.get("1.0", tk.END).strip()
+    campaign_control = ControlCampana()
+    control = campaign_control
+    reutilizar_pestana = bool(reuse_tab_var and reuse_tab_var.get())
+    planificador = crear_planificador(*pacing_values())  # Ya validado en send()
     
     def envio_controlado():
         try:
-            # Función que verifica si debe continuar
-            def should_continue():
-                return app_running and not sending_paused
-            
-            # Función para actualizar progreso desde el controlador
-            def update_progress_callback(current, total, contact_name=""):
-                if app_running:
-                    app.after(0, lambda: update_progress(current, total, contact_name))
-            
-            # Pasar todas las funciones de callback al controlador
+            from logic.transporte_escritorio import TransporteEscritorio
+            transporte = TransporteEscritorio(reutilizar_pestana=reutilizar_pestana)
+
+            # Pasar todas las funciones de callback al controlador; el progreso y los estados
+            # van a la cola de eventos y la ventana dibuja solo el último en cada cuadro
             enviar_mensajes(
-                excel_file, mensaje, image_files, pdf_files, status_label,
+                excel_file, mensaje, image_files, pdf_files, ui_events,
                 app_running_check=lambda: app_running,
-                pause_check=lambda: not sending_paused,
-                progress_callback=update_progress_callback,
-                start_index=last_sent_index
+                progress_callback=ui_events.progreso,
+                transporte=transporte,
+                control=control,
+                campana=campana,
+                planificador=planificador
             )
+        except ImportError as e:
+            # pyautogui / pygetwindow / pyperclip se importan recién aquí (arranque rápido)
+            if app_running:
+                ui_events.estado("❌ Falta una dependencia del envío")
+                ui_events.error("Error", f"No se pudo cargar el envío por el navegador:\n{e}\n\n"
+                                         "Instala las dependencias:\npip install -r requirements.txt")
         except Exception as e:
+            # Errores fuera de enviar_mensajes (p. ej. al crear el transporte): se muestran igual que los demás
             if app_running:
                 print(f"Error en envío: {e}")
+                ui_events.estado(f"❌ Error: {e}")
+                ui_events.error("Error", f"Error al enviar mensajes:\n{e}")
         finally:
             # Limpiar la referencia al hilo y ocultar controles
             if app_running:
                 current_thread = None
-                app.after(0, reset_progress)
+                ui_events.fin()
     
     current_thread = threading.Thread(target=envio_controlado, daemon=True)
     current_thread.start()
 
 def send():
     """Validar y enviar mensajes"""
-    global current_thread, last_sent_index
+    global current_thread
     
     # Verificar si ya hay un proceso ejecutándose
     if current_thread and current_thread.is_alive():
@@ -398,11 +442,16 @@ def send():
         if not confirmacion:
             return
     
-    # Si no es una reanudación, resetear el índice
-    if not (current_thread and last_sent_index > 0):
-        last_sent_index = 0
+    # Ritmo de envío: los valores se validan antes de empezar
+    try:
+        crear_planificador(*pacing_values())
+    except ValueError as e:
+        messagebox.showerror("Ritmo de envío", str(e))
+        return
     
-    validar_y_enviar(excel_file, mensaje, status_label, message_text, send_in_thread, show_progress_controls)
+    # La reanudación de una campaña sin terminar la decide validar_y_enviar con la bitácora de envíos
+    validar_y_enviar(excel_file, mensaje, status_label, message_text, send_in_thread, show_progress_controls,
+                     image_path=image_files, pdf_path=pdf_files)
 
 def preview_message():
     if not excel_file:
@@ -415,11 +464,22 @@ def preview_message():
     except Exception as e:
         messagebox.showerror("Error", f"No se pudo previsualizar el mensaje:\n{e}")
 
+def preload_core():
+    """Importa pandas/openpyxl/pyexcel en un hilo aparte para que el primer clic no espere la carga"""
+    def precargar():
+        try:
+            import logic.logic
+            import logic.message
+        except Exception as e:
+            print(f"No se pudo precargar el núcleo de envío: {e}")
+
+    threading.Thread(target=precargar, daemon=True).start()
+
 def launch_app():
     global icon_label, file_name_label, message_text, excel_logo_img, status_label
     global image_label, pdf_label, image_file, pdf_file, app, app_running
-    global progress_bar, progress_label, pause_button
-    global send_button, browse_button, preview_button  # Agregar referencias a botones
+    global progress_bar, progress_label, pause_button, ui_events
+    global send_button, browse_button, preview_button, export_button  # Agregar referencias a botones
 
     # Reiniciar variables de control
     app_running = True
@@ -470,28 +530,26 @@ def launch_app():
     # Instrucciones paso a paso
     instrucciones = [
         (" 1 Seleccionar archivo Excel", [
-            "• Ingresa un archivo Excel (.xls o .xlsx) se convierte automáticamente."
+            "• Ingresa un archivo Excel (.xls o .xlsx), se lee directamente sin convertirlo.",
             "• Verifica que aparezca el ícono ✅"
         ]),
-        (" Paso especial para archivos de AppFit", [
-            "• Cuando descargues el archivo Excel desde AppFit y lo abras, Excel mostrará una advertencia:",
-            "• ⚠️ “El formato y la extensión de archivo de 'nombre_archivo.xls' no coinciden. Puede que el archivo esté dañado o no sea seguro. No lo abra a menos que confíe en su origen. ¿Desea abrirlo a de todos modos?”",
-            "• Haz clic en **Sí** para abrirlo.",
-            "• Luego dirígete a **Archivo > Guardar como > Examinar**",
-            "• En el campo **Tipo**, selecciona: `Libro de Excel (*.xlsx)`",
-            "• Haz clic en **Guardar** para crear el nuevo archivo.",
-            "• Finalmente, **adjunta ese nuevo archivo .xlsx** usando el botón 'Seleccionar Excel' en este programa ✅"
+        (" Archivos de AppFit", [
+            "• Selecciona el .xls descargado de AppFit tal cual: no hace falta abrirlo en Excel ni guardarlo como .xlsx",
+            "• Si Excel avisa que el formato y la extensión no coinciden al abrirlo, no afecta al envío",
+            "• 'Exportar a .xlsx' es opcional: solo sirve si necesitas una copia en .xlsx para otra cosa"
         ]),
         (" 2 Escribir mensaje", [
             "• Escribe tu mensaje en el cuadro de texto",
-            "• Usa variables: {nombre}, {fecha_fin}",
-            "• Ejemplo: 'Hola {nombre}, tu membresía vence el {fecha_fin}'"
+            "• Usa variables: {nombre}, {celular}, {fecha_fin}",
+            "• Ejemplo: 'Hola {nombre}, tu membresía vence el {fecha_fin}'",
+            "• Formato de fecha opcional: {fecha_fin:%d-%m-%Y} (por defecto dd/mm/aaaa)"
         ]),
         (" 3 Adjuntar archivos (opcional)", [
             "• Selecciona imágenes (.png, .jpg, .jpeg)",
             "• Selecciona PDFs si necesitas",
             "• Puedes adjuntar múltiples archivos de cada tipo",
-            "• Se pueden enviar imágenes Y PDFs al mismo tiempo"
+            "• Se pueden enviar imágenes Y PDFs al mismo tiempo",
+            "• Antes de enviar se revisan los archivos; las imágenes muy grandes se reducen automáticamente"
         ]),
         (" 4 Previsualizar", [
             "• Haz clic en 'Previsualizar'",
@@ -503,6 +561,7 @@ def launch_app():
             "• Se abrirá WhatsApp Web automáticamente",
             "• IMPORTANTE: Tener WhatsApp Web abierto con la cuenta de la empresa",
             "• Espera a que se envíen todos los mensajes",
+            "• Opcional: limita el ritmo con 'Máx. por minuto', 'Límite diario' y 'Horario' (p. ej. 08:00-13:00, 15:00-20:00); lo que quede fuera se envía en el siguiente horario",
         ])
     ]
 
@@ -528,7 +587,9 @@ def launch_app():
         "• Mantén WhatsApp Web abierto durante el envío",
         "• No uses el mouse mientras se envían mensajes",
         "• Los números inválidos se omiten automáticamente",
-        "• Archivos .xls se convierten a .xlsx automáticamente"
+        "• Si un número aparece en varias filas se envía una sola vez (elige cómo fusionarlas en 'Números repetidos')",
+        "• Si el envío se corta (cierre, corte de luz o reinicio), al volver a enviar el mismo mensaje con el mismo Excel puedes continuar donde quedó",
+        "• Archivos .xls se leen directamente; usa 'Exportar a .xlsx' solo si necesitas el archivo convertido"
     ]
 
     for nota in notas:
@@ -544,14 +605,18 @@ def launch_app():
     # Buscar el logo de Excel - compatible con PyInstaller
     try:
         if hasattr(sys, '_MEIPASS'):
-            logo_path = os.path.join(sys._MEIPASS, "assets", "ExcelLogo.png")
+            assets_dir = os.path.join(sys._MEIPASS, "assets")
         else:
             base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-            logo_path = os.path.join(base_dir, "assets", "ExcelLogo.png")
+            assets_dir = os.path.join(base_dir, "assets")
         
+        # Logo ya reducido a 48x48: Tk lo carga directo, sin Pillow ni reescalar en cada inicio
+        logo_path = os.path.join(assets_dir, "ExcelLogo_48.png")
         if os.path.exists(logo_path):
-            img = Image.open(logo_path)
-            img = img.resize((48, 48), Image.LANCZOS)
+            excel_logo_img = tk.PhotoImage(file=logo_path)
+        elif os.path.exists(os.path.join(assets_dir, "ExcelLogo.png")):
+            from PIL import Image, ImageTk
+            img = Image.open(os.path.join(assets_dir, "ExcelLogo.png")).resize((48, 48), Image.LANCZOS)
             excel_logo_img = ImageTk.PhotoImage(img)
         else:
             excel_logo_img = None
@@ -568,11 +633,20 @@ def launch_app():
     file_name_label = tk.Label(main_frame, text="", font=("Segoe UI", 9), bg=COLOR_BG, fg="gray")
     file_name_label.grid(row=3, column=0, sticky="w")
 
+    excel_buttons = tk.Frame(main_frame, bg=COLOR_BG)
+    excel_buttons.grid(row=4, column=0, sticky="w", pady=5)
+
     # Guardar referencia al botón de seleccionar archivo
-    browse_button = tk.Button(main_frame, text="Seleccionar Excel", command=browse_file,
+    browse_button = tk.Button(excel_buttons, text="Seleccionar Excel", command=browse_file,
               bg=COLOR_PRIMARY, fg="white", font=FONT_BASE, bd=0, padx=12, pady=6,
               activebackground=COLOR_ACCENT)
-    browse_button.grid(row=4, column=0, sticky="w", pady=5)
+    browse_button.pack(side="left", padx=(0, 10))
+
+    # Exportación opcional de .xls a .xlsx (solo se habilita con un .xls seleccionado)
+    export_button = tk.Button(excel_buttons, text="Exportar a .xlsx", command=export_xlsx,
+              bg="#6b7280", fg="white", font=FONT_BASE, bd=0, padx=10, pady=6,
+              activebackground="#9ca3af", state='disabled')
+    export_button.pack(side="left")
 
     tk.Label(main_frame, text="Mensaje a enviar", font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG).grid(row=5, column=0, sticky="w", pady=(10, 2))
 
@@ -608,6 +682,38 @@ def launch_app():
     global image_select_button, pdf_select_button
     image_select_button = btn_img_select
     pdf_select_button = btn_pdf_select
+
+    # Modo de envío: una pestaña por contacto (por defecto) o una sola pestaña para toda la campaña
+    global reuse_tab_var
+    reuse_tab_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_extra, text="Reutilizar una sola pestaña de WhatsApp Web (más rápido)",
+                   variable=reuse_tab_var, font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG,
+                   activebackground=COLOR_BG, anchor="w").grid(row=1, column=0, columnspan=2, sticky="w", padx=10)
+
+    # Filas con el mismo número: se envía una sola vez, fusionándolas según la política elegida
+    global duplicates_var
+    duplicates_frame = tk.Frame(frame_extra, bg=COLOR_BG)
+    duplicates_frame.grid(row=2, column=0, columnspan=2, sticky="w", padx=10, pady=(2, 0))
+    tk.Label(duplicates_frame, text="Números repetidos:", font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG).pack(side="left")
+    duplicates_var = tk.StringVar(value=next(iter(DUPLICATE_POLICIES)))
+    duplicates_menu = tk.OptionMenu(duplicates_frame, duplicates_var, *DUPLICATE_POLICIES,
+                                    command=lambda opcion: configurar_duplicados(DUPLICATE_POLICIES[opcion]))
+    duplicates_menu.config(font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG, activebackground=COLOR_ACCENT, highlightthickness=0)
+    duplicates_menu.pack(side="left", padx=(5, 0))
+
+    # Ritmo de envío (vacío = sin límite): contactos por minuto, tope diario y horario permitido
+    global rate_entry, daily_limit_entry, hours_entry
+    pacing_frame = tk.Frame(frame_extra, bg=COLOR_BG)
+    pacing_frame.grid(row=3, column=0, columnspan=2, sticky="w", padx=10, pady=(2, 0))
+    tk.Label(pacing_frame, text="Máx. por minuto:", font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG).pack(side="left")
+    rate_entry = tk.Entry(pacing_frame, width=5, font=FONT_BASE)
+    rate_entry.pack(side="left", padx=(5, 10))
+    tk.Label(pacing_frame, text="Límite diario:", font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG).pack(side="left")
+    daily_limit_entry = tk.Entry(pacing_frame, width=6, font=FONT_BASE)
+    daily_limit_entry.pack(side="left", padx=(5, 10))
+    tk.Label(pacing_frame, text="Horario:", font=FONT_BASE, bg=COLOR_BG, fg=COLOR_FG).pack(side="left")
+    hours_entry = tk.Entry(pacing_frame, width=14, font=FONT_BASE)
+    hours_entry.pack(side="left", padx=(5, 0))
     
     status_label = tk.Label(main_frame, text="", font=("Segoe UI", 9), fg=COLOR_PRIMARY, bg=COLOR_BG)
     status_label.grid(row=10, column=0, sticky="w", pady=10)
@@ -641,4 +747,16 @@ def launch_app():
     # Enfocar el cuadro de mensaje al inicio
     message_text.focus_set()
 
+    # Eventos del hilo de envío: se dibujan desde el mainloop a ritmo fijo
+    ui_events = ColaEventosUI()
+    ui_events.conectar(app, {
+        "estado": lambda texto: status_label.config(text=texto),
+        "progreso": update_progress,
+        "error": messagebox.showerror,
+        "fin": reset_progress,
+    })
+
+    # Con la ventana ya visible, cargar en segundo plano lo que se necesita al leer el Excel
+    app.after(200, preload_core)
+
     app.mainloop()
\ No newline at end of file
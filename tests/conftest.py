@@ -0,0 +1,5 @@
+import os
+import sys
+
+# El código vive en src/ sin empaquetar (como lo corren la aplicación y los benchmarks)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
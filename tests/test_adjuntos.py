@@ -0,0 +1,35 @@
+import pytest
+from PIL import Image
+
+from logic.adjuntos import LADO_MAXIMO, ErrorAdjunto, PreparadorAdjuntos
+
+ORIENTACION = 0x0112
+
+def test_optimizar_respeta_orientacion_exif(tmp_path):
+    # Foto de celular: guardada apaisada con Orientation=6 (rotar 90° a la derecha para verla vertical)
+    path = tmp_path / "foto.jpg"
+    exif = Image.Exif()
+    exif[ORIENTACION] = 6
+    Image.new("RGB", (LADO_MAXIMO * 2, LADO_MAXIMO)).save(path, exif=exif)
+
+    [optimizada], _ = PreparadorAdjuntos(tmp_path / "cache").preparar([str(path)])
+
+    with Image.open(optimizada) as img:
+        assert img.size == (LADO_MAXIMO // 2, LADO_MAXIMO)
+        assert img.getexif().get(ORIENTACION, 1) == 1
+
+def test_revisar_no_decodifica_ni_optimiza(tmp_path):
+    path = tmp_path / "grande.png"
+    Image.new("RGB", (LADO_MAXIMO * 2, LADO_MAXIMO * 2)).save(path)
+    cache = tmp_path / "cache"
+
+    PreparadorAdjuntos(cache).revisar([str(path)])
+
+    assert not cache.exists()
+
+def test_revisar_reporta_archivos_invalidos(tmp_path):
+    falsa = tmp_path / "foto.jpg"
+    falsa.write_text("no es una imagen")
+    with pytest.raises(ErrorAdjunto) as error:
+        PreparadorAdjuntos(tmp_path / "cache").revisar([str(falsa), str(tmp_path / "falta.jpg")])
+    assert "foto.jpg" in str(error.value) and "falta.jpg" in str(error.value)
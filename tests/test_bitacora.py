@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from logic.bitacora import ESTADO_ENVIADO, ESTADO_ERROR, ESTADO_INVALIDO, BitacoraEnvios, clave_campana
+from logic.control import ControlCampana
+from logic.logic import POLITICA_PRIMERA, Contacto, LoteContactos
+from logic.message import send_messages
+from logic.transporte import TransporteFalso
+
+EXCEL = "socios.xlsx"
+MENSAJE = "Hola {nombre}"
+NUMEROS = ["51911111111", "51922222222", "51933333333", "51944444444"]
+
+class AlmacenFijo:
+    """Almacén de contactos sin Excel: siempre entrega el mismo lote"""
+    politica_duplicados = POLITICA_PRIMERA
+
+    def obtener_contactos(self, path):
+        contactos = [Contacto(i, numero, f"Socio {i}", None) for i, numero in enumerate(NUMEROS)]
+        return LoteContactos(contactos, {}, len(contactos))
+
+def transporte(fallidos=(), invalidos=()):
+    falso = TransporteFalso(numeros_fallidos={f"+{n}" for n in fallidos},
+                            numeros_invalidos={f"+{n}" for n in invalidos})
+    falso.intervalo = 0
+    return falso
+
+def enviar(bitacora, falso, **kwargs):
+    return send_messages(EXCEL, MENSAJE, contact_store=AlmacenFijo(), transporte=falso, bitacora=bitacora, **kwargs)
+
+def abiertos(falso):
+    return [numero for operacion, numero, *_ in falso.llamadas if operacion == 'abrir_chat']
+
+def pendiente(bitacora):
+    return bitacora.campana_pendiente(clave_campana(EXCEL, MENSAJE, [], []))
+
+@pytest.fixture
+def bitacora():
+    bitacora = BitacoraEnvios(":memory:")
+    yield bitacora
+    bitacora.cerrar()
+
+def test_reanudar_omite_los_enviados_y_los_invalidos(bitacora):
+    assert enviar(bitacora, transporte(fallidos=[NUMEROS[1]], invalidos=[NUMEROS[2]])) == 2
+    campana = pendiente(bitacora)
+    assert campana is not None  # Con un contacto fallido la campaña queda pendiente
+    assert bitacora.entregados(campana) == {NUMEROS[0], NUMEROS[3]}
+    assert bitacora.resueltos(campana) == {NUMEROS[0], NUMEROS[2], NUMEROS[3]}
+
+    segundo = transporte()
+    assert enviar(bitacora, segundo) == 1
+    assert abiertos(segundo) == [f"+{NUMEROS[1]}"]  # Solo se reintenta el que falló
+    assert pendiente(bitacora) is None  # Sin fallos la campaña se termina
+
+def test_campana_completa_se_termina(bitacora):
+    resultados = {}
+    assert enviar(bitacora, transporte(invalidos=[NUMEROS[0]]), resultados=resultados) == 3
+    assert resultados == {ESTADO_ENVIADO: 3, ESTADO_INVALIDO: 1, ESTADO_ERROR: 0}
+    assert pendiente(bitacora) is None  # Un número inválido no deja la campaña pendiente
+
+def test_campana_cancelada_queda_pendiente(bitacora):
+    control = ControlCampana()
+    cancelar_en_el_segundo = lambda actual, total, nombre: actual == 2 and control.cancelar()
+    assert enviar(bitacora, transporte(), control=control, progress_callback=cancelar_en_el_segundo) == 2
+    campana = pendiente(bitacora)
+    assert campana is not None
+    assert bitacora.entregados(campana) == set(NUMEROS[:2])
+
+def test_lote_pendiente_se_escribe_al_cancelar(tmp_path):
+    path = str(tmp_path / "envios.sqlite3")
+    bitacora = BitacoraEnvios(path, tamano_lote=100)
+    control = ControlCampana()
+    cancelar_en_el_segundo = lambda actual, total, nombre: actual == 2 and control.cancelar()
+    try:
+        enviar(bitacora, transporte(), control=control, progress_callback=cancelar_en_el_segundo)
+        # Se lee con otra conexión: lo que quedó en memoria sin escribir no se vería
+        conexion = sqlite3.connect(path)
+        filas = conexion.execute("SELECT numero, estado FROM envios ORDER BY id").fetchall()
+        conexion.close()
+        assert filas == [(NUMEROS[0], ESTADO_ENVIADO), (NUMEROS[1], ESTADO_ENVIADO)]
+    finally:
+        bitacora.cerrar()
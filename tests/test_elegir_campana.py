@@ -0,0 +1,34 @@
+import pytest
+
+import controller.controller as controller
+from logic.bitacora import ESTADO_ENVIADO, ESTADO_ERROR, ESTADO_INVALIDO, BitacoraEnvios, clave_campana
+
+@pytest.fixture
+def bitacora(monkeypatch):
+    bitacora = BitacoraEnvios(":memory:")
+    monkeypatch.setattr(controller, "_bitacora", bitacora)
+    return bitacora
+
+@pytest.fixture
+def preguntas(monkeypatch):
+    """Respuestas de la UI: registra cada pregunta y contesta 'Sí' (continuar)"""
+    hechas = []
+    monkeypatch.setattr(controller.messagebox, "askyesno", lambda titulo, texto: hechas.append(texto) or True)
+    return hechas
+
+def campana_pendiente(bitacora, *resultados):
+    campana = bitacora.nueva_campana(clave_campana("socios.xls", "Hola"))
+    for numero, estado in resultados:
+        bitacora.registrar(campana, numero, estado)
+    return campana
+
+def test_solo_invalidos_continua_sin_preguntar(bitacora, preguntas):
+    pendiente = campana_pendiente(bitacora, ("51911111111", ESTADO_INVALIDO), ("51922222222", ESTADO_ERROR))
+    assert controller.elegir_campana("socios.xls", "Hola") == pendiente
+    assert preguntas == []
+    assert bitacora.resueltos(pendiente) == {"51911111111"}
+
+def test_con_enviados_pregunta(bitacora, preguntas):
+    pendiente = campana_pendiente(bitacora, ("51911111111", ESTADO_ENVIADO), ("51922222222", ESTADO_INVALIDO))
+    assert controller.elegir_campana("socios.xls", "Hola") == pendiente
+    assert len(preguntas) == 1 and "1 número(s) se marcaron como inválidos" in preguntas[0]
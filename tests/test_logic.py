@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from logic.duplicados import POLITICA_FECHA_RECIENTE, POLITICA_PRIMERA, POLITICA_UNIR_NOMBRES
+from logic.logic import deduplicar_contactos, preparar_contactos
+
+def _excel(filas):
+    return pd.DataFrame(filas, columns=['CELULAR', 'NOMBRES', 'FECHA FIN'])
+
+def test_preparar_contactos_deja_vacio_el_nombre_faltante():
+    df = _excel([
+        (987654321, None, None),
+        (912345678, float('nan'), None),
+        (988776655, "  Ana  ", None),
+    ])
+    validos, rechazados = preparar_contactos(df)
+    assert validos['nombre'].tolist() == ["", "", "Ana"]
+    assert rechazados.empty
+
+def _validos(filas):
+    """DataFrame como el de preparar_contactos: (celular, nombre, fecha_fin) por fila"""
+    return pd.DataFrame({
+        'index': range(len(filas)),
+        'celular': [f[0] for f in filas],
+        'nombre': [f[1] for f in filas],
+        'fecha_fin': pd.Series([f[2] for f in filas], dtype=object),
+    })
+
+REPETIDOS = [
+    ("51911111111", "Ana", None),
+    ("51922222222", "Luis", "01/02/2025"),
+    ("51911111111", "Ana María", "15/03/2025"),
+    ("51911111111", "Pedro", datetime(2025, 1, 10)),
+    ("51922222222", "Luis", "sin fecha"),
+    ("51922222222", "Lucho", datetime(2025, 2, 1, 12)),
+]
+
+def test_deduplicar_primera_conserva_la_primera_fila():
+    unicos = deduplicar_contactos(_validos(REPETIDOS), POLITICA_PRIMERA)
+    assert unicos[['index', 'celular', 'nombre']].values.tolist() == [
+        [0, "51911111111", "Ana"], [1, "51922222222", "Luis"],
+    ]
+
+def test_deduplicar_fecha_reciente_con_fechas_vacias_o_en_texto():
+    unicos = deduplicar_contactos(_validos(REPETIDOS), POLITICA_FECHA_RECIENTE)
+    # El orden de envío sigue la primera aparición; sin fecha o con texto ilegible cuenta como la más antigua.
+    # "01/02/2025" se lee como 1 de febrero (dd/mm), anterior al datetime del mismo día a las 12:00
+    assert unicos[['index', 'celular', 'nombre']].values.tolist() == [
+        [2, "51911111111", "Ana María"], [5, "51922222222", "Lucho"],
+    ]
+    assert unicos['fecha_fin'].tolist() == ["15/03/2025", datetime(2025, 2, 1, 12)]
+
+def test_deduplicar_fecha_reciente_sin_ninguna_fecha_conserva_la_primera():
+    unicos = deduplicar_contactos(_validos([("51911111111", "Ana", None), ("51911111111", "Luis", "sin fecha")]),
+                                  POLITICA_FECHA_RECIENTE)
+    assert unicos['nombre'].tolist() == ["Ana"]
+
+def test_deduplicar_unir_nombres():
+    unicos = deduplicar_contactos(_validos(REPETIDOS + [("51933333333", "", None)]), POLITICA_UNIR_NOMBRES)
+    assert unicos[['index', 'celular', 'nombre']].values.tolist() == [
+        [0, "51911111111", "Ana, Ana María y Pedro"], [1, "51922222222", "Luis y Lucho"], [6, "51933333333", ""],
+    ]
+
+def test_deduplicar_politica_desconocida():
+    with pytest.raises(ValueError):
+        deduplicar_contactos(_validos(REPETIDOS), "ultima")
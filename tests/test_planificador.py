@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from logic.planificador import PlanificadorEnvios
+
+class RelojFalso:
+    """Reloj de pared simulado: esperar() avanza la hora en lugar de dormir"""
+
+    def __init__(self, momento):
+        self.momento = momento
+        self.esperas = []
+
+    def ahora(self):
+        return self.momento
+
+    def esperar(self, segundos):
+        self.esperas.append(segundos)
+        self.momento += timedelta(seconds=segundos)
+
+def test_turno_devuelto_no_cuenta_en_la_cuota():
+    reloj = RelojFalso(datetime(2025, 7, 1, 10, 0))
+    planificador = PlanificadorEnvios(cuota_diaria=2, ahora=reloj.ahora)
+    planificador.esperar_turno(reloj.esperar)
+    planificador.devolver_turno()  # El contacto falló o el número no tiene WhatsApp
+    planificador.esperar_turno(reloj.esperar)
+    planificador.esperar_turno(reloj.esperar)
+    assert reloj.esperas == []  # Dos enviados: la cuota recién se alcanza ahora
+
+    # El siguiente turno sí espera: la cuota del día ya está usada
+    planificador.esperar_turno(reloj.esperar)
+    assert reloj.esperas
+    assert reloj.momento == datetime(2025, 7, 2, 0, 0)
@@ -0,0 +1,36 @@
+from datetime import date, datetime
+
+import pytest
+
+from logic.logic import Contacto
+from logic.plantilla import PlantillaMensaje
+
+def contacto(fecha_fin):
+    return Contacto(0, "51987654321", "Ana", fecha_fin)
+
+def test_variable_desconocida_falla_al_crear_la_plantilla():
+    with pytest.raises(ValueError) as error:
+        PlantillaMensaje("Hola {nombres}, vence el {fecha_fin}")
+    assert "{nombres}" in str(error.value)
+    assert "{nombre}, {celular}, {fecha_fin}" in str(error.value)
+
+def test_llaves_mal_cerradas():
+    with pytest.raises(ValueError):
+        PlantillaMensaje("Hola {nombre")
+
+def test_fecha_fin_por_defecto_en_dd_mm_aaaa():
+    plantilla = PlantillaMensaje("Hola {nombre}, vence el {fecha_fin}")
+    assert plantilla.renderizar(contacto(datetime(2025, 3, 5, 14, 30))) == "Hola Ana, vence el 05/03/2025"
+    assert plantilla.renderizar(contacto(date(2025, 12, 31))) == "Hola Ana, vence el 31/12/2025"
+
+def test_fecha_fin_con_formato():
+    plantilla = PlantillaMensaje("Vence el {fecha_fin:%d-%m-%Y}")
+    assert plantilla.renderizar(contacto(datetime(2025, 3, 5))) == "Vence el 05-03-2025"
+
+def test_fecha_fin_en_texto_se_deja_como_esta():
+    plantilla = PlantillaMensaje("Vence el {fecha_fin:%d-%m-%Y}")
+    assert plantilla.renderizar(contacto("05/03/2025")) == "Vence el 05/03/2025"
+
+def test_fecha_fin_vacia():
+    assert PlantillaMensaje("Vence el {fecha_fin}.").renderizar(contacto(None)) == "Vence el ."
+    assert PlantillaMensaje("Vence el {fecha_fin:%d-%m-%Y}.").renderizar(contacto(None)) == "Vence el ."
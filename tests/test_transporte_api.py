@@ -0,0 +1,54 @@
+import json
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from logic.transporte_api import TransporteCloudAPI, espera_retry_after, parametro_plantilla
+
+class PoolFalso:
+    """Responde 429 con la cabecera Retry-After indicada y luego 200; registra los cuerpos enviados"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self.cuerpos = []
+
+    def solicitar(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        self.cuerpos.append(json.loads(cuerpo))
+        if len(self.cuerpos) == 1:
+            return 429, {"Retry-After": self.retry_after}, b'{"error": {"code": 130429}}'
+        return 200, {}, b'{"messages": [{"id": "wamid.1"}]}'
+
+    def cerrar(self):
+        pass
+
+def crear_transporte(pool, **kwargs):
+    transporte = TransporteCloudAPI("123", "token", espera_base=1.0, **kwargs)
+    transporte._pool = pool
+    esperas = []
+    transporte.esperar = esperas.append
+    return transporte, esperas
+
+def test_retry_after_en_segundos_y_como_fecha():
+    assert espera_retry_after("2") == 2.0
+    dentro_de_un_minuto = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 <= espera_retry_after(format_datetime(dentro_de_un_minuto, usegmt=True)) <= 60
+    assert espera_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert espera_retry_after("pronto") is None
+    assert espera_retry_after(None) is None
+
+def test_retry_after_con_fecha_no_corta_el_envio():
+    transporte, esperas = crear_transporte(PoolFalso("Wed, 21 Oct 2015 07:28:00 GMT"))
+    transporte.enviar("+51999999999", "Hola")
+    assert esperas == [0.0]
+
+def test_retry_after_ilegible_usa_espera_creciente():
+    transporte, esperas = crear_transporte(PoolFalso("pronto"))
+    transporte.enviar("+51999999999", "Hola")
+    assert esperas == [1.0]
+
+def test_parametro_de_plantilla_en_una_linea():
+    assert parametro_plantilla("Hola Ana,\ntu membresía\tvence     el 01/07.\n") == "Hola Ana, tu membresía vence el 01/07."
+    pool = PoolFalso("0")
+    transporte, _ = crear_transporte(pool, plantilla_api=("recordatorio", "es"))
+    transporte.enviar("+51999999999", "Hola Ana,\n\ntu membresía vence pronto.")
+    parametro = pool.cuerpos[-1]["template"]["components"][0]["parameters"][0]["text"]
+    assert parametro == "Hola Ana, tu membresía vence pronto."
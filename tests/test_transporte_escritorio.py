@@ -0,0 +1,105 @@
+"""
+TransporteEscritorio con una pantalla falsa en lugar de pyautogui / pygetwindow / pyperclip:
+los puntos de control responden según lo que la prueba marca como visible.
+"""
+import importlib
+import sys
+
+import pytest
+
+from logic.transporte import NumeroInvalido
+
+class PantallaFalsa:
+    """Lo que usa el transporte de pyautogui, pygetwindow y pyperclip; registra las teclas"""
+
+    def __init__(self):
+        self.teclas = []
+        self.visibles = set()  # (x, y) de los puntos de control que se ven
+
+    def pixelMatchesColor(self, x, y, color, tolerance=0):
+        return (x, y) in self.visibles
+
+    def hotkey(self, *teclas):
+        self.teclas.append("+".join(teclas))
+
+    def press(self, tecla):
+        self.teclas.append(tecla)
+
+    def write(self, texto):
+        self.teclas.append(f"escribir:{texto}")
+
+    def click(self, *args):
+        pass
+
+    def getWindowsWithTitle(self, titulo):
+        return []
+
+    def copy(self, texto):
+        pass
+
+@pytest.fixture
+def pantalla(monkeypatch):
+    pantalla = PantallaFalsa()
+    for modulo in ("pyautogui", "pygetwindow", "pyperclip"):
+        monkeypatch.setitem(sys.modules, modulo, pantalla)
+    monkeypatch.delitem(sys.modules, "logic.transporte_escritorio", raising=False)
+    return pantalla
+
+def crear_transporte(pantalla, cambios=None):
+    """
+    Transporte en modo pestaña reutilizada cuyas esperas no duermen.
+    cambios: {n: [puntos]} hace visibles esos puntos de control a partir de la n-ésima espera
+    """
+    modulo = importlib.import_module("logic.transporte_escritorio")
+    transporte = modulo.TransporteEscritorio(reutilizar_pestana=True)
+    esperas = [0]
+
+    def esperar(segundos):
+        esperas[0] += 1
+        for punto in (cambios or {}).get(esperas[0], ()):
+            pantalla.visibles.add((punto.x, punto.y))
+
+    transporte.esperar = esperar
+    return transporte
+
+def punto(nombre):
+    return getattr(importlib.import_module("logic.transporte_escritorio").TransporteEscritorio, nombre)
+
+def test_pestana_sin_resultados_es_numero_invalido(pantalla):
+    transporte = crear_transporte(pantalla, {3: [punto("SIN_RESULTADOS")]})
+    with pytest.raises(NumeroInvalido):
+        transporte.abrir_chat("+51999999999")
+    assert pantalla.teclas[-1] == "escape"
+    assert "enter" not in pantalla.teclas
+
+def test_pestana_sin_resultados_pasajero_abre_el_chat(pantalla):
+    # "Sin resultados" un momento y luego aparece el chat: no es un número inválido
+    transporte = crear_transporte(pantalla, {
+        1: [punto("SIN_RESULTADOS")],
+        3: [punto("RESULTADO_BUSQUEDA"), punto("CHAT_LISTO")],
+    })
+    transporte.abrir_chat("+51999999999")
+    assert "enter" in pantalla.teclas
+
+def test_pestana_con_resultado_abre_el_chat(pantalla):
+    transporte = crear_transporte(pantalla, {2: [punto("RESULTADO_BUSQUEDA"), punto("CHAT_LISTO")]})
+    transporte.abrir_chat("+51999999999")
+    assert pantalla.teclas[-1] == "enter"
+
+def test_pestana_buscador_sin_respuesta_es_error(pantalla):
+    # Si la pantalla no muestra nada, no se puede saber si el número es inválido: queda como error
+    transporte = crear_transporte(pantalla)
+    with pytest.raises(Exception) as error:
+        transporte.abrir_chat("+51999999999")
+    assert not isinstance(error.value, NumeroInvalido)
+    assert pantalla.teclas[-1] == "escape"
+
+def test_url_aviso_de_numero_invalido(pantalla, monkeypatch):
+    modulo = importlib.import_module("logic.transporte_escritorio")
+    monkeypatch.setattr(modulo.webbrowser, "open", lambda url: None)
+    transporte = crear_transporte(pantalla, {2: [punto("NUMERO_INVALIDO")]})
+    transporte.reutilizar_pestana = False
+    transporte.abrir_chat("+51999999999")
+    with pytest.raises(NumeroInvalido):
+        transporte.enviar_texto("Hola")
+    assert pantalla.teclas[-2:] == ["enter", "ctrl+w"]
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from logic.utils import MOTIVO_LONGITUD, normalizar_columna, normalizar_numero
+
+def test_normalizar_columna_coincide_con_normalizar_numero():
+    # Valores que normalizar_numero sabe leer: float de Excel, texto numérico, negativos, longitudes erróneas
+    valores = [
+        987654321, 987654321.0, 51987654321.0, "987654321", "51987654321", "987654321.0",
+        -987654321, "-987654321", -51987654321.0, "-51987654321",
+        12345678, 1234567890, 12987654321, "0", None, "abc", "",
+    ]
+    normalizados, _ = normalizar_columna(pd.Series(valores, dtype=object))
+    for valor, vectorizado in zip(valores, normalizados):
+        esperado = normalizar_numero(valor)
+        assert (None if pd.isna(vectorizado) else vectorizado) == esperado, valor
+
+def test_normalizar_columna_rechaza_negativos_como_longitud_invalida():
+    normalizados, motivos = normalizar_columna(pd.Series([-987654321, "-987654321", "Cel: -987654321"]))
+    assert normalizados.isna().all()
+    assert (motivos == MOTIVO_LONGITUD).all()
+
+def test_normalizar_columna_acepta_separadores_en_texto():
+    normalizados, _ = normalizar_columna(pd.Series(["+51 912-345-678", "987 654 321 / 988776655", "51-987654321"]))
+    assert list(normalizados) == ["51912345678", "51987654321", "51987654321"]